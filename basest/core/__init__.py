@@ -9,8 +9,26 @@
 from __future__ import absolute_import, division, print_function
 
 from .best_ratio import best_ratio
-from .decode import decode, decode_raw
-from .encode import encode, encode_raw
+from .columns import decode_int_column, encode_int_column
+from .decode import decode, decode_many, decode_raw
+from .digest import Checksum, decode_digest, encode_digest
+from .encode import encode, encode_many, encode_raw
+from .instrumentation import Counters, add_hook, remove_hook
+from .parallel import decode_parallel, encode_parallel
+from .patch import encode_patch
+from .ranges import DecodedView, decode_range
+from .utf8 import decode_utf8, encode_utf8
+from .whole import (
+    decode_whole, decode_whole_raw, encode_whole, encode_whole_raw
+)
 
 
-__all__ = ['best_ratio', 'decode', 'decode_raw', 'encode', 'encode_raw']
+__all__ = [
+    'Checksum', 'Counters', 'DecodedView', 'add_hook', 'best_ratio',
+    'decode', 'decode_digest', 'decode_int_column', 'decode_many',
+    'decode_parallel', 'decode_range', 'decode_raw', 'decode_utf8',
+    'decode_whole', 'decode_whole_raw', 'encode', 'encode_digest',
+    'encode_int_column', 'encode_many', 'encode_parallel', 'encode_patch',
+    'encode_raw', 'encode_utf8', 'encode_whole', 'encode_whole_raw',
+    'remove_hook',
+]
@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from array import array
+
+from ..exceptions import InvalidInputError, InvalidInputLengthError
+from .utils import validate_unpadded_symbol_tables
+
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    # NumPy is optional, everything works without it, just more slowly
+    numpy = None
+
+
+# the number of distinct values an unsigned 64-bit integer can hold
+_UINT64_VALUES = 2 ** 64
+
+# the array typecode of unsigned 64-bit integers
+try:
+    array(str('Q'))
+except ValueError:  # pragma: no cover
+    # Python 2 has no 'Q', but its 'L' is 64 bits on most 64-bit platforms
+    UINT64_TYPECODE = str('L') if array(str('L')).itemsize == 8 else None
+else:  # pragma: py3
+    UINT64_TYPECODE = str('Q')
+
+
+def _validate_column_symbol_table(symbol_table):
+    """
+    Raises InvalidSymbolTableError if the given symbol table fails validation.
+    """
+    validate_unpadded_symbol_tables(symbol_table, [])
+
+
+def _is_ascii_table(symbol_table):
+    """
+    Returns True if every symbol in the given symbol table is a single ASCII
+    character, in which case the table can be handled as a table of bytes.
+    """
+    return all(len(s) == 1 and ord(s) < 128 for s in symbol_table)
+
+
+def _uint64_view(values):
+    """
+    Returns a NumPy array of unsigned 64-bit integers sharing the memory of
+    the given values, or None if they can't be viewed as such (or NumPy is
+    not available).
+    """
+    if numpy is None:  # pragma: no cover
+        return None
+    if isinstance(values, numpy.ndarray):
+        if values.dtype.kind == 'i' and (values < 0).any():
+            raise InvalidInputError('Values must be unsigned integers')
+        elif values.dtype.kind in 'ui':
+            return values.astype(numpy.uint64, copy=False)
+    elif isinstance(values, array) and values.typecode == UINT64_TYPECODE:
+        return numpy.frombuffer(values, dtype=numpy.uint64)
+    return None
+
+
+def _encode_int_column_numpy(values, output_base, output_symbol_table, width):
+    """
+    NumPy implementation of encode_int_column(), which converts every value
+    one digit at a time with vectorised division.
+    """
+    if output_base ** width < _UINT64_VALUES and (
+        values >= numpy.uint64(output_base ** width)
+    ).any():
+        raise InvalidInputError('Value too large for the output width')
+    digits = numpy.empty((len(values), width), dtype=numpy.uint64)
+    remaining = values.copy()
+    base = numpy.uint64(output_base)
+    for i in range(width - 1, -1, -1):
+        remaining, digits[:, i] = numpy.divmod(remaining, base)
+    if _is_ascii_table(output_symbol_table):
+        # look up the byte of each symbol and slice the result into strings
+        table = numpy.frombuffer(
+            ''.join(output_symbol_table).encode('ascii'), dtype=numpy.uint8
+        )
+        text = table[digits].tobytes().decode('ascii')
+        return [
+            text[i:i + width] for i in range(0, len(values) * width, width)
+        ]
+    table = numpy.array(output_symbol_table, dtype=object)
+    return [''.join(row) for row in table[digits].tolist()]
+
+
+def encode_int_column(values, output_base, output_symbol_table, width):
+    """
+    Given a sequence of unsigned integers, an output base, output symbol table
+    and a fixed output width, return a list of strings of exactly width
+    symbols each, containing every value encoded into the output base
+    (big-endian, with leading zero symbols where needed).
+    If NumPy is installed, NumPy arrays and arrays of UINT64_TYPECODE are
+    encoded with vectorised arithmetic.
+
+    Raises InvalidInputError if a value isn't an unsigned 64-bit integer or
+    doesn't fit in the output width.
+    """
+    _validate_column_symbol_table(output_symbol_table)
+    vector = _uint64_view(values)
+    if vector is not None:
+        return _encode_int_column_numpy(
+            vector, output_base, output_symbol_table, width
+        )
+    # convert the whole column one digit at a time, least significant first
+    remaining = list(values)
+    if any(v < 0 or v >= _UINT64_VALUES for v in remaining):
+        raise InvalidInputError('Values must be unsigned 64-bit integers')
+    columns = []
+    for _ in range(width):
+        columns.append(
+            [output_symbol_table[v % output_base] for v in remaining]
+        )
+        remaining = [v // output_base for v in remaining]
+    if any(remaining):
+        raise InvalidInputError('Value too large for the output width')
+    columns.reverse()
+    return [''.join(row) for row in zip(*columns)]
+
+
+def _decode_int_column_numpy(input_data, input_base, input_symbol_table,
+                             width):
+    """
+    NumPy implementation of decode_int_column() for columns of strings made
+    of single-character ASCII symbols, which decodes every string at once.
+    """
+    try:
+        text = ''.join(input_data).encode('ascii')
+    except UnicodeEncodeError:
+        raise InvalidInputError('Encountered symbol not found in symbol table')
+    table = numpy.full(128, -1, dtype=numpy.int64)
+    for i, s in enumerate(input_symbol_table):
+        table[ord(s)] = i
+    digits = table[
+        numpy.frombuffer(text, dtype=numpy.uint8).reshape(-1, width)
+    ]
+    if (digits < 0).any():
+        raise InvalidInputError('Encountered symbol not found in symbol table')
+    values = numpy.zeros(len(input_data), dtype=numpy.uint64)
+    base = numpy.uint64(input_base)
+    for i in range(width):
+        values = values * base + digits[:, i].astype(numpy.uint64)
+    if UINT64_TYPECODE is None:
+        return values.tolist()
+    return array(UINT64_TYPECODE, values.tobytes())
+
+
+def decode_int_column(input_data, input_base, input_symbol_table, width):
+    """
+    Given a sequence of encoded values (each being a string or sequence of
+    exactly width symbols), an input base and input symbol table, return an
+    array of UINT64_TYPECODE of the unsigned integers they encode (or a list
+    of them, on platforms without an array typecode for unsigned 64-bit
+    integers). This is the inverse of encode_int_column().
+    If NumPy is installed, columns of strings made of single-character ASCII
+    symbols are decoded with vectorised arithmetic.
+
+    Raises InvalidInputLengthError if an encoded value is not exactly width
+    symbols long, and InvalidInputError if a symbol is not in the symbol table
+    or a value doesn't fit in 64 bits.
+    """
+    _validate_column_symbol_table(input_symbol_table)
+    if any(len(item) != width for item in input_data):
+        raise InvalidInputLengthError(
+            'Every encoded value must be exactly the given width'
+        )
+    if (
+        numpy is not None and input_base ** width <= _UINT64_VALUES and
+        _is_ascii_table(input_symbol_table) and
+        all(isinstance(item, type('')) for item in input_data)
+    ):
+        return _decode_int_column_numpy(
+            input_data, input_base, input_symbol_table, width
+        )
+    reverse_table = dict((s, i) for i, s in enumerate(input_symbol_table))
+    values = []
+    try:
+        for item in input_data:
+            value = 0
+            for s in item:
+                value = value * input_base + reverse_table[s]
+            values.append(value)
+    except KeyError:
+        raise InvalidInputError('Encountered symbol not found in symbol table')
+    if any(v >= _UINT64_VALUES for v in values):
+        raise InvalidInputError('Decoded value does not fit in 64 bits')
+    if UINT64_TYPECODE is None:
+        return values
+    return array(UINT64_TYPECODE, values)
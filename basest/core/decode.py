@@ -10,19 +10,25 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
-from ..exceptions import InvalidInputLengthError
-from .encode import encode_raw
-from .utils import ints_to_symbols, symbols_to_ints, validate_symbol_tables
+from . import engines, lookup
+from ..exceptions import InvalidInputError, InvalidInputLengthError
+from .encode import _convert_chunks
+from .instrumentation import instrumented, record_input
+from .shortcuts import (
+    insert_shortcuts, remove_shortcut_symbols, validate_shortcuts
+)
+from .tokenize import needs_tokenizing, tokenize
+from .utils import (
+    delete_symbols, find_invalid_symbol, ints_to_symbols, map_symbols_to_ints,
+    single_characters, symbol_map, symbols_to_ints, validate_ignored_symbols,
+    validate_symbol_tables
+)
 
 
-def decode_raw(input_base, output_base, input_ratio, output_ratio, input_data):
+def _check_input_length(input_ratio, input_data):
     """
-    Given an input base, an output base, input ratio, output ratio and input
-    data (as an iterable of integers), return an iterable of integers of the
-    input data decoded into the output base, using the given ratios. Interprets
-    the integer that is 1 more than the input base's max integer as a padding
-    symbol (so interpretted padding integer for decoding base64 would be 64, as
-    base64 input would be in the range 0-63).
+    Raises InvalidInputLengthError if the length of the given input data is
+    not an exact multiple of the input ratio.
     """
     # raise an exception early if padding was truncated
     if len(input_data) % input_ratio != 0:
@@ -30,8 +36,28 @@ def decode_raw(input_base, output_base, input_ratio, output_ratio, input_data):
             'Decoding requires input length to be an exact multiple of the '
             'input ratio, or for padding to be used to ensure this.'
         )
-    # create a 'workon' copy of the input data so we don't end up changing it
-    input_workon = list(input_data)
+
+
+def _check_symbols(input_data, symbol_table):
+    """
+    Raises InvalidInputError giving the offset of the first character of the
+    given string which is not in the given symbol table of single characters,
+    if there is one.
+    """
+    offset = find_invalid_symbol(input_data, symbol_table)
+    if offset is not None:
+        raise InvalidInputError(
+            'Encountered symbol not found in symbol table at offset '
+            '{0}'.format(offset)
+        )
+
+
+def _unpad_input(input_base, input_workon):
+    """
+    Replaces all padding symbols in the given list of input data in-place
+    with the maximum symbol of the input base and returns the number of
+    padding symbols that were replaced.
+    """
     # count number of padding symbols
     padding_length = input_workon.count(input_base)
     # now, replace all padding symbols with the maximmum symbol
@@ -41,24 +67,104 @@ def decode_raw(input_base, output_base, input_ratio, output_ratio, input_data):
     base85/ascii85 decoding and does not negatively impact 'perfect' aligning
     bases such as base64.
     '''
-    input_workon = [
-        (s if s != input_base else input_base - 1) for s in input_workon
-    ]
-    # use the encode_raw function to convert the data
-    output_data = encode_raw(
-        input_base=input_base, output_base=output_base,
-        input_ratio=input_ratio, output_ratio=output_ratio,
-        input_data=input_workon
-    )
+    if padding_length:
+        for i, s in enumerate(input_workon):
+            if s == input_base:
+                input_workon[i] = input_base - 1
+    return padding_length
+
+
+def _strip_padding(output_data, padding_length):
+    """
+    Removes the last padding_length symbols of the given list of output data
+    in-place, these being the decoded padding symbols.
+    """
     # strip off the unnecessary padding symbols if there was padding
-    [output_data.pop() for _ in range(padding_length)]
+    if padding_length:
+        del output_data[-padding_length:]
+
+
+def _filter_input(
+    input_symbol_table, input_padding, output_symbol_table, output_ratio,
+    input_data, ignore, shortcuts
+):
+    """
+    Validates the ignored symbols and shortcuts given to decode(), checks
+    strings of single characters for invalid symbols and returns the input
+    data with the ignored symbols removed.
+    """
+    # NOTE: input symbol table here includes the padding character
+    valid_symbols = input_symbol_table + [input_padding]
+    if ignore:
+        validate_ignored_symbols(ignore, valid_symbols)
+        filtered_data = delete_symbols(input_data, ignore)
+        valid_symbols += list(ignore)
+    if shortcuts:
+        validate_shortcuts(
+            shortcuts, output_ratio, output_symbol_table,
+            input_symbol_table, input_padding
+        )
+        valid_symbols += list(shortcuts.values())
+    # strings of single characters are checked for invalid symbols up front,
+    # before any symbols are removed, so the offset given is in the input
+    if (
+        isinstance(input_data, type('')) and
+        single_characters(valid_symbols)
+    ):
+        _check_symbols(input_data, valid_symbols)
+    if ignore:
+        return filtered_data
+    return input_data
+
+
+def _input_to_ints(input_symbol_table, input_padding, input_data):
+    """
+    Returns a new list of the raw values of the given input data, splitting
+    strings of multi-character symbols up first.
+    """
+    # NOTE: input symbol table here includes the padding character
+    symbol_table = input_symbol_table + [input_padding]
+    if isinstance(input_data, type('')) and needs_tokenizing(symbol_table):
+        # strings of multi-character symbols have to be split up first
+        return tokenize(input_data, symbol_map(symbol_table))
+    return symbols_to_ints(input_data, symbol_table)
+
+
+@instrumented('decode_raw')
+def decode_raw(
+    input_base, output_base, input_ratio, output_ratio, input_data,
+    engine=None
+):
+    """
+    Given an input base, an output base, input ratio, output ratio and input
+    data (as an iterable of integers), return an iterable of integers of the
+    input data decoded into the output base, using the given ratios. Interprets
+    the integer that is 1 more than the input base's max integer as a padding
+    symbol (so interpretted padding integer for decoding base64 would be 64, as
+    base64 input would be in the range 0-63).
+    If engine is given, the data is converted with the conversion engine of
+    that name (see basest.core.engines) instead of the best one available.
+    """
+    # create a 'workon' copy of the input data so we don't end up changing it
+    input_workon = list(input_data)
+    record_input([len(input_workon)])
+    _check_input_length(input_ratio, input_workon)
+    # replace the padding symbols so the data can be converted
+    padding_length = _unpad_input(input_base, input_workon)
+    # convert each chunk of the input data to the output base
+    output_data = _convert_chunks(
+        input_base, output_base, input_ratio, output_ratio, input_workon,
+        engine
+    )
+    _strip_padding(output_data, padding_length)
     return output_data
 
 
+@instrumented('decode')
 def decode(
     input_base, input_symbol_table, input_padding,
     output_base, output_symbol_table,
-    input_ratio, output_ratio, input_data
+    input_ratio, output_ratio, input_data, ignore=None, shortcuts=None
 ):
     """
     Given input and output bases, ratios, symbol tables, the padding symbol
@@ -66,6 +172,16 @@ def decode(
     of the data decoded from the input base to the output base.
     Assumes standard base64-style padding using the given input padding symbol,
     but can handle unpadded input just fine.
+    The input data may also be given as a string, in which case it is split
+    up into symbols (which may be several characters long), matching the
+    longest symbol possible at each point.
+    If ignore is given, any of the symbols in it (such as whitespace) are
+    removed from the input data before decoding. When the input data is a
+    string, these must be single characters.
+    If shortcuts is given, it should be the same dictionary of shortcut
+    symbols given to encode(), and each shortcut symbol found (on a chunk
+    boundary) is decoded as the chunk of output symbols it stands for. When
+    the input data is a string, shortcut symbols must be single characters.
     """
     # validate both symbol tables and the padding symbol before continuing
     validate_symbol_tables(
@@ -73,11 +189,62 @@ def decode(
         input_padding,
         output_symbol_table
     )
+    input_data = _filter_input(
+        input_symbol_table, input_padding, output_symbol_table,
+        output_ratio, input_data, ignore, shortcuts
+    )
+    if shortcuts:
+        record_input([len(input_data)])
+        # decode everything else in one go, then put the shortcuts in
+        plan, input_workon = remove_shortcut_symbols(
+            input_data, input_ratio, shortcuts
+        )
+        return insert_shortcuts(
+            plan, output_ratio,
+            decode(
+                input_base, input_symbol_table, input_padding,
+                output_base, output_symbol_table,
+                input_ratio, output_ratio, input_workon
+            )
+        )
+    # strings of single-character symbols can be looked up two at a time
+    tables = (
+        engines.is_allowed('lookup') and
+        isinstance(input_data, type('')) and
+        len(input_data) % input_ratio == 0 and
+        len(output_symbol_table) == output_base and
+        input_base ** input_ratio <= output_base ** output_ratio and
+        lookup.symbol_group_tables(
+            input_base, input_symbol_table, input_padding, input_ratio,
+            len(input_data)
+        )
+    )
+    if tables:
+        record_input([len(input_data)])
+        return lookup.decode_symbol_groups(
+            tables, input_padding, output_base, output_symbol_table,
+            input_ratio, output_ratio, input_data
+        )
     # create workon copy of input data and convert symbols to raw ints
-    # NOTE: input symbol table here includes the padding character
-    input_workon = symbols_to_ints(
-        input_data, input_symbol_table + [input_padding]
+    input_workon = _input_to_ints(
+        input_symbol_table, input_padding, input_data
     )
+    record_input([len(input_workon)])
+    # small chunk spaces can be looked up straight to output symbols
+    table = engines.is_allowed('lookup') and lookup.can_look_up_symbols(
+        input_base, output_base, input_ratio, output_ratio, input_symbol_table
+    ) and lookup.lookup_table(
+        input_base, output_base, input_ratio, output_ratio,
+        len(input_workon) // input_ratio, output_symbol_table
+    )
+    if table:
+        _check_input_length(input_ratio, input_workon)
+        padding_length = _unpad_input(input_base, input_workon)
+        output_data = lookup.convert_chunks(
+            table, input_base, input_ratio, input_workon
+        )
+        _strip_padding(output_data, padding_length)
+        return output_data
     # use decode_raw() to decode the data
     output_data = decode_raw(
         input_base=input_base, output_base=output_base,
@@ -86,3 +253,55 @@ def decode(
     )
     # convert raw output data back to symbols using output symbol table
     return ints_to_symbols(output_data, output_symbol_table)
+
+
+@instrumented('decode_many')
+def decode_many(
+    input_base, input_symbol_table, input_padding,
+    output_base, output_symbol_table,
+    input_ratio, output_ratio, inputs
+):
+    """
+    Given input and output bases, ratios, symbol tables, the padding symbol
+    used by the input data and a sequence of many inputs to decode, return a
+    list of each input decoded in the same way as decode() would.
+    Validation and setup is done only once for the whole batch, and all the
+    inputs are converted together in one pass.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        input_symbol_table,
+        input_padding,
+        output_symbol_table
+    )
+    # NOTE: input symbol table here includes the padding character
+    input_map = symbol_map(input_symbol_table + [input_padding])
+    # join all the inputs, keeping track of the output length and padding
+    # length of each one
+    input_workon = []
+    layout = []
+    lengths = []
+    for input_data in inputs:
+        message = map_symbols_to_ints(input_data, input_map)
+        lengths.append(len(message))
+        _check_input_length(input_ratio, message)
+        padding_length = _unpad_input(input_base, message)
+        input_workon.extend(message)
+        layout.append(
+            ((len(message) // input_ratio) * output_ratio, padding_length)
+        )
+    record_input(lengths)
+    output_data = ints_to_symbols(
+        _convert_chunks(
+            input_base, output_base, input_ratio, output_ratio, input_workon
+        ),
+        output_symbol_table
+    )
+    # split the output back up into one output per input, without padding
+    outputs = []
+    start = 0
+    for output_length, padding_length in layout:
+        stop = start + output_length
+        outputs.append(output_data[start:stop - padding_length])
+        start = stop
+    return outputs
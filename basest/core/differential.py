@@ -0,0 +1,367 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+from collections import namedtuple
+
+from . import engines, lookup
+from .best_ratio import best_ratio
+from .decode import decode, decode_raw
+from .encode import encode, encode_raw
+
+
+# the engine every other engine is checked against
+REFERENCE_ENGINE = 'reference'
+
+# The ways of running symbol-level cases, checked against the first:
+# - reference: with the reference engine forced, so no lookup tables are used
+# - automatic: choosing engines and lookup tables as encode() and decode() do
+# - tables: with every lookup table the case could use built beforehand
+# - memo: with a MemoizedEncoder, converting chunks with its chunk cache
+SYMBOL_PATHS = ('reference', 'automatic', 'tables', 'memo')
+
+# the single-character symbols that symbol tables are picked from, which are
+# text (not bytes) on Python 2 as well, so they can be joined into strings
+_SYMBOLS = list(bytearray(range(256)).decode('latin-1'))
+
+# One call of encode_raw() or decode_raw() (given by operation, which is
+# 'encode' or 'decode') with the given arguments
+Case = namedtuple(
+    'Case',
+    [
+        'operation', 'input_base', 'output_base', 'input_ratio',
+        'output_ratio', 'input_data',
+    ]
+)
+
+# One call of encode() or decode() with the given arguments, where the
+# padding symbol is that of the encoded data (the output when encoding, the
+# input when decoding). Encoding input data is a list of symbols, decoding
+# input data is a string
+SymbolCase = namedtuple(
+    'SymbolCase',
+    [
+        'operation', 'input_base', 'input_symbol_table', 'output_base',
+        'output_symbol_table', 'padding_symbol', 'input_ratio',
+        'output_ratio', 'input_data',
+    ]
+)
+
+# A case for which an engine (or symbol path) gave a different outcome
+# (output data, or the type of exception raised) to the one the reference
+# engine expected
+Mismatch = namedtuple('Mismatch', ['engine', 'case', 'expected', 'actual'])
+
+
+def outcome(case, engine):
+    """
+    Returns the output data of running the given case with the engine of the
+    given name, or the type of exception it raised.
+    """
+    function = encode_raw if case.operation == 'encode' else decode_raw
+    try:
+        return function(
+            case.input_base, case.output_base,
+            case.input_ratio, case.output_ratio,
+            list(case.input_data), engine=engine
+        )
+    except Exception as error:
+        return type(error)
+
+
+def check_case(case, engine_names=None):
+    """
+    Runs the given case with the reference engine and every other engine
+    which supports it (or just the engines with the given names), returning
+    a list of Mismatches for the engines which gave a different outcome.
+    """
+    if engine_names is None:
+        engine_names = engines.engine_names()
+    expected = outcome(case, REFERENCE_ENGINE)
+    mismatches = []
+    for name in engine_names:
+        if name == REFERENCE_ENGINE or not engines.supports(
+            name, case.input_base, case.output_base,
+            case.input_ratio, case.output_ratio, case.input_data
+        ):
+            continue
+        actual = outcome(case, name)
+        if actual != expected:
+            mismatches.append(Mismatch(name, case, expected, actual))
+    return mismatches
+
+
+def _memo_outcome(case):
+    """
+    Returns the output data of running the given SymbolCase twice with a
+    MemoizedEncoder which only caches chunks, so the second run converts them
+    from the cache.
+    """
+    # imported here, as the encoders package is built on this one
+    from ..encoders import Encoder
+    from ..encoders.memo import MemoizedEncoder
+
+    if case.operation == 'encode':
+        symbol_tables = (case.input_symbol_table, case.output_symbol_table)
+        bases = (case.input_base, case.output_base)
+        ratios = (case.input_ratio, case.output_ratio)
+    else:
+        symbol_tables = (case.output_symbol_table, case.input_symbol_table)
+        bases = (case.output_base, case.input_base)
+        ratios = (case.output_ratio, case.input_ratio)
+
+    class FuzzEncoder(Encoder):
+        input_base, output_base = bases
+        input_ratio, output_ratio = ratios
+        input_symbol_table, output_symbol_table = symbol_tables
+        padding_symbol = case.padding_symbol
+
+    memoized = MemoizedEncoder(FuzzEncoder(), message_cache_size=0)
+    convert = getattr(memoized, case.operation)
+    convert(case.input_data)
+    return convert(case.input_data)
+
+
+def _build_tables(case):
+    """
+    Builds every lookup table the given SymbolCase could use, however little
+    data it has, so that they are all used when it is run.
+    """
+    size = lookup.chunk_space(case.input_base, case.input_ratio)
+    if size is not None:
+        lookup.lookup_table(
+            case.input_base, case.output_base,
+            case.input_ratio, case.output_ratio, size
+        )
+    if lookup.can_look_up_symbols(
+        case.input_base, case.output_base, case.input_ratio,
+        case.output_ratio, case.input_symbol_table
+    ):
+        lookup.lookup_table(
+            case.input_base, case.output_base, case.input_ratio,
+            case.output_ratio, size, case.output_symbol_table
+        )
+    if case.operation == 'decode':
+        lookup.symbol_group_tables(
+            case.input_base, case.input_symbol_table, case.padding_symbol,
+            case.input_ratio, lookup.LOOKUP_TABLE_MAX_SIZE
+        )
+
+
+def symbol_outcome(case, path):
+    """
+    Returns the output data of running the given SymbolCase in the way given
+    by path (see SYMBOL_PATHS), or the type of exception it raised. Any
+    lookup tables built for the case are thrown away afterwards, as the
+    random symbol tables of other cases would never use them.
+    NOTE: this forces engines and replaces the lookup table cache for the
+    whole process while it runs, so it must not be run while anything else
+    is converting data.
+    """
+    tables = dict(lookup._tables)
+    forced = engines._forced
+    try:
+        if path == 'reference':
+            engines.force_engine(REFERENCE_ENGINE)
+        elif path == 'tables':
+            _build_tables(case)
+        elif path == 'memo':
+            return _memo_outcome(case)
+        if case.operation == 'encode':
+            return list(encode(
+                case.input_base, case.input_symbol_table,
+                case.output_base, case.output_symbol_table,
+                case.padding_symbol, case.input_ratio, case.output_ratio,
+                case.input_data
+            ))
+        return list(decode(
+            case.input_base, case.input_symbol_table, case.padding_symbol,
+            case.output_base, case.output_symbol_table,
+            case.input_ratio, case.output_ratio, case.input_data
+        ))
+    except Exception as error:
+        return type(error)
+    finally:
+        engines.force_engine(forced)
+        lookup._tables.clear()
+        lookup._tables.update(tables)
+
+
+def check_symbol_case(case, paths=None):
+    """
+    Runs the given SymbolCase in the first of the SYMBOL_PATHS and every
+    other one (or just the paths with the given names), returning a list of
+    Mismatches (naming the path as the engine) for the paths which gave a
+    different outcome.
+    """
+    expected = symbol_outcome(case, SYMBOL_PATHS[0])
+    mismatches = []
+    for path in SYMBOL_PATHS[1:] if paths is None else paths:
+        actual = symbol_outcome(case, path)
+        if actual != expected:
+            mismatches.append(Mismatch(path, case, expected, actual))
+    return mismatches
+
+
+def _smaller_inputs(input_data, input_ratio, zero=0):
+    """
+    Yields variations of the given input data which are simpler than it:
+    with blocks of symbols (halves, chunks, then single symbols) removed, or
+    with single symbols replaced by the given zero symbol.
+    """
+    length = len(input_data)
+    for size in sorted(set([length // 2, input_ratio, 1]), reverse=True):
+        if not size:
+            continue
+        for start in range(0, length - size + 1, size):
+            yield input_data[:start] + input_data[start + size:]
+    for i, symbol in enumerate(input_data):
+        if symbol != zero:
+            yield input_data[:i] + [zero] + input_data[i + 1:]
+
+
+def shrink(mismatch):
+    """
+    Returns a Mismatch for the simplest input data found, by repeatedly
+    removing and zeroing symbols of the given Mismatch's input data, for
+    which the same engine (or symbol path) still gives a different outcome
+    to the reference engine.
+    """
+    while True:
+        case = mismatch.case
+        if isinstance(case, SymbolCase):
+            check, zero = check_symbol_case, case.input_symbol_table[0]
+        else:
+            check, zero = check_case, 0
+        for input_data in _smaller_inputs(
+            list(case.input_data), case.input_ratio, zero
+        ):
+            if isinstance(case.input_data, type('')):
+                input_data = ''.join(input_data)
+            smaller = check(
+                case._replace(input_data=input_data), [mismatch.engine]
+            )
+            if smaller:
+                mismatch = smaller[0]
+                break
+        else:
+            return mismatch
+
+
+def random_case(generator, max_base=256, max_ratio=20, max_chunks=8):
+    """
+    Returns a random Case using the given random number generator, with
+    bases up to max_base and the best ratio up to max_ratio for them (as
+    given by best_ratio()). Decoding cases are usually valid encoded data,
+    but are sometimes cut short.
+    """
+    input_base = generator.randint(2, max_base)
+    output_base, (input_ratio, output_ratio) = best_ratio(
+        input_base, [generator.randint(2, max_base)],
+        range(1, max_ratio + 1)
+    )
+    length = generator.randint(0, (max_chunks + 1) * input_ratio - 1)
+    input_data = [generator.randrange(input_base) for _ in range(length)]
+    case = Case(
+        'encode', input_base, output_base, input_ratio, output_ratio,
+        input_data
+    )
+    if generator.random() < 0.5:
+        return case
+    encoded_data = outcome(case, REFERENCE_ENGINE)
+    if not isinstance(encoded_data, list):
+        # this data can't be encoded, so try encoding it instead
+        return case
+    if encoded_data and generator.random() < 0.2:
+        del encoded_data[generator.randrange(len(encoded_data)):]
+    return Case(
+        'decode', output_base, input_base, output_ratio, input_ratio,
+        encoded_data
+    )
+
+
+def random_symbol_case(generator, max_base=255, max_ratio=20, max_chunks=8):
+    """
+    Returns a random SymbolCase using the given random number generator, made
+    from a random Case (see random_case()) by picking random symbol tables of
+    single characters for it. Bases are at most 255, so that there is always
+    a character left for the padding symbol. Decoding cases sometimes have a
+    symbol swapped for one which isn't in the symbol table.
+    """
+    case = random_case(generator, min(max_base, 255), max_ratio, max_chunks)
+    input_symbol_table = generator.sample(_SYMBOLS, case.input_base)
+    output_symbol_table = generator.sample(_SYMBOLS, case.output_base)
+    encoded_symbol_table = (
+        output_symbol_table if case.operation == 'encode'
+        else input_symbol_table
+    )
+    padding_symbol = generator.choice(
+        [s for s in _SYMBOLS if s not in encoded_symbol_table]
+    )
+    if case.operation == 'encode':
+        input_data = [input_symbol_table[s] for s in case.input_data]
+    else:
+        symbols = input_symbol_table + [padding_symbol]
+        input_data = [symbols[s] for s in case.input_data]
+        invalid = [s for s in _SYMBOLS if s not in symbols]
+        if invalid and input_data and generator.random() < 0.1:
+            input_data[generator.randrange(len(input_data))] = (
+                generator.choice(invalid)
+            )
+        input_data = ''.join(input_data)
+    return SymbolCase(
+        case.operation, case.input_base, input_symbol_table,
+        case.output_base, output_symbol_table, padding_symbol,
+        case.input_ratio, case.output_ratio, input_data
+    )
+
+
+def fuzz(
+    iterations=1000, seed=None, engine_names=None, max_base=256,
+    max_ratio=20, max_chunks=8, paths=None
+):
+    """
+    Runs the given number of random cases (see random_case()) with the
+    reference engine and every other engine (or just the engines with the
+    given names), and as many random symbol-level cases (see
+    random_symbol_case()) in each of the SYMBOL_PATHS (or just the paths
+    with the given names, where an empty list runs none). Returns a list of
+    the simplest Mismatch found for each engine or path which ever gave a
+    different outcome. An empty list means that every engine and path always
+    matched the reference.
+    Give a seed to run the same cases again.
+    NOTE: the symbol-level cases force engines (see force_engine()) and
+    replace the lookup table cache for the whole process while they run, so
+    unless paths is an empty list, fuzz() must not be run while anything else
+    (such as another thread) is converting data.
+    """
+    generator = random.Random(seed)
+    found = {}
+    for _ in range(iterations):
+        case = random_case(generator, max_base, max_ratio, max_chunks)
+        names = [
+            name for name in engine_names or engines.engine_names()
+            if name not in found
+        ]
+        for mismatch in check_case(case, names):
+            found[mismatch.engine] = shrink(mismatch)
+        names = [
+            name for name in (SYMBOL_PATHS[1:] if paths is None else paths)
+            if name not in found
+        ]
+        if names:
+            case = random_symbol_case(
+                generator, max_base, max_ratio, max_chunks
+            )
+            for mismatch in check_symbol_case(case, names):
+                found[mismatch.engine] = shrink(mismatch)
+    return [found[name] for name in sorted(found)]
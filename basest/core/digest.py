@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import struct
+import zlib
+
+from ..exceptions import ImproperUsageError, InvalidInputError
+from .decode import (
+    _check_input_length, _filter_input, _input_to_ints, _unpad_input
+)
+from .encode import _convert_chunks, _encode_ints, _pad_input
+from .shortcuts import (
+    insert_shortcuts, remove_shortcut_chunks, remove_shortcut_symbols,
+    validate_shortcuts
+)
+from .utils import ints_to_symbols, symbol_map, validate_symbol_tables
+
+
+'''
+A digest is any object with an update() method taking bytes, such as the
+hash objects of hashlib or a Checksum. Digests can only be taken of raw data
+in base 256 (bytes), which is the input of encoding and the output of
+decoding. The input is read once and converted a block of chunks at a time,
+with the raw data of each block added to the digest as it is converted, so
+the caller gets both the converted data and a digest of the raw data in one
+pass (only input with shortcuts is decoded in a single block, as the chunks
+they stand for can be anywhere in the output).
+'''
+
+# the symbol table of raw data which is already bytes
+_BYTE_SYMBOL_TABLE = list(range(256))
+# the number of chunks converted and added to the digest at a time
+_BLOCK_CHUNKS = 65536
+
+
+class Checksum(object):
+    """
+    Wraps a checksum function like zlib.crc32() or zlib.adler32() (which
+    take some bytes and the running value so far) in the same interface as
+    the hash objects of hashlib, so it can be used as a digest. The running
+    value is kept as an unsigned integer in value, and a checksum can be
+    carried on from a value saved earlier by passing it in.
+    """
+    def __init__(self, function=zlib.crc32, value=None):
+        self.function = function
+        # the value of a checksum of no data is its starting value
+        self.value = function(b'') if value is None else value
+
+    def update(self, data):
+        """
+        Adds the given bytes (or bytearray) to the checksum.
+        """
+        # Python 2's checksum functions don't accept bytearrays
+        self.value = self.function(bytes(data), self.value) & 0xffffffff
+
+    def digest(self):
+        """
+        Returns the checksum as four big-endian bytes.
+        """
+        return struct.pack(str('>I'), self.value)
+
+    def hexdigest(self):
+        """
+        Returns the checksum as eight hexadecimal digits.
+        """
+        return '{0:08x}'.format(self.value)
+
+
+def check_digest_base(raw_base):
+    """
+    Raises ImproperUsageError if the given base of the raw side of a
+    conversion is not 256, as digests can only be taken of bytes.
+    """
+    if raw_base != 256:
+        raise ImproperUsageError('Digests require raw data of base 256')
+
+
+def update_digest(digest, raw_data):
+    """
+    Updates the given digest with some raw data, given as bytes or as an
+    iterable of integers.
+    Returns the raw data as bytes (or a bytearray), so it can be converted
+    without turning it into bytes again.
+    """
+    if not isinstance(raw_data, (bytes, bytearray)):
+        raw_data = bytearray(raw_data)
+    digest.update(raw_data)
+    return raw_data
+
+
+def _raw_bytes(input_data, symbol_table):
+    """
+    Returns the given raw data, as symbols of the given symbol table, as a
+    bytearray, reading it only once.
+    Raises InvalidInputError if any of it is not in the symbol table.
+    """
+    try:
+        if symbol_table == _BYTE_SYMBOL_TABLE:
+            return bytearray(input_data)
+        symbols = symbol_map(symbol_table)
+        return bytearray(symbols[s] for s in input_data)
+    except (KeyError, TypeError, ValueError):
+        raise InvalidInputError('Encountered symbol not found in symbol table')
+
+
+def _decode_blocks(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Decodes the given list of raw input data in-place in the same way as
+    decode_raw(), yielding the output as lists of integers a block of chunks
+    at a time.
+    """
+    _check_input_length(input_ratio, input_workon)
+    padding_length = _unpad_input(input_base, input_workon)
+    # the decoded padding is stripped off the end of the whole output
+    output_length = (
+        (len(input_workon) // input_ratio) * output_ratio - padding_length
+    )
+    block_length = _BLOCK_CHUNKS * input_ratio
+    for start in range(0, len(input_workon), block_length):
+        output_data = _convert_chunks(
+            input_base, output_base, input_ratio, output_ratio,
+            input_workon[start:start + block_length]
+        )
+        yield output_data[:max(output_length, 0)]
+        output_length -= len(output_data)
+
+
+def encode_digest(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, input_data, digest, shortcuts=None
+):
+    """
+    Given the same arguments as encode() and a digest, return a tuple of
+    (output_data, digest) where output_data is what encode() returns and
+    digest is the digest of the input data as returned by digest.digest().
+    The input base must be 256.
+    """
+    check_digest_base(input_base)
+    validate_symbol_tables(
+        output_symbol_table,
+        output_padding,
+        input_symbol_table
+    )
+    if shortcuts:
+        validate_shortcuts(
+            shortcuts, input_ratio, input_symbol_table,
+            output_symbol_table, output_padding
+        )
+        # chunks are looked up in the shortcuts by their raw values
+        input_map = symbol_map(input_symbol_table)
+        shortcuts = dict(
+            (tuple(input_map[s] for s in chunk), symbol)
+            for chunk, symbol in shortcuts.items()
+        )
+    # the input is only added once it is all known to be valid
+    raw_data = _raw_bytes(input_data, input_symbol_table)
+    # likewise, only once it is known that it can be padded
+    _pad_input(
+        input_base, output_base, input_ratio,
+        [0] * (len(raw_data) % input_ratio)
+    )
+    output_data = []
+    block_length = _BLOCK_CHUNKS * input_ratio
+    for start in range(0, len(raw_data), block_length):
+        block = raw_data[start:start + block_length]
+        digest.update(block)
+        if shortcuts:
+            plan, input_workon = remove_shortcut_chunks(
+                block, input_ratio, shortcuts
+            )
+        else:
+            plan, input_workon = [(0, None)], list(block)
+        output_data.extend(
+            insert_shortcuts(
+                plan, output_ratio,
+                _encode_ints(
+                    input_base, input_symbol_table,
+                    output_base, output_symbol_table, output_padding,
+                    input_ratio, output_ratio, input_workon
+                )
+            )
+        )
+    return output_data, digest.digest()
+
+
+def decode_digest(
+    input_base, input_symbol_table, input_padding,
+    output_base, output_symbol_table,
+    input_ratio, output_ratio, input_data, digest, ignore=None,
+    shortcuts=None
+):
+    """
+    Given the same arguments as decode() and a digest, return a tuple of
+    (output_data, digest) where output_data is what decode() returns and
+    digest is the digest of the output data as returned by digest.digest().
+    The output base must be 256.
+    """
+    check_digest_base(output_base)
+    validate_symbol_tables(
+        input_symbol_table,
+        input_padding,
+        output_symbol_table
+    )
+    input_data = _filter_input(
+        input_symbol_table, input_padding, output_symbol_table,
+        output_ratio, input_data, ignore, shortcuts
+    )
+    if shortcuts:
+        plan, input_data = remove_shortcut_symbols(
+            input_data, input_ratio, shortcuts
+        )
+    blocks = _decode_blocks(
+        input_base, output_base, input_ratio, output_ratio,
+        _input_to_ints(input_symbol_table, input_padding, input_data)
+    )
+    if shortcuts:
+        # the chunks shortcuts stand for are put back in as raw values
+        output_map = symbol_map(output_symbol_table)
+        plan = [
+            (chunks, None if chunk is None else [output_map[s] for s in chunk])
+            for chunks, chunk in plan
+        ]
+        blocks = [
+            insert_shortcuts(
+                plan, output_ratio, [i for block in blocks for i in block]
+            )
+        ]
+    output_data = []
+    for raw_data in blocks:
+        digest.update(bytearray(raw_data))
+        output_data.extend(ints_to_symbols(raw_data, output_symbol_table))
+    return output_data, digest.digest()
@@ -10,8 +10,16 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
+from . import engines, lookup
 from ..exceptions import ImproperUsageError
-from .utils import ints_to_symbols, symbols_to_ints, validate_symbol_tables
+from .instrumentation import instrumented, record_input
+from .shortcuts import (
+    insert_shortcuts, remove_shortcut_chunks, validate_shortcuts
+)
+from .utils import (
+    ints_to_symbols, map_symbols_to_ints, symbol_map, symbols_to_ints,
+    validate_symbol_tables
+)
 
 
 def _nearest_length(input_length, input_ratio):
@@ -28,17 +36,14 @@ def _nearest_length(input_length, input_ratio):
     )
 
 
-def encode_raw(input_base, output_base, input_ratio, output_ratio, input_data):
+def _pad_input(input_base, output_base, input_ratio, input_workon):
     """
-    Given an input base, an output base, input ratio, output ratio and input
-    data (as an iterable of integers), return an iterable of integers of the
-    input data encoded into the output base, using the given ratios. Uses the
-    integer that is 1 more than the output base's max integer as a padding
-    symbol (so padding integer for base64 encoding would be 64, as base64
-    output would be in the range 0-63).
+    Extends the given list of input data in-place with zeroes up to the
+    nearest length that is divisible by the input ratio and returns the number
+    of padding symbols that were added.
+    Raises ImproperUsageError if padding is needed but the output base is
+    larger than the input base.
     """
-    # create a 'workon' copy of the input data so we don't end up changing it
-    input_workon = list(input_data)
     # store length of input data for future reference
     input_length = len(input_workon)
     '''
@@ -56,45 +61,112 @@ def encode_raw(input_base, output_base, input_ratio, output_ratio, input_data):
     input_nearest_length = _nearest_length(input_length, input_ratio)
     # calculate the amount of padding needed
     padding_length = (input_nearest_length - input_length)
-    # get the output length, based on nearest divisible input length
-    output_length = (input_nearest_length // input_ratio) * output_ratio
-    # create a new list for the output data
-    output_data = [0] * output_length
     # extend the input_data to the nearest divisible length (for padding)
     input_workon.extend([0] * padding_length)
-    # encode the data - store each group of input_ratio symbols in a number
-    for i in range(0, input_nearest_length, input_ratio):
-        store = 0
-        for j in range(0, input_ratio):
-            # store value of symbol
-            symbol = input_workon[i + j]
-            # upscale it if neccessary, in a little-endian manner
-            symbol *= (input_base ** (input_ratio - j - 1))
-            # add to store
-            store += symbol
-        '''
-        now that store contains the value of a number of symbols, separate this
-        out to the output symbols
-        '''
-        for k in range(0, output_ratio):
-            # convert output array index
-            index = ((i // input_ratio) * output_ratio) + k
-            # re-interpret the number in terms of output base
-            symbol = store // (output_base ** (output_ratio - k - 1))
-            # store at the calculated position
-            output_data[index] = symbol
-            # decrement the store variable, having now encoded part of it
-            store -= (symbol * (output_base ** (output_ratio - k - 1)))
+    return padding_length
+
+
+def _convert_chunks(
+    input_base, output_base, input_ratio, output_ratio, input_workon,
+    engine=None
+):
+    """
+    Converts a list of input data whose length is an exact multiple of the
+    input ratio from the input base to the output base, one chunk of
+    input_ratio symbols at a time, returning a new list of output data.
+    The conversion is done by the engine with the given name, or by the best
+    engine available for it (see basest.core.engines).
+    """
+    return engines.convert_chunks(
+        input_base, output_base, input_ratio, output_ratio, input_workon,
+        engine
+    )
+
+
+def _pad_output(output_base, output_data, padding_length):
+    """
+    Overwrites the last padding_length symbols of the given list of output
+    data in-place with the padding symbol (the value of the output base).
+    """
+    output_length = len(output_data)
     # set padding bytes to padding symbol, if needed
     for i in range(output_length - padding_length, output_length):
         output_data[i] = output_base
+
+
+def _encode_ints(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, input_workon
+):
+    """
+    Encodes the given list of raw input data in-place in the same way as
+    encode() and returns the output as a new list of output symbols.
+    """
+    # small chunk spaces can be looked up straight to output symbols
+    table = engines.is_allowed('lookup') and lookup.can_look_up_symbols(
+        input_base, output_base, input_ratio, output_ratio, input_symbol_table
+    ) and lookup.lookup_table(
+        input_base, output_base, input_ratio, output_ratio,
+        _nearest_length(len(input_workon), input_ratio) // input_ratio,
+        output_symbol_table
+    )
+    padding_length = _pad_input(
+        input_base, output_base, input_ratio, input_workon
+    )
+    if table:
+        output_data = lookup.convert_chunks(
+            table, input_base, input_ratio, input_workon
+        )
+        _pad_output(output_padding, output_data, padding_length)
+        return output_data
+    # encode the data in the same way as encode_raw()
+    output_data = _convert_chunks(
+        input_base, output_base, input_ratio, output_ratio, input_workon
+    )
+    _pad_output(output_base, output_data, padding_length)
+    # convert raw output data back to symbols using output symbol table
+    # NOTE: output symbol table here includes the padding character
+    return ints_to_symbols(output_data, output_symbol_table + [output_padding])
+
+
+@instrumented('encode_raw')
+def encode_raw(
+    input_base, output_base, input_ratio, output_ratio, input_data,
+    engine=None
+):
+    """
+    Given an input base, an output base, input ratio, output ratio and input
+    data (as an iterable of integers), return an iterable of integers of the
+    input data encoded into the output base, using the given ratios. Uses the
+    integer that is 1 more than the output base's max integer as a padding
+    symbol (so padding integer for base64 encoding would be 64, as base64
+    output would be in the range 0-63).
+    If engine is given, the data is converted with the conversion engine of
+    that name (see basest.core.engines) instead of the best one available.
+    """
+    # create a 'workon' copy of the input data so we don't end up changing it
+    input_workon = list(input_data)
+    record_input([len(input_workon)])
+    # pad the input data up to a whole number of chunks
+    padding_length = _pad_input(
+        input_base, output_base, input_ratio, input_workon
+    )
+    # convert each chunk of the input data to the output base
+    output_data = _convert_chunks(
+        input_base, output_base, input_ratio, output_ratio, input_workon,
+        engine
+    )
+    # mark the padded part of the output with the padding symbol
+    _pad_output(output_base, output_data, padding_length)
     return output_data
 
 
+@instrumented('encode')
 def encode(
     input_base, input_symbol_table,
     output_base, output_symbol_table, output_padding,
-    input_ratio, output_ratio, input_data
+    input_ratio, output_ratio, input_data, shortcuts=None
 ):
     """
     Given input and output bases, ratios, symbol tables, the padding symbol
@@ -102,6 +174,10 @@ def encode(
     of the data encoded from the input base to the output base.
     Uses standard base64-style padding if needed, using the given padding
     symbol.
+    If shortcuts is given, it should be a dictionary mapping tuples of
+    input_ratio input symbols to a single output symbol (not in the output
+    symbol table) which whole chunks of them are encoded as instead, such as
+    the 'z' of ascii85 for four zero bytes.
     """
     # validate both symbol tables and the padding symbol before continuing
     validate_symbol_tables(
@@ -109,14 +185,86 @@ def encode(
         output_padding,
         input_symbol_table
     )
+    if shortcuts:
+        validate_shortcuts(
+            shortcuts, input_ratio, input_symbol_table,
+            output_symbol_table, output_padding
+        )
+        record_input([len(input_data)])
+        # encode everything else in one go, then put the shortcuts in
+        plan, input_workon = remove_shortcut_chunks(
+            input_data, input_ratio, shortcuts
+        )
+        return insert_shortcuts(
+            plan, output_ratio,
+            encode(
+                input_base, input_symbol_table,
+                output_base, output_symbol_table, output_padding,
+                input_ratio, output_ratio, input_workon
+            )
+        )
     # create workon copy of input data and convert symbols to raw ints
     input_workon = symbols_to_ints(input_data, input_symbol_table)
-    # use encode_raw() to encode the data
-    output_data = encode_raw(
-        input_base=input_base, output_base=output_base,
-        input_ratio=input_ratio, output_ratio=output_ratio,
-        input_data=input_workon
+    record_input([len(input_workon)])
+    return _encode_ints(
+        input_base, input_symbol_table,
+        output_base, output_symbol_table, output_padding,
+        input_ratio, output_ratio, input_workon
     )
-    # convert raw output data back to symbols using output symbol table
-    # NOTE: output symbol table here includes the padding character
-    return ints_to_symbols(output_data, output_symbol_table + [output_padding])
+
+
+@instrumented('encode_many')
+def encode_many(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, inputs
+):
+    """
+    Given input and output bases, ratios, symbol tables, the padding symbol
+    to use for output padding and a sequence of many inputs to encode, return
+    a list of each input encoded in the same way as encode() would.
+    Validation and setup is done only once for the whole batch, and all the
+    inputs are converted together in one pass.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        output_symbol_table,
+        output_padding,
+        input_symbol_table
+    )
+    input_map = symbol_map(input_symbol_table)
+    # join all the inputs, each padded to a whole number of chunks, keeping
+    # track of the output length and padding length of each one
+    input_workon = []
+    layout = []
+    lengths = []
+    for input_data in inputs:
+        message = map_symbols_to_ints(input_data, input_map)
+        lengths.append(len(message))
+        padding_length = _pad_input(
+            input_base, output_base, input_ratio, message
+        )
+        input_workon.extend(message)
+        layout.append(
+            ((len(message) // input_ratio) * output_ratio, padding_length)
+        )
+    record_input(lengths)
+    output_data = ints_to_symbols(
+        _convert_chunks(
+            input_base, output_base, input_ratio, output_ratio, input_workon
+        ),
+        output_symbol_table
+    )
+    # split the output back up into one output per input
+    outputs = []
+    start = 0
+    for output_length, padding_length in layout:
+        stop = start + output_length
+        message = output_data[start:stop]
+        # set padding symbols, if needed
+        message[output_length - padding_length:] = (
+            [output_padding] * padding_length
+        )
+        outputs.append(message)
+        start = stop
+    return outputs
@@ -0,0 +1,282 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import threading
+from collections import namedtuple
+
+from . import lookup, radix
+from ..exceptions import ImproperUsageError
+
+
+# chunks with a ratio at least this large are converted by divide-and-conquer
+DIVIDE_AND_CONQUER_RATIO = 5
+
+# A strategy for converting chunks of data from one base to another:
+# - name: the name the engine is registered, forced and disabled by
+# - convert: callable taking (input_base, output_base, input_ratio,
+#   output_ratio, input_workon) like _convert_chunks(), returning a new list
+#   of output data, or None if it turns out it can't convert the data
+# - priority: callable taking the same arguments, returning None if the
+#   engine doesn't support the conversion at all, otherwise a number, where
+#   the supporting engine with the highest number is tried first
+Engine = namedtuple('Engine', ['name', 'convert', 'priority'])
+
+# the registered engines, disabled engine names and forced engine name (if
+# any). These are replaced (never modified) when they change, so they are
+# always safe to use from any thread
+_engines = ()
+_disabled = frozenset()
+_forced = None
+_engines_lock = threading.Lock()
+
+
+def _find_engine(name):
+    """
+    Returns the registered engine with the given name.
+    Raises ValueError if there isn't one.
+    """
+    for engine in _engines:
+        if engine.name == name:
+            return engine
+    raise ValueError('Engine {0!r} is not registered'.format(name))
+
+
+def register_engine(name, convert, priority):
+    """
+    Register a new engine for converting chunks (see Engine), replacing any
+    engine already registered with the same name.
+    """
+    global _engines
+    with _engines_lock:
+        _engines = tuple(e for e in _engines if e.name != name) + (
+            Engine(name, convert, priority),
+        )
+
+
+def unregister_engine(name):
+    """
+    Unregister the engine with the given name.
+    Raises ValueError if there isn't one.
+    """
+    global _engines
+    with _engines_lock:
+        _find_engine(name)
+        _engines = tuple(e for e in _engines if e.name != name)
+
+
+def engine_names():
+    """
+    Returns a tuple of the names of all registered engines.
+    """
+    return tuple(e.name for e in _engines)
+
+
+def disable_engine(name):
+    """
+    Stop the engine with the given name from being chosen automatically. It
+    can still be used by forcing it.
+    Raises ValueError if there is no such engine.
+    """
+    global _disabled
+    with _engines_lock:
+        _find_engine(name)
+        _disabled = _disabled | frozenset([name])
+
+
+def enable_engine(name):
+    """
+    Allow the engine with the given name to be chosen automatically again
+    after it was disabled.
+    """
+    global _disabled
+    with _engines_lock:
+        _disabled = _disabled - frozenset([name])
+
+
+def force_engine(name):
+    """
+    Use the engine with the given name for every conversion from now on,
+    unless a different engine is given for a conversion. Pass None to go back
+    to choosing engines automatically.
+    Raises ValueError if there is no such engine.
+    """
+    global _forced
+    with _engines_lock:
+        if name is not None:
+            _find_engine(name)
+        _forced = name
+
+
+def supports(
+    name, input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Returns True if the engine with the given name supports converting the
+    given data (whether or not it is disabled).
+    Raises ValueError if there is no such engine.
+    """
+    return _find_engine(name).priority(
+        input_base, output_base, input_ratio, output_ratio, input_workon
+    ) is not None
+
+
+def is_allowed(name):
+    """
+    Returns True if the engine with the given name may currently be chosen
+    automatically (it isn't disabled, and no other engine is forced). Used to
+    decide whether shortcuts which do the same work as an engine (such as
+    looking chunks up straight to symbols) can be taken.
+    """
+    return name not in _disabled and _forced in (None, name)
+
+
+def convert_chunks(
+    input_base, output_base, input_ratio, output_ratio, input_workon,
+    engine=None
+):
+    """
+    Converts a list of input data whose length is an exact multiple of the
+    input ratio from the input base to the output base, returning a new list
+    of output data, with the engine with the given name (or the forced
+    engine, if there is one). Otherwise, the engines which support the
+    conversion and aren't disabled are tried in order of priority.
+    Raises ImproperUsageError if no engine can convert the data.
+    """
+    name = engine or _forced
+    if name is not None:
+        candidates = (_find_engine(name),)
+    elif _disabled:
+        candidates = [e for e in _engines if e.name not in _disabled]
+    else:
+        candidates = _engines
+    ranked = []
+    for candidate in candidates:
+        priority = candidate.priority(
+            input_base, output_base, input_ratio, output_ratio, input_workon
+        )
+        if priority is not None:
+            # keep registration order for engines with equal priorities
+            ranked.append((-priority, len(ranked), candidate))
+    ranked.sort()
+    for _, _, candidate in ranked:
+        output_data = candidate.convert(
+            input_base, output_base, input_ratio, output_ratio, input_workon
+        )
+        if output_data is not None:
+            return output_data
+    raise ImproperUsageError(
+        'No conversion engine could convert from base {0} to base {1} with '
+        'ratio {2}:{3}'.format(
+            input_base, output_base, input_ratio, output_ratio
+        )
+    )
+
+
+def _lookup_priority(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Lookup tables can be used for small chunk spaces, and are fastest when
+    there is enough data for building a table to be worthwhile (or one is
+    already cached).
+    """
+    if lookup.chunk_space(input_base, input_ratio) is None:
+        return None
+    table = lookup.lookup_table(
+        input_base, output_base, input_ratio, output_ratio,
+        len(input_workon) // input_ratio
+    )
+    return -10 if table is None else 30
+
+
+def _convert_by_lookup(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Converts chunks by table lookup, building the table if needed. Returns
+    None if some values are outside the input base.
+    """
+    table = lookup.lookup_table(
+        input_base, output_base, input_ratio, output_ratio,
+        lookup.chunk_space(input_base, input_ratio)
+    )
+    try:
+        return lookup.convert_chunks(
+            table, input_base, input_ratio, input_workon
+        )
+    except IndexError:
+        # some values are outside the input base, so use arithmetic
+        return None
+
+
+def _radix_priority(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Divide-and-conquer works for any chunks, but is only faster than the
+    reference loop for chunks with large ratios.
+    """
+    if max(input_ratio, output_ratio) >= DIVIDE_AND_CONQUER_RATIO:
+        return 20
+    return -5
+
+
+def _reference_priority(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    The reference loop works for any chunks.
+    """
+    return 0
+
+
+def _convert_by_reference(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Converts chunks with the original digit-by-digit arithmetic.
+    """
+    input_length = len(input_workon)
+    # get the output length, based on the number of chunks
+    output_length = (input_length // input_ratio) * output_ratio
+    # create a new list for the output data
+    output_data = [0] * output_length
+    # encode the data - store each group of input_ratio symbols in a number
+    for i in range(0, input_length, input_ratio):
+        store = 0
+        for j in range(0, input_ratio):
+            # store value of symbol
+            symbol = input_workon[i + j]
+            # upscale it if neccessary, in a little-endian manner
+            symbol *= (input_base ** (input_ratio - j - 1))
+            # add to store
+            store += symbol
+        '''
+        now that store contains the value of a number of symbols, separate this
+        out to the output symbols
+        '''
+        for k in range(0, output_ratio):
+            # convert output array index
+            index = ((i // input_ratio) * output_ratio) + k
+            # re-interpret the number in terms of output base
+            symbol = store // (output_base ** (output_ratio - k - 1))
+            # store at the calculated position
+            output_data[index] = symbol
+            # decrement the store variable, having now encoded part of it
+            store -= (symbol * (output_base ** (output_ratio - k - 1)))
+    return output_data
+
+
+# the built-in engines
+register_engine('lookup', _convert_by_lookup, _lookup_priority)
+register_engine('radix', radix.convert_chunks, _radix_priority)
+register_engine('reference', _convert_by_reference, _reference_priority)
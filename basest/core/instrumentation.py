@@ -0,0 +1,215 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import sys
+import threading
+from collections import namedtuple
+from functools import wraps
+from inspect import getcallargs
+from timeit import default_timer
+
+
+# the hooks registered with add_hook(), called once for every measured call
+# this tuple is replaced (never modified) when hooks are added or removed, so
+# it is always safe to iterate over from any thread
+_hooks = ()
+_hooks_lock = threading.Lock()
+# per-thread state of the call being measured: whether there is one (used to
+# only measure the outermost instrumented call) and the input lengths
+# recorded for it by record_input()
+_state = threading.local()
+
+
+# A record of one measured encoding or decoding operation, as passed to each
+# registered hook:
+# - operation: name of the function or method called (e.g. 'encode_raw')
+# - codec: name of the Encoder subclass used, or None for basest.core calls
+# - symbols_in: number of symbols in the input data (after any ignored
+#   symbols are removed and strings are split up into symbols)
+# - symbols_out: number of symbols in the output data
+# - padding: number of padding symbols added (encoding) or removed (decoding)
+# - allocated_bytes: size in bytes of the output container that was created
+# - elapsed: wall-clock time taken by the operation, in seconds
+Event = namedtuple(
+    'Event',
+    [
+        'operation', 'codec', 'symbols_in', 'symbols_out', 'padding',
+        'allocated_bytes', 'elapsed',
+    ]
+)
+
+
+def add_hook(hook):
+    """
+    Register a callable to be called with an Event for every encoding or
+    decoding operation performed. Instrumentation is disabled (and costs
+    nothing) when no hooks are registered.
+    """
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook):
+    """
+    Unregister a callable previously registered with add_hook().
+    Raises ValueError if the hook was not registered.
+    """
+    global _hooks
+    with _hooks_lock:
+        if hook not in _hooks:
+            raise ValueError('Hook was not registered')
+        _hooks = tuple(h for h in _hooks if h != hook)
+
+
+def record_input(lengths):
+    """
+    Called by instrumented operations with a list of the number of input
+    symbols of each message they convert, once the input data has been
+    turned into a list (and any ignored symbols removed), so that inputs
+    which have no length (such as iterators) can be measured. Only the first
+    lengths recorded during a measured call are used, as nested operations
+    are given the same (or less) input. Does nothing when no call is being
+    measured.
+    """
+    if getattr(_state, 'active', False) and _state.lengths is None:
+        _state.lengths = lengths
+
+
+def _padding_length(operation, input_ratio, output_ratio, input_length,
+                    output_length):
+    """
+    Works out how many padding symbols were added or removed by an operation
+    from the lengths of its input and output.
+    """
+    # overlap of the input data with the input ratio needs padding to fill it
+    overlap = input_length % input_ratio
+    if operation.startswith('encode'):
+        return 0 if overlap == 0 else input_ratio - overlap
+    # the decoded length is short by however much padding was stripped off
+    return ((input_length // input_ratio) * output_ratio) - output_length
+
+
+def _describe_call(operation, callargs):
+    """
+    Returns the codec name and the input and output ratios of an instrumented
+    call, from the arguments it was called with.
+    """
+    codec = callargs.get('self')
+    if codec is None:
+        return None, callargs['input_ratio'], callargs['output_ratio']
+    # Encoder methods take their ratios from the class, swapped for decoding
+    elif operation.startswith('encode'):
+        return type(codec).__name__, codec.input_ratio, codec.output_ratio
+    else:
+        return type(codec).__name__, codec.output_ratio, codec.input_ratio
+
+
+def instrumented(operation):
+    """
+    Decorator for encoding and decoding functions which reports an Event to
+    all registered hooks each time the decorated function is called.
+    Calls made from within another instrumented call are not reported, so
+    each top-level call results in exactly one Event.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            # fast path - do nothing extra when instrumentation isn't used
+            if not _hooks or getattr(_state, 'active', False):
+                return function(*args, **kwargs)
+            _state.active = True
+            _state.lengths = None
+            try:
+                start = default_timer()
+                result = function(*args, **kwargs)
+                elapsed = default_timer() - start
+            finally:
+                _state.active = False
+            callargs = getcallargs(function, *args, **kwargs)
+            codec, input_ratio, output_ratio = _describe_call(
+                operation, callargs
+            )
+            # batch operations are measured as the sum of all their messages
+            if 'inputs' in callargs:
+                inputs, outputs = callargs['inputs'], result
+                allocated_bytes = sys.getsizeof(result)
+            else:
+                inputs, outputs = [callargs['input_data']], [result]
+                allocated_bytes = 0
+            allocated_bytes += sum(sys.getsizeof(o) for o in outputs)
+            lengths = _state.lengths
+            if lengths is None:
+                # the operation didn't record its input, so it must have one
+                lengths = [len(i) for i in inputs]
+            event = Event(
+                operation=operation,
+                codec=codec,
+                symbols_in=sum(lengths),
+                symbols_out=sum(len(o) for o in outputs),
+                padding=sum(
+                    _padding_length(
+                        operation, input_ratio, output_ratio, i, len(o)
+                    )
+                    for i, o in zip(lengths, outputs)
+                ),
+                allocated_bytes=allocated_bytes,
+                elapsed=elapsed
+            )
+            for hook in _hooks:
+                hook(event)
+            return result
+        return wrapper
+    return decorator
+
+
+class Counters(object):
+    """
+    A hook which accumulates running totals of the Events it receives, keyed
+    by (operation, codec). Register an instance of it with add_hook() to start
+    counting.
+    """
+    # the names of the Event fields which are summed
+    fields = ('symbols_in', 'symbols_out', 'padding', 'allocated_bytes')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals = {}
+
+    def __call__(self, event):
+        key = (event.operation, event.codec)
+        with self._lock:
+            totals = self._totals.setdefault(
+                key, dict.fromkeys(('calls', 'elapsed') + self.fields, 0)
+            )
+            totals['calls'] += 1
+            totals['elapsed'] += event.elapsed
+            for field in self.fields:
+                totals[field] += getattr(event, field)
+
+    def snapshot(self):
+        """
+        Returns a copy of the totals accumulated so far, as a dictionary
+        mapping (operation, codec) tuples to dictionaries of totals.
+        """
+        with self._lock:
+            return dict(
+                (key, dict(totals)) for key, totals in self._totals.items()
+            )
+
+    def reset(self):
+        """
+        Discards all totals accumulated so far.
+        """
+        with self._lock:
+            self._totals.clear()
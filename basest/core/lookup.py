@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from operator import add
+
+from .utils import single_characters
+
+
+# chunk lookup tables are only used when there are at most this many possible
+# chunks (input_base ** input_ratio), set to 0 to never use lookup tables
+LOOKUP_TABLE_MAX_SIZE = 1 << 16
+
+# cache of lookup tables, keyed by bases, ratios and output symbols (if any)
+_tables = {}
+
+
+def chunk_space(input_base, input_ratio):
+    """
+    Returns the number of different possible chunks of input_ratio symbols
+    of the input base, if that is small enough for a lookup table to be used,
+    otherwise returns None.
+    """
+    # avoid calculating huge powers just to find out that they are too big
+    if input_ratio * input_base.bit_length() > 64:
+        return None
+    size = input_base ** input_ratio
+    return size if size <= LOOKUP_TABLE_MAX_SIZE else None
+
+
+def can_look_up_symbols(
+    input_base, output_base, input_ratio, output_ratio, input_symbol_table
+):
+    """
+    Returns True if chunks of symbols from the given input symbol table could
+    be looked up straight to output symbols: no input symbol may be outside
+    the input base, and every chunk must fit in output_ratio output symbols.
+    """
+    return (
+        len(input_symbol_table) <= input_base and
+        chunk_space(input_base, input_ratio) is not None and
+        input_base ** input_ratio <= output_base ** output_ratio
+    )
+
+
+def _build_table(
+    input_base, output_base, input_ratio, output_ratio, output_symbol_table
+):
+    """
+    Returns a tuple mapping the value of every possible chunk of input_ratio
+    symbols of the input base to a tuple of its output_ratio output symbols
+    (or raw integers, if no output symbol table is given).
+    """
+    rows = []
+    for value in range(input_base ** input_ratio):
+        row = [0] * output_ratio
+        for i in range(output_ratio - 1, 0, -1):
+            value, row[i] = divmod(value, output_base)
+        # the first digit takes whatever is left, as in encode_raw()
+        row[0] = value
+        if output_symbol_table is not None:
+            row = [output_symbol_table[s] for s in row]
+        rows.append(tuple(row))
+    return tuple(rows)
+
+
+def _symbol_rows(table, output_symbol_table):
+    """
+    Returns a tuple of the rows of the given lookup table of raw integers with
+    each integer swapped for its output symbol, which is much quicker than
+    building the table of symbols from scratch.
+    """
+    symbol = output_symbol_table.__getitem__
+    return tuple(tuple(map(symbol, row)) for row in table)
+
+
+class FlatTable(object):
+    """
+    A lookup table stored as one flat sequence of integers (such as a
+    memoryview of a memory-mapped file) holding each column of the table in
+    turn, which can be used in place of the tuples of rows built by
+    lookup_table() without unpacking it.
+    """
+    def __init__(self, values, width):
+        self.width = width
+        self._rows = len(values) // width
+        self._columns = [
+            values[i * self._rows:(i + 1) * self._rows] for i in range(width)
+        ]
+        self._tuples = None
+
+    def __len__(self):
+        return self._rows
+
+    def __getitem__(self, index):
+        # tuples of rows also raise IndexError for values outside the table
+        if not 0 <= index < self._rows:
+            raise IndexError('lookup table index out of range')
+        return tuple(column[index] for column in self._columns)
+
+    def convert(self, indices):
+        """
+        Returns a list of the rows at each of the given indices joined
+        together. Once there are enough indices for it to be worthwhile, the
+        rows are unpacked into tuples (once) to look them up faster, until
+        then one column of every row is looked up at a time.
+        """
+        if indices and not (0 <= min(indices) and max(indices) < self._rows):
+            raise IndexError('lookup table index out of range')
+        if self._tuples is None and len(indices) >= self._rows:
+            self._tuples = tuple(zip(*self._columns))
+        if self._tuples is not None:
+            output_data = []
+            extend = output_data.extend
+            for index in indices:
+                extend(self._tuples[index])
+            return output_data
+        width = self.width
+        output_data = [None] * (len(indices) * width)
+        for i, column in enumerate(self._columns):
+            output_data[i::width] = map(column.__getitem__, indices)
+        return output_data
+
+
+def _table_key(
+    input_base, output_base, input_ratio, output_ratio,
+    output_symbol_table=None
+):
+    """
+    Returns the key that the lookup table for the given bases, ratios and
+    output symbol table (if any) is cached under.
+    """
+    return (
+        input_base, output_base, input_ratio, output_ratio,
+        None if output_symbol_table is None else tuple(output_symbol_table)
+    )
+
+
+def register_table(input_base, output_base, input_ratio, output_ratio, table):
+    """
+    Adds a lookup table of raw integers which was built elsewhere (such as one
+    loaded from a compiled codec file) to the cache, to be used from then on
+    by lookup_table(). The table must have the same rows _build_table() would
+    give.
+    """
+    _tables[
+        _table_key(input_base, output_base, input_ratio, output_ratio)
+    ] = table
+
+
+def lookup_table(
+    input_base, output_base, input_ratio, output_ratio, chunks,
+    output_symbol_table=None
+):
+    """
+    Returns the lookup table for converting chunks of input_ratio symbols of
+    the input base to output_ratio output symbols (or raw integers, if no
+    output symbol table is given), if there is one cached or if converting
+    the given number of chunks would take long enough for building one to be
+    worthwhile. Otherwise, returns None. Tables of output symbols are made
+    from the table of raw integers if that is cached (such as one loaded from
+    a compiled codec file), rather than built from scratch.
+    Tables are cached and shared between calls (and threads).
+    """
+    size = chunk_space(input_base, input_ratio)
+    if size is None:
+        return None
+    key = _table_key(
+        input_base, output_base, input_ratio, output_ratio,
+        output_symbol_table
+    )
+    table = _tables.get(key)
+    # building a table costs about as much as converting each chunk once
+    if table is None and chunks >= size:
+        raw_table = None
+        if output_symbol_table is not None:
+            raw_table = _tables.get(
+                _table_key(input_base, output_base, input_ratio, output_ratio)
+            )
+        if raw_table is None:
+            table = _build_table(
+                input_base, output_base, input_ratio, output_ratio,
+                output_symbol_table
+            )
+        else:
+            table = _symbol_rows(raw_table, output_symbol_table)
+        _tables[key] = table
+    return table
+
+
+def convert_chunks(table, input_base, input_ratio, input_workon):
+    """
+    Converts a list of input data whose length is an exact multiple of the
+    input ratio by looking up the output of each chunk in the given table
+    (as returned by lookup_table()), returning a new list of output data.
+    Raises IndexError if the input contains values outside the input base.
+    """
+    if isinstance(table, FlatTable):
+        if input_ratio == 1:
+            return table.convert(input_workon)
+        indices = []
+        append = indices.append
+        for i in range(0, len(input_workon), input_ratio):
+            store = 0
+            for s in input_workon[i:i + input_ratio]:
+                store = store * input_base + s
+            append(store)
+        return table.convert(indices)
+    output_data = []
+    extend = output_data.extend
+    if input_ratio == 1:
+        for s in input_workon:
+            extend(table[s])
+        return output_data
+    for i in range(0, len(input_workon), input_ratio):
+        store = 0
+        for s in input_workon[i:i + input_ratio]:
+            store = store * input_base + s
+        extend(table[store])
+    return output_data
+
+
+def symbol_group_tables(
+    input_base, input_symbol_table, input_padding, input_ratio, symbols
+):
+    """
+    Returns decoding tables for looking up groups of (up to) two input symbols
+    at a time, as a tuple of (start, stop, table) for each group in a chunk,
+    where start and stop are the group's offsets within the chunk and table
+    maps the string of the group's symbols to its contribution to the value
+    of the chunk. Padding symbols count as the maximum symbol, as they do in
+    decode_raw().
+    Returns None unless every symbol is a single character, there is one
+    symbol for every value of the input base and the tables would be small
+    enough, or if decoding the given number of symbols would not take long
+    enough for building them to be worthwhile.
+    Tables are cached and shared between calls (and threads).
+    """
+    size = (input_base + 1) ** 2
+    if size > LOOKUP_TABLE_MAX_SIZE:
+        return None
+    key = ('groups', input_base, input_padding, input_ratio) + tuple(
+        input_symbol_table
+    )
+    tables = _tables.get(key)
+    if tables is not None:
+        return tables
+    if (
+        # building the tables costs about as much as looking up each pair
+        symbols < size or
+        len(input_symbol_table) != input_base or
+        not single_characters(input_symbol_table + [input_padding])
+    ):
+        return None
+    singles = dict((s, i) for i, s in enumerate(input_symbol_table))
+    singles[input_padding] = input_base - 1
+    pairs = dict(
+        (a + b, (value_a * input_base) + value_b)
+        for a, value_a in singles.items() for b, value_b in singles.items()
+    )
+    groups = []
+    for start in range(0, input_ratio, 2):
+        stop = min(start + 2, input_ratio)
+        # scale each group's value by its place in the chunk in advance
+        weight = input_base ** (input_ratio - stop)
+        groups.append((
+            start, stop,
+            dict(
+                (k, v * weight)
+                for k, v in (pairs if stop - start == 2 else singles).items()
+            )
+        ))
+    tables = tuple(groups)
+    _tables[key] = tables
+    return tables
+
+
+def decode_symbol_groups(
+    tables, input_padding, output_base, output_symbol_table,
+    input_ratio, output_ratio, input_data
+):
+    """
+    Decodes a string of input symbols whose length is an exact multiple of
+    the input ratio using tables returned by symbol_group_tables(), returning
+    a list of output symbols with padding removed. Every chunk must fit in
+    output_ratio output symbols.
+    Raises KeyError if a symbol that is not in the tables is encountered, so
+    the input should be checked for invalid symbols first.
+    """
+    # look up the same group of symbols in every chunk at once, adding up the
+    # contributions of each group to the values of the chunks as we go
+    values = None
+    for start, stop, table in tables:
+        if stop - start == 2:
+            groups = map(
+                add,
+                input_data[start::input_ratio],
+                input_data[start + 1::input_ratio]
+            )
+        else:
+            groups = input_data[start::input_ratio]
+        column = map(table.__getitem__, groups)
+        values = column if values is None else map(add, values, column)
+    values = list(values)
+    # separate the values out into output symbols, one position at a time
+    output_data = [None] * (len(values) * output_ratio)
+    for i in range(output_ratio):
+        weight = output_base ** (output_ratio - 1 - i)
+        output_data[i::output_ratio] = [
+            output_symbol_table[v // weight % output_base] for v in values
+        ]
+    # strip off the unnecessary padding symbols if there was padding
+    padding_length = input_data.count(input_padding)
+    if padding_length:
+        del output_data[-padding_length:]
+    return output_data
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import multiprocessing
+
+from .decode import _check_input_length, _strip_padding, _unpad_input
+from .encode import _convert_chunks, _pad_input, _pad_output
+from .instrumentation import instrumented
+from .utils import (
+    ints_to_symbols, map_symbols_to_ints, symbol_map, validate_symbol_tables
+)
+
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # pragma: no cover
+    # Python 2 needs the 'futures' backport to use the default thread pool
+    ThreadPoolExecutor = None
+
+
+def _split_points(input_length, input_ratio, pieces):
+    """
+    Returns a list of (start, stop) index pairs which split data of the given
+    length into at most the given number of pieces, with every piece except
+    the last being a whole number of chunks of input_ratio symbols.
+    """
+    chunks = -(-input_length // input_ratio)
+    chunks_per_piece = max(1, -(-chunks // max(1, pieces)))
+    piece_length = chunks_per_piece * input_ratio
+    return [
+        (start, min(start + piece_length, input_length))
+        for start in range(0, input_length, piece_length)
+    ]
+
+
+def _encode_piece(
+    input_base, input_map, output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, input_data
+):
+    """
+    Encodes one piece of the input, in exactly the same way as encode().
+    """
+    input_workon = map_symbols_to_ints(input_data, input_map)
+    padding_length = _pad_input(
+        input_base, output_base, input_ratio, input_workon
+    )
+    output_data = _convert_chunks(
+        input_base, output_base, input_ratio, output_ratio, input_workon
+    )
+    _pad_output(output_base, output_data, padding_length)
+    return ints_to_symbols(output_data, output_symbol_table + [output_padding])
+
+
+def _decode_piece(
+    input_base, input_map, output_base, output_symbol_table,
+    input_ratio, output_ratio, input_data
+):
+    """
+    Decodes one piece of the input, in exactly the same way as decode().
+    """
+    input_workon = map_symbols_to_ints(input_data, input_map)
+    padding_length = _unpad_input(input_base, input_workon)
+    output_data = _convert_chunks(
+        input_base, output_base, input_ratio, output_ratio, input_workon
+    )
+    _strip_padding(output_data, padding_length)
+    return ints_to_symbols(output_data, output_symbol_table)
+
+
+def _run_pieces(function, args, input_data, input_ratio, workers, executor):
+    """
+    Calls function with the given arguments on every ratio-aligned piece of
+    the input data using the given executor (or a new thread pool with the
+    given number of workers) and returns the joined results in order.
+    """
+    if workers is None:
+        workers = multiprocessing.cpu_count()
+    points = _split_points(len(input_data), input_ratio, workers)
+    if executor is None:
+        if ThreadPoolExecutor is None:  # pragma: no cover
+            raise ImportError(
+                'concurrent.futures is required for parallel encoding'
+            )
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return _run_pieces(
+                function, args, input_data, input_ratio, workers, pool
+            )
+    futures = [
+        executor.submit(function, *(args + (input_data[start:stop],)))
+        for start, stop in points
+    ]
+    output_data = []
+    for future in futures:
+        output_data.extend(future.result())
+    return output_data
+
+
+@instrumented('encode_parallel')
+def encode_parallel(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, input_data, workers=None, executor=None
+):
+    """
+    Encodes the input data in exactly the same way as encode(), but splits it
+    into ratio-aligned pieces which are encoded concurrently by a pool of
+    threads (one per CPU by default), or by the given executor.
+    The input data must be a sequence which supports slicing.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        output_symbol_table,
+        output_padding,
+        input_symbol_table
+    )
+    return _run_pieces(
+        _encode_piece,
+        (
+            input_base, symbol_map(input_symbol_table),
+            output_base, output_symbol_table, output_padding,
+            input_ratio, output_ratio
+        ),
+        input_data, input_ratio, workers, executor
+    )
+
+
+@instrumented('decode_parallel')
+def decode_parallel(
+    input_base, input_symbol_table, input_padding,
+    output_base, output_symbol_table,
+    input_ratio, output_ratio, input_data, workers=None, executor=None
+):
+    """
+    Decodes the input data in exactly the same way as decode(), but splits it
+    into ratio-aligned pieces which are decoded concurrently by a pool of
+    threads (one per CPU by default), or by the given executor.
+    The input data must be a sequence which supports slicing.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        input_symbol_table,
+        input_padding,
+        output_symbol_table
+    )
+    _check_input_length(input_ratio, input_data)
+    return _run_pieces(
+        _decode_piece,
+        (
+            input_base, symbol_map(input_symbol_table + [input_padding]),
+            output_base, output_symbol_table, input_ratio, output_ratio
+        ),
+        input_data, input_ratio, workers, executor
+    )
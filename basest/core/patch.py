@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..exceptions import ImproperUsageError
+from .decode import _check_input_length, decode
+from .encode import encode
+from .utils import validate_symbol_tables
+
+
+def encode_patch(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, encoded_data, offset, input_data, apply=False
+):
+    """
+    Given the same arguments as encode(), the output of encoding some data
+    with them (as a sequence of symbols which supports slicing), an offset
+    into the original data and the input data to write over it from that
+    offset, return a tuple of (start, stop, output_data) such that replacing
+    encoded_data[start:stop] with output_data gives the encoded output of
+    the changed data.
+    Only the chunks which the change overlaps are re-encoded (and decoded
+    from the encoded data, to get the rest of their input symbols). If the
+    change runs past the end of the original data, the data is extended and
+    the padded last chunk is re-encoded too.
+    If apply is True, the change is also made to encoded_data in-place (so
+    it must be a mutable sequence, such as a list).
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        output_symbol_table,
+        output_padding,
+        input_symbol_table
+    )
+    _check_input_length(output_ratio, encoded_data)
+    input_data = list(input_data)
+    chunks = len(encoded_data) // output_ratio
+
+    def decode_chunks(start, stop):
+        return decode(
+            output_base, output_symbol_table, output_padding,
+            input_base, input_symbol_table, output_ratio, input_ratio,
+            encoded_data[start * output_ratio:stop * output_ratio]
+        )
+
+    # only the last chunk can be shortened by padding
+    length = 0
+    if chunks:
+        length = (chunks - 1) * input_ratio + len(
+            decode_chunks(chunks - 1, chunks)
+        )
+    if not 0 <= offset <= length:
+        raise ImproperUsageError(
+            'Patch offset must be within the original data (or at its end)'
+        )
+    end = offset + len(input_data)
+    first = offset // input_ratio
+    if end >= length:
+        # the last chunk has to be re-encoded with its padding
+        stop = chunks
+    else:
+        stop = -(-end // input_ratio)
+    # decode the affected chunks and write the change over them
+    input_workon = decode_chunks(first, stop)
+    start = offset - first * input_ratio
+    input_workon[start:start + len(input_data)] = input_data
+    output_data = encode(
+        input_base, input_symbol_table,
+        output_base, output_symbol_table, output_padding,
+        input_ratio, output_ratio, input_workon
+    )
+    patch = (first * output_ratio, stop * output_ratio, output_data)
+    if apply:
+        encoded_data[patch[0]:patch[1]] = output_data
+    return patch
@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import argparse
+import random
+import sys
+from collections import namedtuple
+from timeit import default_timer
+
+from . import engines, lookup
+from .decode import (
+    _check_input_length, _check_symbols, _strip_padding, _unpad_input
+)
+from .encode import (
+    _convert_chunks, _nearest_length, _pad_input, _pad_output, encode
+)
+from .tokenize import needs_tokenizing, tokenize
+from .utils import (
+    ints_to_symbols, single_characters, symbol_map, symbols_to_ints,
+    validate_symbol_tables
+)
+
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    # tracemalloc is not available in Python 2, so allocations aren't counted
+    tracemalloc = None
+
+
+# The time (in seconds) and memory (in bytes) used by one stage of an encoding
+# or decoding operation. allocated_bytes is None if it could not be measured.
+Stage = namedtuple('Stage', ['name', 'elapsed', 'allocated_bytes'])
+
+
+class _StageProfiler(object):
+    """
+    Runs the stages of an operation one at a time, recording either the time
+    taken or the memory allocated by each of them (never both, as tracing
+    memory allocations slows allocation-heavy stages down a great deal).
+    """
+    def __init__(self, trace_memory):
+        self.trace_memory = trace_memory
+        self.stages = []
+
+    def run(self, name, function, *args):
+        """
+        Calls function with the given arguments as the stage with the given
+        name and returns what the function returns.
+        """
+        if self.trace_memory:  # pragma: py3
+            memory_before = tracemalloc.get_traced_memory()[0]
+            result = function(*args)
+            self.stages.append(Stage(
+                name, None, tracemalloc.get_traced_memory()[0] - memory_before
+            ))
+        else:
+            start = default_timer()
+            result = function(*args)
+            self.stages.append(Stage(name, default_timer() - start, None))
+        return result
+
+
+def _profiled(operation):
+    """
+    Runs the given operation (a function taking a _StageProfiler) twice, if
+    possible: first with memory tracing enabled, to measure the memory
+    allocated by each stage, then without it, to time each stage. Returns
+    the list of Stages recorded, with stages of the same name combined.
+    As the timed run comes second, it finds any lookup tables already built,
+    as repeated calls would.
+    """
+    allocations = {}
+    if tracemalloc is not None:  # pragma: py3
+        traced = _StageProfiler(trace_memory=True)
+        tracing = not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        try:
+            operation(traced)
+        finally:
+            if tracing:
+                tracemalloc.stop()
+        allocations = dict(
+            (stage.name, stage.allocated_bytes)
+            for stage in _merge_stages(traced.stages)
+        )
+    timed = _StageProfiler(trace_memory=False)
+    operation(timed)
+    return [
+        stage._replace(allocated_bytes=allocations.get(stage.name))
+        for stage in _merge_stages(timed.stages)
+    ]
+
+
+def profile_encode(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, input_data
+):
+    """
+    Encodes the given data in exactly the same way as encode() (taking the
+    same path through it, including looking chunks up straight to output
+    symbols when it would), but returns a list of Stages describing the time
+    and memory spent in each stage of the encoding instead of the encoded
+    data.
+    """
+    def operation(profiler):
+        profiler.run(
+            'validate_symbol_tables', validate_symbol_tables,
+            output_symbol_table, output_padding, input_symbol_table
+        )
+        input_workon = profiler.run(
+            'symbols_to_ints', symbols_to_ints, input_data, input_symbol_table
+        )
+        table = engines.is_allowed('lookup') and lookup.can_look_up_symbols(
+            input_base, output_base, input_ratio, output_ratio,
+            input_symbol_table
+        ) and profiler.run(
+            'lookup table', lookup.lookup_table,
+            input_base, output_base, input_ratio, output_ratio,
+            _nearest_length(len(input_workon), input_ratio) // input_ratio,
+            output_symbol_table
+        )
+        if table:
+            padding_length = profiler.run(
+                'padding handling', _pad_input,
+                input_base, output_base, input_ratio, input_workon
+            )
+            output_data = profiler.run(
+                'symbol lookup', lookup.convert_chunks,
+                table, input_base, input_ratio, input_workon
+            )
+            profiler.run(
+                'padding handling', _pad_output,
+                output_padding, output_data, padding_length
+            )
+            return
+        input_workon = profiler.run('input copy', list, input_workon)
+        padding_length = profiler.run(
+            'padding handling', _pad_input,
+            input_base, output_base, input_ratio, input_workon
+        )
+        output_data = profiler.run(
+            'chunk conversion', _convert_chunks,
+            input_base, output_base, input_ratio, output_ratio, input_workon
+        )
+        profiler.run(
+            'padding handling', _pad_output,
+            output_base, output_data, padding_length
+        )
+        profiler.run(
+            'ints_to_symbols', ints_to_symbols,
+            output_data, output_symbol_table + [output_padding]
+        )
+    return _profiled(operation)
+
+
+def profile_decode(
+    input_base, input_symbol_table, input_padding,
+    output_base, output_symbol_table,
+    input_ratio, output_ratio, input_data
+):
+    """
+    Decodes the given data in exactly the same way as decode() (taking the
+    same path through it, including splitting strings up into symbols and
+    looking symbols up two at a time or chunks up straight to output symbols
+    when it would), but returns a list of Stages describing the time and
+    memory spent in each stage of the decoding instead of the decoded data.
+    """
+    input_table = input_symbol_table + [input_padding]
+
+    def operation(profiler):
+        profiler.run(
+            'validate_symbol_tables', validate_symbol_tables,
+            input_symbol_table, input_padding, output_symbol_table
+        )
+        is_string = isinstance(input_data, type(''))
+        if is_string and single_characters(input_table):
+            profiler.run(
+                'invalid symbol scan', _check_symbols, input_data, input_table
+            )
+        tables = (
+            engines.is_allowed('lookup') and is_string and
+            len(input_data) % input_ratio == 0 and
+            len(output_symbol_table) == output_base and
+            input_base ** input_ratio <= output_base ** output_ratio and
+            profiler.run(
+                'lookup table', lookup.symbol_group_tables,
+                input_base, input_symbol_table, input_padding, input_ratio,
+                len(input_data)
+            )
+        )
+        if tables:
+            profiler.run(
+                'symbol lookup', lookup.decode_symbol_groups,
+                tables, input_padding, output_base, output_symbol_table,
+                input_ratio, output_ratio, input_data
+            )
+            return
+        if is_string and needs_tokenizing(input_table):
+            input_workon = profiler.run(
+                'tokenize', tokenize, input_data, symbol_map(input_table)
+            )
+        else:
+            input_workon = profiler.run(
+                'symbols_to_ints', symbols_to_ints, input_data, input_table
+            )
+        table = engines.is_allowed('lookup') and lookup.can_look_up_symbols(
+            input_base, output_base, input_ratio, output_ratio,
+            input_symbol_table
+        ) and profiler.run(
+            'lookup table', lookup.lookup_table,
+            input_base, output_base, input_ratio, output_ratio,
+            len(input_workon) // input_ratio, output_symbol_table
+        )
+        profiler.run(
+            'padding handling', _check_input_length, input_ratio, input_workon
+        )
+        if table:
+            padding_length = profiler.run(
+                'padding handling', _unpad_input, input_base, input_workon
+            )
+            output_data = profiler.run(
+                'symbol lookup', lookup.convert_chunks,
+                table, input_base, input_ratio, input_workon
+            )
+            profiler.run(
+                'padding handling', _strip_padding,
+                output_data, padding_length
+            )
+            return
+        input_workon = profiler.run('input copy', list, input_workon)
+        padding_length = profiler.run(
+            'padding handling', _unpad_input, input_base, input_workon
+        )
+        output_data = profiler.run(
+            'chunk conversion', _convert_chunks,
+            input_base, output_base, input_ratio, output_ratio, input_workon
+        )
+        profiler.run(
+            'padding handling', _strip_padding, output_data, padding_length
+        )
+        profiler.run(
+            'ints_to_symbols', ints_to_symbols,
+            output_data, output_symbol_table
+        )
+    return _profiled(operation)
+
+
+def _merge_stages(stages):
+    """
+    Combines stages with the same name into one, preserving the order in
+    which each stage name was first seen.
+    """
+    merged = []
+    for stage in stages:
+        for i, seen in enumerate(merged):
+            if seen.name == stage.name:
+                merged[i] = Stage(
+                    seen.name,
+                    (
+                        None if seen.elapsed is None
+                        else seen.elapsed + stage.elapsed
+                    ),
+                    (
+                        None if seen.allocated_bytes is None
+                        else seen.allocated_bytes + stage.allocated_bytes
+                    )
+                )
+                break
+        else:
+            merged.append(stage)
+    return merged
+
+
+def _default_symbol_table(base):
+    """
+    Returns a symbol table of the given size, made of the decimal string
+    representation of each integer in the base.
+    """
+    return ['{}'.format(i) for i in range(base)]
+
+
+def format_stages(stages):
+    """
+    Returns a human-readable table of the given list of Stages, showing the
+    time, share of the total time and memory allocated for each stage.
+    """
+    total = sum(stage.elapsed for stage in stages) or 1.0
+    lines = [
+        '{:<24} {:>12} {:>8} {:>14}'.format(
+            'stage', 'time (ms)', 'share', 'allocated (B)'
+        )
+    ]
+    for stage in stages:
+        lines.append(
+            '{:<24} {:>12.3f} {:>7.1f}% {:>14}'.format(
+                stage.name, stage.elapsed * 1000, stage.elapsed * 100 / total,
+                '-' if stage.allocated_bytes is None else stage.allocated_bytes
+            )
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """
+    Command-line entry point which profiles encoding (or decoding) random data
+    of a given size with a given codec configuration and prints the results.
+    """
+    parser = argparse.ArgumentParser(
+        description=(
+            'Profile each stage of encoding or decoding random data with the '
+            'given bases and ratios.'
+        )
+    )
+    parser.add_argument('input_base', type=int)
+    parser.add_argument('output_base', type=int)
+    parser.add_argument('input_ratio', type=int)
+    parser.add_argument('output_ratio', type=int)
+    parser.add_argument(
+        '--size', type=int, default=65536,
+        help='number of input symbols to encode (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--input-alphabet',
+        help='string of single-character input symbols to use'
+    )
+    parser.add_argument(
+        '--output-alphabet',
+        help='string of single-character output symbols to use'
+    )
+    parser.add_argument(
+        '--padding', default='=',
+        help='padding symbol to use (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--decode', action='store_true',
+        help='profile decoding the encoded data instead of encoding it'
+    )
+    args = parser.parse_args(argv)
+
+    input_symbol_table = (
+        list(args.input_alphabet) if args.input_alphabet
+        else _default_symbol_table(args.input_base)
+    )
+    output_symbol_table = (
+        list(args.output_alphabet) if args.output_alphabet
+        else _default_symbol_table(args.output_base)
+    )
+    input_data = [
+        random.choice(input_symbol_table) for _ in range(args.size)
+    ]
+    if args.decode:
+        encoded_data = encode(
+            args.input_base, input_symbol_table,
+            args.output_base, output_symbol_table, args.padding,
+            args.input_ratio, args.output_ratio, input_data
+        )
+        stages = profile_decode(
+            args.output_base, output_symbol_table, args.padding,
+            args.input_base, input_symbol_table,
+            args.output_ratio, args.input_ratio, encoded_data
+        )
+    else:
+        stages = profile_encode(
+            args.input_base, input_symbol_table,
+            args.output_base, output_symbol_table, args.padding,
+            args.input_ratio, args.output_ratio, input_data
+        )
+    print(format_stages(stages))
+    return 0
+
+
+if __name__ == '__main__':  # pragma: no cover
+    sys.exit(main())
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+
+# numbers of digits at or below which the simple digit-by-digit loop is used
+_BASE_CASE_LENGTH = 16
+
+# cache of power tables for each base, where the table for base b is the tuple
+# (b ** 1, b ** 2, b ** 4, b ** 8, ...), replaced by a longer one as needed
+_power_tables = {}
+
+
+def power_table(base, length):
+    """
+    Returns a tuple of the powers base ** (2 ** k) of the given base, for each
+    k such that 2 ** k is less than the given number of digits.
+    Tables are cached and shared between calls (and threads).
+    """
+    table = _power_tables.get(base, (base,))
+    if (1 << (len(table) - 1)) < length:
+        # build a new (longer) table rather than extending the shared one, so
+        # that tables already handed out to other threads never change
+        powers = list(table)
+        while (1 << (len(powers) - 1)) < length:
+            powers.append(powers[-1] * powers[-1])
+        table = tuple(powers)
+        _power_tables[base] = table
+    return table
+
+
+def _split_point(length):
+    """
+    Returns the index k of the largest power of two 2 ** k which is strictly
+    less than the given length.
+    """
+    return (length - 1).bit_length() - 1
+
+
+def digits_to_int(digits, base, start, stop, powers):
+    """
+    Returns the integer value of the digits in the given base found between
+    the start and stop indices of the given sequence of digits (big-endian).
+    Larger numbers are combined from recursively-converted halves using the
+    given power table, which must be long enough for stop - start digits.
+    """
+    length = stop - start
+    if length <= _BASE_CASE_LENGTH:
+        value = 0
+        for i in range(start, stop):
+            value = value * base + digits[i]
+        return value
+    # the low part is the largest power-of-two number of digits that fits
+    k = _split_point(length)
+    middle = stop - (1 << k)
+    return (
+        digits_to_int(digits, base, start, middle, powers) * powers[k] +
+        digits_to_int(digits, base, middle, stop, powers)
+    )
+
+
+def int_to_digits(value, base, output, start, stop, powers):
+    """
+    Writes the given integer value into the given list as digits of the given
+    base (big-endian), filling the indices from start to stop. The value is
+    recursively split into halves using the given power table, which must be
+    long enough for stop - start digits.
+    """
+    length = stop - start
+    if length <= _BASE_CASE_LENGTH:
+        for i in range(stop - 1, start, -1):
+            value, output[i] = divmod(value, base)
+        # the first digit takes whatever is left, in case the value overflows
+        output[start] = value
+        return
+    # the low part is the largest power-of-two number of digits that fits
+    k = _split_point(length)
+    middle = stop - (1 << k)
+    high, low = divmod(value, powers[k])
+    int_to_digits(high, base, output, start, middle, powers)
+    int_to_digits(low, base, output, middle, stop, powers)
+
+
+def convert_chunks(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Converts a list of input data whose length is an exact multiple of the
+    input ratio from the input base to the output base, one chunk at a time,
+    returning a new list of output data. Each chunk is combined and split by
+    divide-and-conquer, which is much faster than the digit-by-digit method
+    for chunks with very large ratios.
+    """
+    input_powers = power_table(input_base, input_ratio)
+    output_powers = power_table(output_base, output_ratio)
+    chunks = len(input_workon) // input_ratio
+    output_data = [0] * (chunks * output_ratio)
+    for chunk in range(chunks):
+        store = digits_to_int(
+            input_workon, input_base,
+            chunk * input_ratio, (chunk + 1) * input_ratio, input_powers
+        )
+        int_to_digits(
+            store, output_base, output_data,
+            chunk * output_ratio, (chunk + 1) * output_ratio, output_powers
+        )
+    return output_data
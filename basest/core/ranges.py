@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import mmap
+import threading
+from collections import OrderedDict
+
+from ..exceptions import ImproperUsageError
+from .decode import _check_input_length, decode
+from .tokenize import needs_tokenizing
+from .utf8 import decode_utf8
+from .utils import validate_symbol_tables
+
+
+class DecodedView(object):
+    """
+    A lazy, read-only sequence of the symbols that the given input data
+    decodes to (as decode() would decode it), which only decodes the chunks
+    needed to index or slice it. The input data can be any sequence of
+    symbols which supports slicing, or UTF-8 bytes (including mmap objects)
+    if every symbol is the same length in UTF-8. Padding is only expected at
+    the end of the input data.
+
+    Chunks are decoded chunks_per_block at a time, and the last cache_size
+    blocks decoded are kept in case they are needed again. Views can be
+    shared between threads.
+    """
+    def __init__(
+        self, input_base, input_symbol_table, input_padding,
+        output_base, output_symbol_table, input_ratio, output_ratio,
+        input_data, chunks_per_block=64, cache_size=16
+    ):
+        # validate both symbol tables and the padding symbol before continuing
+        validate_symbol_tables(
+            input_symbol_table,
+            input_padding,
+            output_symbol_table
+        )
+        # NOTE: input symbol table here includes the padding character
+        symbol_table = input_symbol_table + [input_padding]
+        if isinstance(input_data, (bytes, bytearray, mmap.mmap)):
+            lengths = set(len(s.encode('utf-8')) for s in symbol_table)
+            if len(lengths) != 1:
+                raise ImproperUsageError(
+                    'Random access to UTF-8 data requires every symbol to '
+                    'be the same length in UTF-8'
+                )
+            self._decode = decode_utf8
+            self._width = lengths.pop()
+        elif (
+            isinstance(input_data, type('')) and
+            needs_tokenizing(symbol_table)
+        ):
+            raise ImproperUsageError(
+                'Random access to strings requires single-character symbols'
+            )
+        else:
+            self._decode = decode
+            self._width = 1
+        self._arguments = (
+            input_base, input_symbol_table, input_padding,
+            output_base, output_symbol_table, input_ratio, output_ratio
+        )
+        self._input_data = input_data
+        self._chunks_per_block = chunks_per_block
+        self._cache_size = cache_size
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        _check_input_length(input_ratio * self._width, input_data)
+        self._chunks = len(input_data) // (input_ratio * self._width)
+        # only the last chunk can be shortened by padding
+        self._length = 0
+        if self._chunks:
+            self._length = (self._chunks - 1) * output_ratio + len(
+                self._decode_chunks(self._chunks - 1, self._chunks)
+            )
+
+    def _decode_chunks(self, start, stop):
+        """
+        Returns the decoded output of the chunks from start to stop.
+        """
+        input_ratio = self._arguments[5] * self._width
+        return self._decode(*self._arguments + (
+            self._input_data[start * input_ratio:stop * input_ratio],
+        ))
+
+    def _block(self, index):
+        """
+        Returns the decoded output of the block of chunks at the given index,
+        from the cache if it is there.
+        """
+        with self._lock:
+            output_data = self._cache.pop(index, None)
+            if output_data is None:
+                start = index * self._chunks_per_block
+                output_data = self._decode_chunks(
+                    start, min(start + self._chunks_per_block, self._chunks)
+                )
+            # (re-)insert the block as the most recently used
+            self._cache[index] = output_data
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+            return output_data
+
+    def _range(self, start, stop):
+        """
+        Returns a list of the decoded symbols from start to stop, which must
+        be within the view.
+        """
+        block_length = self._chunks_per_block * self._arguments[6]
+        first = start // block_length
+        output_data = []
+        for index in range(first, (stop - 1) // block_length + 1):
+            output_data.extend(self._block(index))
+        offset = first * block_length
+        return output_data[start - offset:stop - offset]
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            indices = range(start, stop, step)
+            if not indices:
+                return []
+            first = min(indices)
+            return self._range(first, max(indices) + 1)[start - first::step]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('decoded view index out of range')
+        return self._range(index, index + 1)[0]
+
+
+def decode_range(
+    input_base, input_symbol_table, input_padding,
+    output_base, output_symbol_table, input_ratio, output_ratio,
+    input_data, start, stop
+):
+    """
+    Given the same arguments as decode() and a range of the decoded output
+    (start and stop work like slice indices), decode only the chunks of the
+    input data which cover that range and return the decoded symbols in it.
+    The input data may be any sequence of symbols which supports slicing, or
+    UTF-8 bytes (including mmap objects) if every symbol is the same length
+    in UTF-8.
+    """
+    view = DecodedView(
+        input_base, input_symbol_table, input_padding,
+        output_base, output_symbol_table, input_ratio, output_ratio,
+        input_data, cache_size=0
+    )
+    start, stop, _ = slice(start, stop).indices(len(view))
+    if start >= stop:
+        return []
+    # decode all the chunks covering the range at once
+    first = start // output_ratio
+    output_data = view._decode_chunks(first, -(-stop // output_ratio))
+    offset = first * output_ratio
+    return output_data[start - offset:stop - offset]
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..exceptions import InvalidInputError, InvalidSymbolTableError
+
+
+'''
+Shortcut symbols (like the 'z' of ascii85, standing for a chunk of four zero
+bytes) are given as a dictionary mapping a tuple of input_ratio input symbols
+to the single output symbol that a whole chunk of them is encoded as, instead
+of output_ratio output symbols. The last chunk of the input is never encoded
+as a shortcut if it has to be padded.
+
+Both encoding and decoding work by taking the shortcuts out of the data and
+converting what is left over in one go as normal, then putting the shortcuts
+back in. The places they go are recorded in a plan, which is a list of
+(chunks, replacement) pairs: that many normal chunks of converted data,
+followed by the replacement for the shortcut (or None, at the end).
+'''
+
+
+def validate_shortcuts(
+    shortcuts, input_ratio, input_symbol_table,
+    output_symbol_table, output_padding
+):
+    """
+    Validates the given shortcut symbols for encoding from the given input
+    symbol table to the given output symbol table and padding symbol.
+    Raises InvalidSymbolTableError if any of the chunks are the wrong length
+    or contain symbols not in the input symbol table, or if the shortcut
+    symbols are not unique or could be confused with output symbols.
+    """
+    input_symbols = set(input_symbol_table)
+    for chunk in shortcuts:
+        if (
+            len(chunk) != input_ratio or
+            any(s not in input_symbols for s in chunk)
+        ):
+            raise InvalidSymbolTableError(
+                'Shortcuts must be for chunks of input_ratio input symbols'
+            )
+    symbols = list(shortcuts.values())
+    if (
+        None in symbols or len(symbols) != len(set(symbols)) or
+        set(symbols) & set(output_symbol_table + [output_padding])
+    ):
+        raise InvalidSymbolTableError(
+            'Shortcut symbols must be unique and not be output symbols'
+        )
+
+
+def remove_shortcut_chunks(input_data, input_ratio, shortcuts):
+    """
+    Returns a tuple of (plan, input_workon) where input_workon is a list of
+    the given input data with every whole chunk found in the given shortcuts
+    taken out, and plan records where the shortcut symbols go in the output.
+    """
+    input_workon = []
+    plan = []
+    chunks = 0
+    whole_length = len(input_data) - len(input_data) % input_ratio
+    for i in range(0, whole_length, input_ratio):
+        chunk = input_data[i:i + input_ratio]
+        symbol = shortcuts.get(tuple(chunk))
+        if symbol is None:
+            input_workon.extend(chunk)
+            chunks += 1
+        else:
+            plan.append((chunks, [symbol]))
+            chunks = 0
+    input_workon.extend(input_data[whole_length:])
+    plan.append((chunks, None))
+    return plan, input_workon
+
+
+def remove_shortcut_symbols(input_data, input_ratio, shortcuts):
+    """
+    Returns a tuple of (plan, input_workon) where input_workon is the given
+    input data (of the same type, if a string) with every shortcut symbol
+    taken out, and plan records where the chunks they stand for go in the
+    output.
+    Raises InvalidInputError if a shortcut symbol is found in the middle of
+    a chunk.
+    """
+    expansions = dict((v, list(k)) for k, v in shortcuts.items())
+    positions = [i for i, s in enumerate(input_data) if s in expansions]
+    pieces = []
+    plan = []
+    start = 0
+    for position in positions:
+        length = position - start
+        if length % input_ratio:
+            raise InvalidInputError(
+                'Encountered shortcut symbol in the middle of a chunk at '
+                'offset {0}'.format(position)
+            )
+        pieces.append(input_data[start:position])
+        plan.append((length // input_ratio, expansions[input_data[position]]))
+        start = position + 1
+    pieces.append(input_data[start:])
+    plan.append((-(-len(pieces[-1]) // input_ratio), None))
+    if isinstance(input_data, type('')):
+        return plan, ''.join(pieces)
+    return plan, [s for piece in pieces for s in piece]
+
+
+def insert_shortcuts(plan, output_ratio, output_data):
+    """
+    Returns a new list of the given converted output data with the
+    replacements for shortcuts put back in according to the given plan.
+    """
+    output_workon = []
+    start = 0
+    for chunks, replacement in plan:
+        stop = start + chunks * output_ratio
+        output_workon.extend(output_data[start:stop])
+        start = stop
+        if replacement is not None:
+            output_workon.extend(replacement)
+    # the last chunk may have had its padding stripped off
+    output_workon.extend(output_data[start:])
+    return output_workon
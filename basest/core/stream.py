@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..exceptions import ImproperUsageError
+from .decode import _check_input_length, _strip_padding, _unpad_input
+from .digest import check_digest_base, update_digest
+from .encode import _convert_chunks, _pad_input, _pad_output
+
+
+class IncrementalEncoder(object):
+    """
+    Encodes raw data (as iterables of integers) which arrives a piece at a
+    time, in the same way that encode_raw() would encode all of it at once.
+    Any input left over which doesn't make up a whole chunk is kept until
+    more input arrives, or until the final piece is encoded.
+    If a digest (see basest.core.digest) is given, each piece of input is
+    added to it as it arrives, in which case the input base must be 256.
+    """
+    def __init__(
+        self, input_base, output_base, input_ratio, output_ratio, digest=None
+    ):
+        if digest is not None:
+            check_digest_base(input_base)
+        self.input_base = input_base
+        self.output_base = output_base
+        self.input_ratio = input_ratio
+        self.output_ratio = output_ratio
+        self.digest = digest
+        self.reset()
+
+    def reset(self):
+        """
+        Discards any input left over from previous calls to encode(). The
+        digest (if any) is not reset.
+        """
+        self._pending = []
+
+    def encode(self, input_data, final=False):
+        """
+        Encodes as much of the given input (and any left over from previous
+        calls) as possible and returns the output as a list of integers.
+        If final is True, the input is taken to be the last piece, so any
+        remaining input is padded and encoded.
+        """
+        if self.digest is not None:
+            input_data = update_digest(self.digest, input_data)
+        self._pending.extend(input_data)
+        length = len(self._pending)
+        if not final:
+            # only whole chunks can be encoded until the end of the input
+            length -= length % self.input_ratio
+        input_workon = self._pending[:length]
+        del self._pending[:length]
+        padding_length = _pad_input(
+            self.input_base, self.output_base, self.input_ratio, input_workon
+        )
+        output_data = _convert_chunks(
+            self.input_base, self.output_base,
+            self.input_ratio, self.output_ratio, input_workon
+        )
+        _pad_output(self.output_base, output_data, padding_length)
+        return output_data
+
+
+class IncrementalDecoder(object):
+    """
+    Decodes raw data (as iterables of integers) which arrives a piece at a
+    time, in the same way that decode_raw() would decode all of it at once.
+    Any input left over which doesn't make up a whole chunk is kept until
+    more input arrives.
+    If a digest (see basest.core.digest) is given, each piece of output is
+    added to it as it is decoded, in which case the output base must be 256.
+    """
+    def __init__(
+        self, input_base, output_base, input_ratio, output_ratio, digest=None
+    ):
+        if digest is not None:
+            check_digest_base(output_base)
+        self.input_base = input_base
+        self.output_base = output_base
+        self.input_ratio = input_ratio
+        self.output_ratio = output_ratio
+        self.digest = digest
+        self.reset()
+
+    def reset(self):
+        """
+        Discards any input left over from previous calls to decode(). The
+        digest (if any) is not reset.
+        """
+        self._pending = []
+
+    def decode(self, input_data, final=False):
+        """
+        Decodes as much of the given input (and any left over from previous
+        calls) as possible and returns the output as a list of integers.
+        If final is True, the input is taken to be the last piece, so
+        InvalidInputLengthError is raised if it doesn't end on a whole chunk.
+        """
+        self._pending.extend(input_data)
+        if final:
+            _check_input_length(self.input_ratio, self._pending)
+        length = len(self._pending)
+        length -= length % self.input_ratio
+        input_workon = self._pending[:length]
+        del self._pending[:length]
+        padding_length = _unpad_input(self.input_base, input_workon)
+        output_data = _convert_chunks(
+            self.input_base, self.output_base,
+            self.input_ratio, self.output_ratio, input_workon
+        )
+        _strip_padding(output_data, padding_length)
+        if self.digest is not None:
+            update_digest(self.digest, output_data)
+        return output_data
+
+
+class LineWrapper(object):
+    """
+    Splits encoded output which arrives a piece at a time into lines of
+    line_length symbols, by inserting the line separator between lines (but
+    not after the last one). The output is sliced a line at a time, so there
+    is no need to join it all together and split it up again afterwards.
+    Raises ImproperUsageError if line_length is less than 1.
+    """
+    def __init__(self, line_length, line_separator='\n'):
+        if line_length < 1:
+            raise ImproperUsageError('Lines must be at least 1 symbol long')
+        self.line_length = line_length
+        self.line_separator = line_separator
+        self.reset()
+
+    def reset(self):
+        """
+        Starts a new line, forgetting about any output wrapped so far.
+        """
+        self._column = 0
+
+    def wrap(self, output_data):
+        """
+        Returns a list of the given symbols (continuing from the end of the
+        ones given in previous calls) with line separators inserted.
+        """
+        wrapped_data = []
+        start = 0
+        while start < len(output_data):
+            if self._column == self.line_length:
+                wrapped_data.append(self.line_separator)
+                self._column = 0
+            stop = start + self.line_length - self._column
+            line = output_data[start:stop]
+            wrapped_data.extend(line)
+            self._column += len(line)
+            start = stop
+        return wrapped_data
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..exceptions import InvalidInputError
+
+
+def needs_tokenizing(symbol_table):
+    """
+    Returns True if the given symbol table contains strings which are not
+    exactly one character long, meaning that strings of its symbols can't
+    simply be iterated over one character at a time.
+    """
+    return any(
+        isinstance(s, type('')) and len(s) != 1 for s in symbol_table
+    )
+
+
+def tokenize(input_data, symbol_map):
+    """
+    Given a string (or bytes) made up of the symbols in the given dictionary
+    made by symbol_map(), split it into symbols in a single pass and return a
+    list of the value each symbol maps to. The longest symbol which matches
+    at each point is used.
+    Raises InvalidInputError giving the offset of the first part of the input
+    which doesn't match any symbol.
+    """
+    # the lengths of all the symbols, longest first
+    lengths = sorted(set(len(s) for s in symbol_map if s), reverse=True)
+    output_data = []
+    append = output_data.append
+    i = 0
+    while i < len(input_data):
+        for length in lengths:
+            symbol = input_data[i:i + length]
+            if symbol in symbol_map:
+                break
+        else:
+            raise InvalidInputError(
+                'Encountered symbol not found in symbol table at offset '
+                '{0}'.format(i)
+            )
+        append(symbol_map[symbol])
+        i += length
+    return output_data
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..exceptions import InvalidInputError, InvalidSymbolTableError
+from .decode import decode_raw
+from .encode import encode
+from .stream import LineWrapper
+from .tokenize import tokenize
+from .utils import (
+    delete_symbols, ints_to_symbols, symbol_map, validate_ignored_symbols,
+    validate_symbol_tables
+)
+
+
+def _utf8_symbols(symbol_table):
+    """
+    Given a list of symbols, return a list of the UTF-8 encoding of each one.
+    """
+    return [s.encode('utf-8') for s in symbol_table]
+
+
+def encode_utf8(
+    input_base, input_symbol_table,
+    output_base, output_symbol_table, output_padding,
+    input_ratio, output_ratio, input_data, output=None,
+    line_length=None, line_separator='\n'
+):
+    """
+    Given the same arguments as encode(), return a bytearray of the encoded
+    data as UTF-8, or write it to the given binary file object instead if
+    there is one.
+    The UTF-8 encoding of each output symbol is worked out once, so the
+    output is joined straight into bytes without making a string first.
+    If line_length is given, the output is split into lines of that many
+    symbols, separated by the line separator.
+    """
+    # encoding a symbol as UTF-8 keeps it unique, so the tables stay valid
+    output_data = encode(
+        input_base, input_symbol_table,
+        output_base, _utf8_symbols(output_symbol_table),
+        output_padding.encode('utf-8'),
+        input_ratio, output_ratio, input_data
+    )
+    if line_length:
+        output_data = LineWrapper(
+            line_length, line_separator.encode('utf-8')
+        ).wrap(output_data)
+    if output is None:
+        return bytearray().join(output_data)
+    output.write(b''.join(output_data))
+
+
+def _split_utf8(input_data, input_map):
+    """
+    Given UTF-8 bytes and a dictionary mapping the UTF-8 encoding of each
+    symbol to its index, return a list of the index of each symbol in turn,
+    matching the longest symbol possible at each point.
+    Raises InvalidInputError if bytes which are not the start of any symbol
+    are encountered.
+    """
+    lengths = sorted(set(len(s) for s in input_map), reverse=True)
+    # when all the symbols are the same length, they can be sliced out
+    if len(lengths) == 1:
+        length = lengths[0]
+        try:
+            return [
+                input_map[input_data[i:i + length]]
+                for i in range(0, len(input_data), length)
+            ]
+        except KeyError:
+            raise InvalidInputError(
+                'Encountered symbol not found in symbol table'
+            )
+    return tokenize(input_data, input_map)
+
+
+def decode_utf8(
+    input_base, input_symbol_table, input_padding,
+    output_base, output_symbol_table,
+    input_ratio, output_ratio, input_data, ignore=None
+):
+    """
+    Given the same arguments as decode(), but with the input data as UTF-8
+    bytes, return a list of the decoded output symbols.
+    The bytes are split into symbols by looking up the UTF-8 encoding of each
+    input symbol, without decoding them to a string first.
+    If ignore is given, any of the characters in it (which must be ASCII) are
+    removed from the input data before decoding.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        input_symbol_table,
+        input_padding,
+        output_symbol_table
+    )
+    input_data = bytes(input_data)
+    if ignore:
+        validate_ignored_symbols(ignore, input_symbol_table + [input_padding])
+        ignore = _utf8_symbols(ignore)
+        # other characters' bytes are also part of longer UTF-8 sequences
+        if any(len(c) != 1 for c in ignore):
+            raise InvalidSymbolTableError(
+                'Ignored characters must be ASCII when decoding UTF-8'
+            )
+        input_data = delete_symbols(input_data, ignore)
+    # NOTE: input symbol table here includes the padding character
+    input_workon = _split_utf8(
+        input_data,
+        symbol_map(_utf8_symbols(input_symbol_table + [input_padding]))
+    )
+    output_data = decode_raw(
+        input_base=input_base, output_base=output_base,
+        input_ratio=input_ratio, output_ratio=output_ratio,
+        input_data=input_workon
+    )
+    return ints_to_symbols(output_data, output_symbol_table)
@@ -40,6 +40,86 @@ def symbols_to_ints(symbols, symbol_table):
         raise InvalidInputError('Encountered symbol not found in symbol table')
 
 
+def symbol_map(symbol_table):
+    """
+    Given a list of symbols, return a dictionary mapping each symbol to its
+    index in the list, for converting many symbols to ints quickly.
+    """
+    return dict((s, i) for i, s in enumerate(symbol_table))
+
+
+def map_symbols_to_ints(symbols, symbol_map):
+    """
+    Given an iterable of symbols and a dictionary made by symbol_map(),
+    convert them to an iterable of ints and return this.
+
+    Raises InvalidInputError if a symbol that is not in the symbol map is
+    encountered.
+    """
+    try:
+        return [symbol_map[s] for s in symbols]
+    except KeyError:
+        raise InvalidInputError('Encountered symbol not found in symbol table')
+
+
+def single_characters(symbol_table):
+    """
+    Returns True if every symbol in the given symbol table is a string of
+    exactly one character, otherwise returns False.
+    """
+    return all(isinstance(s, type('')) and len(s) == 1 for s in symbol_table)
+
+
+def find_invalid_symbol(input_data, symbol_table):
+    """
+    Given a string and a symbol table of single characters, return the offset
+    of the first character in the string which is not in the symbol table, or
+    None if they all are.
+    Deleting all the valid symbols with str.translate() leaves only the
+    invalid ones, so the whole string is checked in one pass in C.
+    """
+    invalid = input_data.translate(dict.fromkeys(ord(s) for s in symbol_table))
+    return input_data.index(invalid[0]) if invalid else None
+
+
+def delete_symbols(input_data, symbols):
+    """
+    Given input data and an iterable of symbols to ignore, return the input
+    data with all of those symbols removed. Strings (and bytes) are filtered
+    in one pass with translate(), in which case the symbols to ignore must be
+    single characters (or single bytes).
+    Raises InvalidSymbolTableError if they aren't.
+    """
+    if isinstance(input_data, (type(''), bytes)):
+        symbols = list(symbols)
+        if not all(
+            isinstance(s, type(input_data)) and len(s) == 1 for s in symbols
+        ):
+            raise InvalidSymbolTableError(
+                'Ignored symbols must be single characters when the input '
+                'data is a string'
+            )
+    if isinstance(input_data, type('')):
+        return input_data.translate(dict.fromkeys(ord(s) for s in symbols))
+    elif isinstance(input_data, bytes):
+        return input_data.translate(None, b''.join(symbols))
+    symbols = set(symbols)
+    return [s for s in input_data if s not in symbols]
+
+
+def validate_ignored_symbols(ignore, symbol_table):
+    """
+    Validates the symbols to ignore when decoding with the given symbol
+    table (which should include the padding symbol).
+    Raises InvalidSymbolTableError if any of them are in the symbol table, as
+    they could then not be told apart from real symbols.
+    """
+    if set(ignore) & set(symbol_table):
+        raise InvalidSymbolTableError(
+            'Ignored symbols cannot be in the symbol table'
+        )
+
+
 def _symbol_table_is_unique(symbol_table, padding_symbol=None):
     """
     Returns True if the given symbol table and padding symbol are unique,
@@ -73,3 +153,18 @@ def validate_symbol_tables(symbol_table, padding_symbol, other_symbol_table):
         (not _symbol_table_is_unique(other_symbol_table))
     ):
         raise InvalidSymbolTableError('Unique symbol tables required')
+
+
+def validate_unpadded_symbol_tables(symbol_table, other_symbol_table):
+    """
+    Validates two symbol tables which are used without a padding symbol.
+    Raises InvalidSymbolTableError if either of the symbol tables fail
+    validation.
+    """
+    if None in (symbol_table + other_symbol_table):
+        raise InvalidSymbolTableError('None cannot be used in symbol tables')
+    elif (
+        (not _symbol_table_is_unique(symbol_table)) or
+        (not _symbol_table_is_unique(other_symbol_table))
+    ):
+        raise InvalidSymbolTableError('Unique symbol tables required')
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from math import log
+
+from .radix import digits_to_int, int_to_digits, power_table
+from .utils import (
+    ints_to_symbols, symbols_to_ints, validate_unpadded_symbol_tables
+)
+
+
+def _leading_zeros(input_data):
+    """
+    Returns the number of zeros at the start of the given list of integers.
+    """
+    for i, s in enumerate(input_data):
+        if s != 0:
+            return i
+    return len(input_data)
+
+
+def _to_int(input_base, input_data):
+    """
+    Returns the value of the given list of digits in the input base as one big
+    (big-endian) integer.
+    """
+    # bytes can be converted natively where the int type supports it
+    if input_base == 256 and hasattr(int, 'from_bytes'):  # pragma: py3
+        return int.from_bytes(bytearray(input_data), 'big')
+    length = len(input_data)
+    return digits_to_int(
+        input_data, input_base, 0, length, power_table(input_base, length)
+    )
+
+
+def _from_int(value, output_base):
+    """
+    Returns the digits of the given (non-zero) integer in the output base, as
+    a big-endian list with no leading zeros.
+    """
+    if output_base == 256 and hasattr(value, 'to_bytes'):  # pragma: py3
+        return list(bytearray(value.to_bytes(
+            (value.bit_length() + 7) // 8, 'big'
+        )))
+    # the number of digits needed is at most bits / log2(base) + 1, plus one
+    # spare digit so that rounding errors can never make this too small
+    length = int(value.bit_length() / log(output_base, 2)) + 2
+    output_data = [0] * length
+    int_to_digits(
+        value, output_base, output_data, 0, length,
+        power_table(output_base, length)
+    )
+    return output_data[_leading_zeros(output_data):]
+
+
+def encode_whole_raw(input_base, output_base, input_data):
+    """
+    Given an input base, an output base and input data (as an iterable of
+    integers), return a list of integers of the input data encoded into the
+    output base as one single number, in the manner of base58.
+    Each leading zero in the input data is encoded as a leading zero in the
+    output data, so no padding is ever needed.
+    """
+    # create a 'workon' copy of the input data so we don't end up changing it
+    input_workon = list(input_data)
+    zeros = _leading_zeros(input_workon)
+    if zeros == len(input_workon):
+        return input_workon
+    value = _to_int(input_base, input_workon[zeros:])
+    return [0] * zeros + _from_int(value, output_base)
+
+
+def decode_whole_raw(input_base, output_base, input_data):
+    """
+    Given an input base, an output base and input data (as an iterable of
+    integers), return a list of integers of the input data decoded from one
+    single number in the input base to the output base, in the manner of
+    base58. This is the inverse of encode_whole_raw().
+    """
+    return encode_whole_raw(input_base, output_base, input_data)
+
+
+def encode_whole(
+    input_base, input_symbol_table, output_base, output_symbol_table,
+    input_data
+):
+    """
+    Given input and output bases, symbol tables and the input data to encode,
+    return a list of the data encoded from the input base to the output base
+    as one single number, in the manner of base58 (leading zero symbols are
+    preserved and no padding is used).
+    """
+    # validate both symbol tables before continuing
+    validate_unpadded_symbol_tables(output_symbol_table, input_symbol_table)
+    # create workon copy of input data and convert symbols to raw ints
+    input_workon = symbols_to_ints(input_data, input_symbol_table)
+    output_data = encode_whole_raw(input_base, output_base, input_workon)
+    # convert raw output data back to symbols using output symbol table
+    return ints_to_symbols(output_data, output_symbol_table)
+
+
+def decode_whole(
+    input_base, input_symbol_table, output_base, output_symbol_table,
+    input_data
+):
+    """
+    Given input and output bases, symbol tables and the input data to decode,
+    return a list of the data decoded from one single number in the input base
+    to the output base, in the manner of base58. This is the inverse of
+    encode_whole().
+    """
+    return encode_whole(
+        input_base, input_symbol_table, output_base, output_symbol_table,
+        input_data
+    )
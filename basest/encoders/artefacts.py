@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+
+from ..core import lookup
+from ..core.utils import validate_symbol_tables
+from ..exceptions import StaleArtefactError
+
+
+# identifies compiled codec files, the last byte is the version of the format
+ARTEFACT_MAGIC = b'BASEST\x00\x01'
+
+# the length of the header follows the magic, as a little-endian uint32
+_HEADER_LENGTH = struct.Struct(str('<I'))
+
+# the tables start on a multiple of this many bytes, so they can be cast
+_ALIGNMENT = 8
+
+# Python 2 memoryviews can't be cast (and can't be made of mmaps either)
+_CAN_CAST = hasattr(memoryview, 'cast')
+
+
+def _symbols(symbol_table):
+    """
+    Returns the given symbol table as a list of symbols which can be stored
+    as JSON, with any byte strings (such as those from chr() on Python 2)
+    given as the characters of their bytes.
+    """
+    return [
+        s.decode('latin-1') if isinstance(s, bytes) else s
+        for s in symbol_table
+    ]
+
+
+def _parameters(encoder):
+    """
+    Returns a dictionary of the parameters of the given Encoder.
+    """
+    return {
+        'input_base': encoder.input_base,
+        'output_base': encoder.output_base,
+        'input_ratio': encoder.input_ratio,
+        'output_ratio': encoder.output_ratio,
+        'input_symbol_table': _symbols(encoder.input_symbol_table),
+        'output_symbol_table': _symbols(encoder.output_symbol_table),
+        'padding_symbol': _symbols([encoder.padding_symbol])[0],
+    }
+
+
+def codec_hash(encoder):
+    """
+    Returns a hex digest of the parameters of the given Encoder (or Encoder
+    subclass), which compiled codec files are keyed by.
+    """
+    parameters = json.dumps(_parameters(encoder), sort_keys=True)
+    return hashlib.sha256(parameters.encode('utf-8')).hexdigest()
+
+
+def _directions(encoder):
+    """
+    Returns the bases and ratios used by the given Encoder for encoding and
+    for decoding, as tuples of (input_base, output_base, input_ratio,
+    output_ratio).
+    """
+    return [
+        (
+            encoder.input_base, encoder.output_base,
+            encoder.input_ratio, encoder.output_ratio
+        ),
+        (
+            encoder.output_base, encoder.input_base,
+            encoder.output_ratio, encoder.input_ratio
+        ),
+    ]
+
+
+def _typecode(maximum):
+    """
+    Returns the smallest array typecode for unsigned integers up to maximum.
+    """
+    for typecode in 'BHI':
+        if maximum < 1 << (8 * array(str(typecode)).itemsize):
+            return typecode
+    return 'Q'
+
+
+def _aligned(offset):
+    """
+    Returns the given offset rounded up to the next multiple of _ALIGNMENT.
+    """
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def save_codec(encoder, path):
+    """
+    Compiles the given Encoder, validating its symbol tables and building the
+    lookup tables for both directions where they are small enough to be used,
+    and writes it to a compiled codec file at the given path, which
+    load_codec() can load without building anything again.
+    The file is replaced in one step, so processes loading it at the same
+    time never see it half-written.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        encoder.output_symbol_table,
+        encoder.padding_symbol,
+        encoder.input_symbol_table
+    )
+    tables = []
+    blobs = []
+    offset = 0
+    for direction in _directions(encoder):
+        input_base, output_base, input_ratio, output_ratio = direction
+        size = lookup.chunk_space(input_base, input_ratio)
+        if size is None:
+            continue
+        rows = lookup.lookup_table(
+            input_base, output_base, input_ratio, output_ratio, size
+        )
+        # store the table a column at a time, for FlatTable
+        values = list(chain.from_iterable(zip(*rows)))
+        typecode = _typecode(max(values))
+        blob = array(str(typecode), values)
+        try:
+            blob = blob.tobytes()
+        except AttributeError:  # pragma: no cover
+            # Python 2 arrays only have tostring()
+            blob = blob.tostring()
+        tables.append({
+            'direction': list(direction),
+            'typecode': typecode,
+            'offset': offset,
+            'length': len(blob),
+        })
+        blobs.append(blob + b'\0' * (_aligned(len(blob)) - len(blob)))
+        offset += len(blobs[-1])
+    header = json.dumps({
+        'hash': codec_hash(encoder),
+        'byteorder': sys.byteorder,
+        'parameters': _parameters(encoder),
+        'tables': tables,
+    }, sort_keys=True).encode('utf-8')
+    start = len(ARTEFACT_MAGIC) + _HEADER_LENGTH.size + len(header)
+    temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'wb') as artefact:
+        artefact.write(ARTEFACT_MAGIC)
+        artefact.write(_HEADER_LENGTH.pack(len(header)))
+        artefact.write(header)
+        artefact.write(b'\0' * (_aligned(start) - start))
+        for blob in blobs:
+            artefact.write(blob)
+    # os.replace() is atomic everywhere, but Python 2 only has os.rename()
+    getattr(os, 'replace', os.rename)(temporary_path, path)
+
+
+def _read_header(data):
+    """
+    Returns the header of the given memory-mapped compiled codec file and the
+    offset its tables start at.
+    Raises StaleArtefactError if the file is not a compiled codec file.
+    """
+    prefix_length = len(ARTEFACT_MAGIC) + _HEADER_LENGTH.size
+    if (
+        len(data) < prefix_length or
+        data[:len(ARTEFACT_MAGIC)] != ARTEFACT_MAGIC
+    ):
+        raise StaleArtefactError('Not a compiled codec file')
+    header_length, = _HEADER_LENGTH.unpack(
+        data[len(ARTEFACT_MAGIC):prefix_length]
+    )
+    try:
+        header = json.loads(
+            data[prefix_length:prefix_length + header_length].decode('utf-8')
+        )
+    except ValueError:
+        raise StaleArtefactError('Compiled codec file is corrupted')
+    return header, _aligned(prefix_length + header_length)
+
+
+def _table_values(data, typecode, start, stop):
+    """
+    Returns the values of the table between the given offsets of the given
+    memory-mapped compiled codec file, as a memoryview of the file cast to
+    the given typecode, or where that isn't possible, as an array copied
+    from the file.
+    """
+    if _CAN_CAST:  # pragma: py3
+        return memoryview(data)[start:stop].cast(str(typecode))
+    return array(str(typecode), data[start:stop])
+
+
+def load_codec(encoder, path):
+    """
+    Loads the compiled codec file at the given path for the given Encoder,
+    memory-mapping the lookup tables stored in it so that they are used
+    straight from the file from then on, without building them again.
+    Raises StaleArtefactError if the file was compiled from an Encoder with
+    different parameters (or on a machine with a different byte order), or if
+    it is not a compiled codec file.
+    """
+    with open(path, 'rb') as artefact:
+        try:
+            data = mmap.mmap(artefact.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can't be memory-mapped
+            raise StaleArtefactError('Not a compiled codec file')
+    try:
+        header, start = _read_header(data)
+        if (
+            header.get('hash') != codec_hash(encoder) or
+            header.get('byteorder') != sys.byteorder
+        ):
+            raise StaleArtefactError(
+                'Compiled codec file does not match the Encoder'
+            )
+    except StaleArtefactError:
+        data.close()
+        raise
+    for table in header['tables']:
+        input_base, output_base, input_ratio, output_ratio = table['direction']
+        values = _table_values(
+            data, table['typecode'], start + table['offset'],
+            start + table['offset'] + table['length']
+        )
+        lookup.register_table(
+            input_base, output_base, input_ratio, output_ratio,
+            lookup.FlatTable(values, output_ratio)
+        )
+
+
+def load_or_save_codec(encoder, path):
+    """
+    Loads the compiled codec file at the given path for the given Encoder,
+    first compiling it (again) if the file doesn't exist or is stale.
+    """
+    try:
+        load_codec(encoder, path)
+    except (IOError, OSError, StaleArtefactError):
+        save_codec(encoder, path)
+        load_codec(encoder, path)
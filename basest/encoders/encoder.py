@@ -10,10 +10,35 @@ from __future__ import (
     absolute_import, division, print_function, unicode_literals
 )
 
-from ..core import decode, decode_raw, encode, encode_raw
+from ..core import (
+    DecodedView, decode, decode_digest, decode_many, decode_range, decode_raw,
+    decode_utf8, encode, encode_digest, encode_many, encode_patch, encode_raw,
+    encode_utf8
+)
+from ..core.instrumentation import instrumented
+from ..core.parallel import decode_parallel, encode_parallel
+from ..exceptions import ImproperUsageError
+
+
+def _refuse_shortcuts(encoder, operation):
+    """
+    Raises ImproperUsageError if the given Encoder has shortcut symbols, as
+    only encode(), decode() and their digest counterparts understand them.
+    """
+    if encoder.shortcut_symbols:
+        raise ImproperUsageError(
+            '{0} does not support shortcut symbols'.format(operation)
+        )
 
 
 class Encoder(object):
+    """
+    Base class for encoders, configured by overriding the class variables.
+
+    Instances of Encoder subclasses hold no state of their own and never
+    modify their class variables, so a single instance can safely be shared
+    between any number of threads.
+    """
     # set out blank placeholders for class variables
     input_base = None
     output_base = None
@@ -22,7 +47,15 @@ class Encoder(object):
     input_symbol_table = None
     output_symbol_table = None
     padding_symbol = None
+    # optional dictionary of shortcut symbols for whole chunks of input
+    # symbols, as taken by basest.core.encode(). Only encode(), decode() and
+    # their digest counterparts use them (raw data has no symbols to shortcut)
+    # and the other methods raise ImproperUsageError when they are set
+    shortcut_symbols = None
+    # set by the basest.encoders.ordering.order_preserving class decorator
+    preserves_order = False
 
+    @instrumented('encode_raw')
     def encode_raw(self, input_data):
         """
         Encode raw data (no mapping of symbols). Use encode_raw function to
@@ -34,6 +67,7 @@ class Encoder(object):
             input_data=input_data
         )
 
+    @instrumented('decode_raw')
     def decode_raw(self, input_data):
         """
         Decode raw data (no mapping of symbols). Use decode_raw function to
@@ -45,6 +79,7 @@ class Encoder(object):
             input_data=input_data
         )
 
+    @instrumented('encode')
     def encode(self, input_data):
         """
         Encode data. Use encode function to actually do the work.
@@ -56,12 +91,14 @@ class Encoder(object):
             output_symbol_table=self.output_symbol_table,
             output_padding=self.padding_symbol,
             input_ratio=self.input_ratio, output_ratio=self.output_ratio,
-            input_data=input_data
+            input_data=input_data, shortcuts=self.shortcut_symbols
         )
 
-    def decode(self, input_data):
+    @instrumented('decode')
+    def decode(self, input_data, ignore=None):
         """
-        Decode data. Use decode function to actually do the work.
+        Decode data, ignoring any of the symbols in ignore. Use decode
+        function to actually do the work.
         """
         return decode(
             input_base=self.output_base,
@@ -70,5 +107,194 @@ class Encoder(object):
             output_base=self.input_base,
             output_symbol_table=self.input_symbol_table,
             input_ratio=self.output_ratio, output_ratio=self.input_ratio,
-            input_data=input_data
+            input_data=input_data, ignore=ignore,
+            shortcuts=self.shortcut_symbols
+        )
+
+    @instrumented('encode_many')
+    def encode_many(self, inputs):
+        """
+        Encode a sequence of many inputs in one batch. Use encode_many
+        function to actually do the work.
+        """
+        _refuse_shortcuts(self, 'encode_many()')
+        return encode_many(
+            input_base=self.input_base,
+            input_symbol_table=self.input_symbol_table,
+            output_base=self.output_base,
+            output_symbol_table=self.output_symbol_table,
+            output_padding=self.padding_symbol,
+            input_ratio=self.input_ratio, output_ratio=self.output_ratio,
+            inputs=inputs
+        )
+
+    @instrumented('decode_many')
+    def decode_many(self, inputs):
+        """
+        Decode a sequence of many inputs in one batch. Use decode_many
+        function to actually do the work.
+        """
+        _refuse_shortcuts(self, 'decode_many()')
+        return decode_many(
+            input_base=self.output_base,
+            input_symbol_table=self.output_symbol_table,
+            input_padding=self.padding_symbol,
+            output_base=self.input_base,
+            output_symbol_table=self.input_symbol_table,
+            input_ratio=self.output_ratio, output_ratio=self.input_ratio,
+            inputs=inputs
+        )
+
+    @instrumented('encode_parallel')
+    def encode_parallel(self, input_data, workers=None, executor=None):
+        """
+        Encode data using several threads. Use encode_parallel function to
+        actually do the work.
+        """
+        _refuse_shortcuts(self, 'encode_parallel()')
+        return encode_parallel(
+            input_base=self.input_base,
+            input_symbol_table=self.input_symbol_table,
+            output_base=self.output_base,
+            output_symbol_table=self.output_symbol_table,
+            output_padding=self.padding_symbol,
+            input_ratio=self.input_ratio, output_ratio=self.output_ratio,
+            input_data=input_data, workers=workers, executor=executor
+        )
+
+    @instrumented('decode_parallel')
+    def decode_parallel(self, input_data, workers=None, executor=None):
+        """
+        Decode data using several threads. Use decode_parallel function to
+        actually do the work.
+        """
+        _refuse_shortcuts(self, 'decode_parallel()')
+        return decode_parallel(
+            input_base=self.output_base,
+            input_symbol_table=self.output_symbol_table,
+            input_padding=self.padding_symbol,
+            output_base=self.input_base,
+            output_symbol_table=self.input_symbol_table,
+            input_ratio=self.output_ratio, output_ratio=self.input_ratio,
+            input_data=input_data, workers=workers, executor=executor
+        )
+
+    def encode_utf8(
+        self, input_data, output=None, line_length=None, line_separator='\n'
+    ):
+        """
+        Encode data straight to UTF-8 bytes (or to a binary file), optionally
+        split into lines. Use encode_utf8 function to actually do the work.
+        """
+        _refuse_shortcuts(self, 'encode_utf8()')
+        return encode_utf8(
+            input_base=self.input_base,
+            input_symbol_table=self.input_symbol_table,
+            output_base=self.output_base,
+            output_symbol_table=self.output_symbol_table,
+            output_padding=self.padding_symbol,
+            input_ratio=self.input_ratio, output_ratio=self.output_ratio,
+            input_data=input_data, output=output,
+            line_length=line_length, line_separator=line_separator
+        )
+
+    def decode_utf8(self, input_data, ignore=None):
+        """
+        Decode data straight from UTF-8 bytes, ignoring any of the characters
+        in ignore. Use decode_utf8 function to actually do the work.
+        """
+        _refuse_shortcuts(self, 'decode_utf8()')
+        return decode_utf8(
+            input_base=self.output_base,
+            input_symbol_table=self.output_symbol_table,
+            input_padding=self.padding_symbol,
+            output_base=self.input_base,
+            output_symbol_table=self.input_symbol_table,
+            input_ratio=self.output_ratio, output_ratio=self.input_ratio,
+            input_data=input_data, ignore=ignore
+        )
+
+    def decode_range(self, input_data, start, stop):
+        """
+        Decode only the part of the data needed for the given range of the
+        decoded output. Use decode_range function to actually do the work.
+        """
+        _refuse_shortcuts(self, 'decode_range()')
+        return decode_range(
+            input_base=self.output_base,
+            input_symbol_table=self.output_symbol_table,
+            input_padding=self.padding_symbol,
+            output_base=self.input_base,
+            output_symbol_table=self.input_symbol_table,
+            input_ratio=self.output_ratio, output_ratio=self.input_ratio,
+            input_data=input_data, start=start, stop=stop
+        )
+
+    def decoded_view(self, input_data, chunks_per_block=64, cache_size=16):
+        """
+        Return a lazy view of the decoded data, which is only decoded as it
+        is indexed or sliced. Use DecodedView to actually do the work.
+        """
+        _refuse_shortcuts(self, 'decoded_view()')
+        return DecodedView(
+            input_base=self.output_base,
+            input_symbol_table=self.output_symbol_table,
+            input_padding=self.padding_symbol,
+            output_base=self.input_base,
+            output_symbol_table=self.input_symbol_table,
+            input_ratio=self.output_ratio, output_ratio=self.input_ratio,
+            input_data=input_data, chunks_per_block=chunks_per_block,
+            cache_size=cache_size
+        )
+
+    def encode_patch(self, encoded_data, offset, input_data, apply=False):
+        """
+        Re-encode only the part of some encoded data affected by writing the
+        given input data over the original data from the given offset. Use
+        encode_patch function to actually do the work.
+        """
+        _refuse_shortcuts(self, 'encode_patch()')
+        return encode_patch(
+            input_base=self.input_base,
+            input_symbol_table=self.input_symbol_table,
+            output_base=self.output_base,
+            output_symbol_table=self.output_symbol_table,
+            output_padding=self.padding_symbol,
+            input_ratio=self.input_ratio, output_ratio=self.output_ratio,
+            encoded_data=encoded_data, offset=offset, input_data=input_data,
+            apply=apply
+        )
+
+    def encode_digest(self, input_data, digest):
+        """
+        Encode data, adding it to the given digest in the same pass and
+        returning the digest with the output. Use encode_digest function to
+        actually do the work.
+        """
+        return encode_digest(
+            input_base=self.input_base,
+            input_symbol_table=self.input_symbol_table,
+            output_base=self.output_base,
+            output_symbol_table=self.output_symbol_table,
+            output_padding=self.padding_symbol,
+            input_ratio=self.input_ratio, output_ratio=self.output_ratio,
+            input_data=input_data, digest=digest,
+            shortcuts=self.shortcut_symbols
+        )
+
+    def decode_digest(self, input_data, digest, ignore=None):
+        """
+        Decode data, adding the decoded data to the given digest in the same
+        pass and returning the digest with the output. Use decode_digest
+        function to actually do the work.
+        """
+        return decode_digest(
+            input_base=self.output_base,
+            input_symbol_table=self.output_symbol_table,
+            input_padding=self.padding_symbol,
+            output_base=self.input_base,
+            output_symbol_table=self.input_symbol_table,
+            input_ratio=self.output_ratio, output_ratio=self.input_ratio,
+            input_data=input_data, digest=digest, ignore=ignore,
+            shortcuts=self.shortcut_symbols
         )
@@ -0,0 +1,376 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import codecs
+import json
+import os
+from collections import namedtuple
+
+from ..core.digest import Checksum
+from ..core.stream import IncrementalDecoder, IncrementalEncoder
+from ..core.utils import (
+    ints_to_symbols, map_symbols_to_ints, symbol_map, validate_symbol_tables
+)
+from ..exceptions import ImproperUsageError, StaleCheckpointError
+from .artefacts import codec_hash
+from .encoder import _refuse_shortcuts
+
+
+# the default number of bytes read from the input file at a time
+DEFAULT_CHUNK_SIZE = 65536
+
+# the default number of input bytes converted between checkpoints
+DEFAULT_CHECKPOINT_INTERVAL = 64 * 1024 * 1024
+
+# the version of the format of checkpoint files
+CHECKPOINT_VERSION = 1
+
+# How far a file job has got: the number of bytes of the input file converted
+# (always on a chunk boundary) and of the output file written, and the CRC32s
+# of those bytes of each file. Returned for the whole files when a job ends.
+Checkpoint = namedtuple(
+    'Checkpoint',
+    ['input_offset', 'output_offset', 'input_crc32', 'output_crc32']
+)
+
+
+def checkpoint_path(output_path):
+    """
+    Returns the path of the checkpoint file kept for the job writing to the
+    given output path while it runs.
+    """
+    return output_path + '.checkpoint'
+
+
+def _check_byte_encoder(encoder):
+    """
+    Raises ImproperUsageError if the given Encoder does not encode from base
+    256, as only Encoders with bytes as their input can be used with files,
+    or if it has shortcut symbols.
+    """
+    if encoder.input_base != 256:
+        raise ImproperUsageError('File jobs require an input base of 256')
+    _refuse_shortcuts(encoder, 'File jobs')
+
+
+def _job_header(operation, encoder, input_path):
+    """
+    Returns a dictionary identifying the job doing the given operation with
+    the given Encoder on the given input file, which must match for a
+    checkpoint to be resumed from.
+    """
+    return {
+        'version': CHECKPOINT_VERSION,
+        'operation': operation,
+        'codec': codec_hash(encoder),
+        'input_size': os.path.getsize(input_path),
+    }
+
+
+def _write_checkpoint(path, header, checkpoint):
+    """
+    Writes the given job header and Checkpoint to the checkpoint file at the
+    given path. The file is replaced in one step, so a job killed at any
+    time always leaves the last complete checkpoint behind.
+    """
+    record = dict(header, **checkpoint._asdict())
+    temporary_path = '{0}.{1}.tmp'.format(path, os.getpid())
+    with open(temporary_path, 'w') as checkpoint_file:
+        json.dump(record, checkpoint_file, sort_keys=True)
+    # os.replace() is atomic everywhere, but Python 2 only has os.rename()
+    getattr(os, 'replace', os.rename)(temporary_path, path)
+
+
+def _crc32_of_prefix(path, length, chunk_size):
+    """
+    Returns the CRC32 of the first length bytes of the file at the given
+    path (or None if it is shorter than that).
+    """
+    checksum = Checksum()
+    with open(path, 'rb') as source:
+        while length:
+            data = source.read(min(chunk_size, length))
+            if not data:
+                return None
+            checksum.update(data)
+            length -= len(data)
+    return checksum.value
+
+
+def read_checkpoint(
+    operation, encoder, input_path, output_path, alignment=1, verify=False,
+    chunk_size=DEFAULT_CHUNK_SIZE
+):
+    """
+    Returns the Checkpoint recorded for the job doing the given operation
+    ('encode' or 'decode') with the given Encoder from the input path to the
+    output path, or None if there isn't one.
+    If verify is True, the CRC32s of the input and output converted so far
+    are checked against the files, which means reading (but not converting)
+    everything up to the checkpoint again.
+    Raises StaleCheckpointError if the checkpoint was recorded for a
+    different job, its input offset is not a multiple of alignment, or the
+    files no longer match it.
+    """
+    path = checkpoint_path(output_path)
+    try:
+        with open(path, 'r') as checkpoint_file:
+            record = json.load(checkpoint_file)
+        checkpoint = Checkpoint(*(record.pop(f) for f in Checkpoint._fields))
+    except (IOError, OSError):
+        if os.path.exists(path):
+            raise
+        return None
+    except (ValueError, KeyError, TypeError):
+        raise StaleCheckpointError('Checkpoint file is corrupted')
+    if record != _job_header(operation, encoder, input_path):
+        raise StaleCheckpointError(
+            'Checkpoint was recorded for a different job'
+        )
+    if checkpoint.input_offset % alignment:
+        raise StaleCheckpointError(
+            'Checkpoint is not on a chunk boundary of the input'
+        )
+    if (
+        not os.path.exists(output_path) or
+        os.path.getsize(output_path) < checkpoint.output_offset
+    ):
+        raise StaleCheckpointError('Output file is shorter than checkpoint')
+    if verify and (
+        _crc32_of_prefix(input_path, checkpoint.input_offset, chunk_size) !=
+        checkpoint.input_crc32 or
+        _crc32_of_prefix(output_path, checkpoint.output_offset, chunk_size) !=
+        checkpoint.output_crc32
+    ):
+        raise StaleCheckpointError('Files do not match checkpoint')
+    return checkpoint
+
+
+class _Job(object):
+    """
+    Runs a file job from the start or from a checkpoint, keeping the offsets
+    and CRC32s of the input converted and output written, and recording a
+    checkpoint whenever checkpoint_interval more input bytes have been
+    converted. Subclasses do the conversion with convert() and
+    pending_length().
+    """
+    operation = None
+
+    def __init__(
+        self, encoder, input_path, output_path, chunk_size,
+        checkpoint_interval, resume, verify
+    ):
+        _check_byte_encoder(encoder)
+        # validate both symbol tables and the padding symbol before continuing
+        validate_symbol_tables(
+            encoder.output_symbol_table,
+            encoder.padding_symbol,
+            encoder.input_symbol_table
+        )
+        self.encoder = encoder
+        self.input_path = input_path
+        self.output_path = output_path
+        self.chunk_size = chunk_size
+        self.checkpoint_interval = checkpoint_interval
+        self.header = _job_header(self.operation, encoder, input_path)
+        checkpoint = None
+        if resume:
+            checkpoint = read_checkpoint(
+                self.operation, encoder, input_path, output_path,
+                self.alignment, verify, chunk_size
+            )
+        self.checkpoint = checkpoint or Checkpoint(0, 0, 0, 0)
+
+    def run(self):
+        """
+        Converts the rest of the input file, appending to the output file
+        (after cutting off anything written after the checkpoint, such as a
+        partially written chunk), then removes the checkpoint file and
+        returns a Checkpoint for the whole files.
+        """
+        input_offset, output_offset = self.checkpoint[:2]
+        input_crc32 = Checksum(value=self.checkpoint.input_crc32)
+        output_crc32 = Checksum(value=self.checkpoint.output_crc32)
+        path = checkpoint_path(self.output_path)
+        # input which has been read but not converted yet
+        unconverted = b''
+        mode = 'r+b' if output_offset else 'wb'
+        with open(self.input_path, 'rb') as source:
+            with open(self.output_path, mode) as target:
+                source.seek(input_offset)
+                target.seek(output_offset)
+                target.truncate()
+                last_checkpoint = input_offset
+                while True:
+                    data = source.read(self.chunk_size)
+                    output_data = self.convert(data, final=not data)
+                    target.write(output_data)
+                    output_crc32.update(output_data)
+                    output_offset += len(output_data)
+                    unconverted += data
+                    converted = len(unconverted) - self.pending_length()
+                    input_crc32.update(unconverted[:converted])
+                    input_offset += converted
+                    unconverted = unconverted[converted:]
+                    if not data:
+                        break
+                    if (
+                        input_offset - last_checkpoint >=
+                        self.checkpoint_interval
+                    ):
+                        # the output must be on disk before the checkpoint is
+                        target.flush()
+                        os.fsync(target.fileno())
+                        _write_checkpoint(
+                            path, self.header,
+                            Checkpoint(
+                                input_offset, output_offset,
+                                input_crc32.value, output_crc32.value
+                            )
+                        )
+                        last_checkpoint = input_offset
+        if os.path.exists(path):
+            os.remove(path)
+        return Checkpoint(
+            input_offset, output_offset, input_crc32.value, output_crc32.value
+        )
+
+
+class _EncodeJob(_Job):
+    """
+    Encodes bytes to UTF-8 text a piece at a time, in the same way as
+    encode_stream().
+    """
+    operation = 'encode'
+
+    def __init__(self, encoder, *args):
+        # checkpoints always fall on a chunk boundary
+        self.alignment = encoder.input_ratio
+        super(_EncodeJob, self).__init__(encoder, *args)
+        self._output_symbol_table = (
+            encoder.output_symbol_table + [encoder.padding_symbol]
+        )
+        self._incremental = IncrementalEncoder(
+            encoder.input_base, encoder.output_base,
+            encoder.input_ratio, encoder.output_ratio
+        )
+        self._pending = 0
+
+    def convert(self, data, final):
+        """
+        Returns the output (as bytes) of encoding the given piece of input.
+        """
+        self._pending = 0 if final else (
+            (self._pending + len(data)) % self.encoder.input_ratio
+        )
+        output_data = ints_to_symbols(
+            self._incremental.encode(bytearray(data), final),
+            self._output_symbol_table
+        )
+        return ''.join(output_data).encode('utf-8')
+
+    def pending_length(self):
+        """
+        Returns the number of bytes of input which are waiting for the rest
+        of their chunk.
+        """
+        return self._pending
+
+
+class _DecodeJob(_Job):
+    """
+    Decodes UTF-8 text to bytes a piece at a time, in the same way as
+    decode_stream().
+    """
+    operation = 'decode'
+    # checkpoints always fall between symbols, wherever they are
+    alignment = 1
+
+    def __init__(self, encoder, *args):
+        super(_DecodeJob, self).__init__(encoder, *args)
+        self._input_map = symbol_map(
+            encoder.output_symbol_table + [encoder.padding_symbol]
+        )
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._incremental = IncrementalDecoder(
+            encoder.output_base, encoder.input_base,
+            encoder.output_ratio, encoder.input_ratio
+        )
+        # symbols which are waiting for the rest of their chunk
+        self._symbols = ''
+
+    def convert(self, data, final):
+        """
+        Returns the output (as bytes) of decoding the given piece of input.
+        Only whole chunks of symbols are passed on to be decoded, so that
+        the rest can be counted by pending_length().
+        """
+        text = self._symbols + self._text_decoder.decode(data, final)
+        length = len(text)
+        if not final:
+            length -= length % self.encoder.output_ratio
+        self._symbols = text[length:]
+        return bytes(bytearray(self._incremental.decode(
+            map_symbols_to_ints(text[:length], self._input_map), final
+        )))
+
+    def pending_length(self):
+        """
+        Returns the number of bytes of input which are waiting for the rest
+        of their chunk (or of their UTF-8 character).
+        """
+        return (
+            len(self._text_decoder.getstate()[0]) +
+            len(self._symbols.encode('utf-8'))
+        )
+
+
+def encode_file(
+    encoder, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE,
+    checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, resume=True,
+    verify=False
+):
+    """
+    Encodes the bytes of the file at the input path with the given Encoder
+    (which must have an input base of 256), writing the encoded symbols to
+    the file at the output path as UTF-8 text. At most chunk_size bytes are
+    encoded at a time.
+    Every checkpoint_interval bytes of input, a checkpoint is recorded next
+    to the output file (see checkpoint_path()). If the job is stopped, it
+    carries on from the last checkpoint the next time it is run, unless
+    resume is False (see read_checkpoint() for verify).
+    Returns a Checkpoint for the whole files, with their CRC32s.
+    Raises StaleCheckpointError if the checkpoint doesn't match the job.
+    """
+    return _EncodeJob(
+        encoder, input_path, output_path, chunk_size, checkpoint_interval,
+        resume, verify
+    ).run()
+
+
+def decode_file(
+    encoder, input_path, output_path, chunk_size=DEFAULT_CHUNK_SIZE,
+    checkpoint_interval=DEFAULT_CHECKPOINT_INTERVAL, resume=True,
+    verify=False
+):
+    """
+    Decodes the UTF-8 text of the file at the input path with the given
+    Encoder (which must have an input base of 256, and where each symbol is
+    a single character), writing the decoded bytes to the file at the output
+    path. Checkpoints are recorded and resumed from as by encode_file().
+    Returns a Checkpoint for the whole files, with their CRC32s.
+    Raises StaleCheckpointError if the checkpoint doesn't match the job.
+    """
+    return _DecodeJob(
+        encoder, input_path, output_path, chunk_size, checkpoint_interval,
+        resume, verify
+    ).run()
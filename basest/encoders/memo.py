@@ -0,0 +1,292 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import threading
+from collections import OrderedDict
+
+from ..core import lookup
+from ..core.decode import _check_input_length, _strip_padding, _unpad_input
+from ..core.encode import _convert_chunks, _pad_input, _pad_output
+from ..core.tokenize import needs_tokenizing, tokenize
+from ..core.utils import (
+    delete_symbols, ints_to_symbols, map_symbols_to_ints, symbol_map,
+    validate_ignored_symbols, validate_symbol_tables
+)
+
+
+# the default maximum numbers of messages and chunks kept by MemoizedEncoder
+DEFAULT_MESSAGE_CACHE_SIZE = 1024
+DEFAULT_CHUNK_CACHE_SIZE = 65536
+
+
+class LRUCache(object):
+    """
+    A thread-safe mapping which keeps at most maxsize items, dropping the
+    least recently used item to make room for new ones, and counts its hits,
+    misses and evictions. A maxsize of 0 disables the cache.
+    """
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = self._misses = self._evictions = 0
+
+    def get(self, key):
+        """
+        Returns the item stored under the given key (making it the most
+        recently used), or None if there isn't one.
+        """
+        with self._lock:
+            value = self._items.pop(key, None)
+            if value is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._items[key] = value
+            return value
+
+    def put(self, key, value):
+        """
+        Stores the given value under the given key, dropping the least
+        recently used items if there are too many.
+        """
+        with self._lock:
+            if not self.maxsize:
+                return
+            self._items.pop(key, None)
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self):
+        """
+        Returns a dictionary of the numbers of hits, misses and evictions so
+        far and the current and maximum size of the cache.
+        """
+        with self._lock:
+            return {
+                'hits': self._hits, 'misses': self._misses,
+                'evictions': self._evictions, 'size': len(self._items),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self):
+        """
+        Discards all items and resets the statistics.
+        """
+        with self._lock:
+            self._items.clear()
+            self._hits = self._misses = self._evictions = 0
+
+
+def _as_sequence(input_data):
+    """
+    Returns the given input data as a string or bytes if it is one, or as a
+    new list otherwise, so iterators are only read once.
+    """
+    if isinstance(input_data, (type(''), bytes)):
+        return input_data
+    return list(input_data)
+
+
+def _message_key(input_data):
+    """
+    Returns a hashable key for the given input data.
+    """
+    if isinstance(input_data, (type(''), bytes)):
+        return input_data
+    return tuple(input_data)
+
+
+class MemoizedEncoder(object):
+    """
+    Wraps an Encoder, caching the results of encode() and decode() for whole
+    messages (keyed by the input data) and, when the Encoder's chunks are too
+    large for lookup tables, the output of individual chunks, so that data
+    which repeats is only converted once. Both caches are LRUCaches of the
+    given sizes, and can be shared between threads.
+
+    Any other attributes are looked up on the wrapped Encoder.
+    """
+    def __init__(
+        self, encoder, message_cache_size=DEFAULT_MESSAGE_CACHE_SIZE,
+        chunk_cache_size=DEFAULT_CHUNK_CACHE_SIZE
+    ):
+        # validate both symbol tables and the padding symbol before continuing
+        validate_symbol_tables(
+            encoder.output_symbol_table,
+            encoder.padding_symbol,
+            encoder.input_symbol_table
+        )
+        self.encoder = encoder
+        self.messages = LRUCache(message_cache_size)
+        self.chunks = LRUCache(chunk_cache_size)
+        self._input_map = symbol_map(encoder.input_symbol_table)
+        self._output_table = (
+            encoder.output_symbol_table + [encoder.padding_symbol]
+        )
+        self._output_map = symbol_map(self._output_table)
+
+    def __getattr__(self, name):
+        return getattr(self.encoder, name)
+
+    def _use_chunk_cache(self, input_base, input_ratio):
+        """
+        Returns True if chunks of input_ratio symbols of the input base should
+        be converted with the chunk cache, rather than with lookup tables.
+        Encoders with shortcut symbols are always left to convert the data
+        themselves, as the chunk cache doesn't know about them.
+        """
+        return bool(self.chunks.maxsize) and not (
+            self.encoder.shortcut_symbols
+        ) and lookup.chunk_space(input_base, input_ratio) is None
+
+    def _convert_chunks(
+        self, direction, input_base, output_base, input_ratio, output_ratio,
+        input_workon
+    ):
+        """
+        Converts a list of input data whose length is an exact multiple of the
+        input ratio in the same way as _convert_chunks(), looking up each
+        chunk in the chunk cache first. The chunks which weren't found are all
+        converted together. Each distinct chunk is only looked up once per
+        call, so repeats within one message don't count as cache hits.
+        """
+        chunks = [
+            (direction, tuple(input_workon[i:i + input_ratio]))
+            for i in range(0, len(input_workon), input_ratio)
+        ]
+        found = {}
+        missing = []
+        for chunk in chunks:
+            if chunk not in found:
+                found[chunk] = self.chunks.get(chunk)
+                if found[chunk] is None:
+                    missing.append(chunk)
+        if missing:
+            output_data = _convert_chunks(
+                input_base, output_base, input_ratio, output_ratio,
+                [s for _, chunk in missing for s in chunk]
+            )
+            for i, chunk in enumerate(missing):
+                found[chunk] = tuple(
+                    output_data[i * output_ratio:(i + 1) * output_ratio]
+                )
+                self.chunks.put(chunk, found[chunk])
+        output_data = []
+        for chunk in chunks:
+            output_data.extend(found[chunk])
+        return output_data
+
+    def _encode(self, input_data):
+        """
+        Encodes the input data in the same way as encode(), using the chunk
+        cache.
+        """
+        encoder = self.encoder
+        input_workon = map_symbols_to_ints(input_data, self._input_map)
+        padding_length = _pad_input(
+            encoder.input_base, encoder.output_base, encoder.input_ratio,
+            input_workon
+        )
+        output_data = self._convert_chunks(
+            'encode', encoder.input_base, encoder.output_base,
+            encoder.input_ratio, encoder.output_ratio, input_workon
+        )
+        _pad_output(encoder.output_base, output_data, padding_length)
+        return ints_to_symbols(
+            output_data,
+            encoder.output_symbol_table + [encoder.padding_symbol]
+        )
+
+    def _decode(self, input_data):
+        """
+        Decodes the input data in the same way as decode(), using the chunk
+        cache.
+        """
+        encoder = self.encoder
+        if (
+            isinstance(input_data, type('')) and
+            needs_tokenizing(self._output_table)
+        ):
+            # strings of multi-character symbols have to be split up first
+            input_workon = tokenize(input_data, self._output_map)
+        else:
+            input_workon = map_symbols_to_ints(input_data, self._output_map)
+        _check_input_length(encoder.output_ratio, input_workon)
+        padding_length = _unpad_input(encoder.output_base, input_workon)
+        output_data = self._convert_chunks(
+            'decode', encoder.output_base, encoder.input_base,
+            encoder.output_ratio, encoder.input_ratio, input_workon
+        )
+        _strip_padding(output_data, padding_length)
+        return ints_to_symbols(output_data, encoder.input_symbol_table)
+
+    def encode(self, input_data):
+        """
+        Encode data, as the wrapped Encoder would.
+        """
+        input_data = _as_sequence(input_data)
+        key = ('encode', _message_key(input_data))
+        output_data = self.messages.get(key)
+        if output_data is None:
+            if self._use_chunk_cache(
+                self.encoder.input_base, self.encoder.input_ratio
+            ):
+                output_data = self._encode(input_data)
+            else:
+                output_data = self.encoder.encode(input_data)
+            output_data = tuple(output_data)
+            self.messages.put(key, output_data)
+        # return a new list every time, so the cached result can't be changed
+        return list(output_data)
+
+    def decode(self, input_data, ignore=None):
+        """
+        Decode data, ignoring any of the symbols in ignore, as the wrapped
+        Encoder would.
+        """
+        input_data = _as_sequence(input_data)
+        if ignore:
+            validate_ignored_symbols(ignore, self._output_table)
+            # the ignored symbols are removed first, so they aren't cached
+            input_data = delete_symbols(input_data, ignore)
+        key = ('decode', _message_key(input_data))
+        output_data = self.messages.get(key)
+        if output_data is None:
+            if self._use_chunk_cache(
+                self.encoder.output_base, self.encoder.output_ratio
+            ):
+                output_data = self._decode(input_data)
+            else:
+                output_data = self.encoder.decode(input_data)
+            output_data = tuple(output_data)
+            self.messages.put(key, output_data)
+        # return a new list every time, so the cached result can't be changed
+        return list(output_data)
+
+    def stats(self):
+        """
+        Returns a dictionary of the statistics of the message and chunk
+        caches, as returned by LRUCache.stats().
+        """
+        return {
+            'messages': self.messages.stats(), 'chunks': self.chunks.stats(),
+        }
+
+    def clear(self):
+        """
+        Discards everything in both caches and resets their statistics.
+        """
+        self.messages.clear()
+        self.chunks.clear()
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..core.utils import validate_symbol_tables
+from ..exceptions import ImproperUsageError, InvalidSymbolTableError
+
+
+def _is_strictly_sorted(symbol_table, key=None):
+    """
+    Returns True if every symbol in the given symbol table sorts strictly
+    before the next one, when compared by the given key function (if any).
+    """
+    keys = symbol_table if key is None else [key(s) for s in symbol_table]
+    return all(a < b for a, b in zip(keys, keys[1:]))
+
+
+def check_order_preserving(encoder, key=None):
+    """
+    Checks that the given Encoder (or Encoder subclass) preserves order, so
+    that for any two inputs of the same length, the encoded output of one
+    sorts before the other's exactly when the input does.
+    This is the case when:
+    - the input symbol table is sorted, so that inputs sort in the same order
+      as the values of their symbols
+    - the output symbol table is sorted (by the given key function, if any,
+      for the collation the output will be sorted in)
+    - the output symbols and the padding symbol (if they are strings) are
+      all the same length, so that joining the output into one string
+      doesn't change how it sorts
+    - every chunk of input fits in output_ratio output symbols, so that
+      chunks are encoded as fixed-width big-endian numbers
+    - there are no shortcut symbols, which would replace whole chunks with a
+      symbol that sorts differently
+    Where the padding goes doesn't matter, as inputs of the same length are
+    always padded in the same places.
+    Raises InvalidSymbolTableError if either symbol table is not sorted or
+    the output symbols are different lengths, or ImproperUsageError if the
+    ratios or shortcut symbols don't preserve order.
+    """
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        encoder.output_symbol_table,
+        encoder.padding_symbol,
+        encoder.input_symbol_table
+    )
+    if not _is_strictly_sorted(encoder.input_symbol_table):
+        raise InvalidSymbolTableError(
+            'Order-preserving encoding requires a sorted input symbol table'
+        )
+    if not _is_strictly_sorted(encoder.output_symbol_table, key):
+        raise InvalidSymbolTableError(
+            'Order-preserving encoding requires a sorted output symbol table'
+        )
+    lengths = set(
+        len(s) for s in encoder.output_symbol_table + [encoder.padding_symbol]
+        if isinstance(s, (type(''), bytes))
+    )
+    if len(lengths) > 1:
+        raise InvalidSymbolTableError(
+            'Order-preserving encoding requires the output symbols and the '
+            'padding symbol to be the same length'
+        )
+    if (
+        encoder.input_base ** encoder.input_ratio >
+        encoder.output_base ** encoder.output_ratio
+    ):
+        raise ImproperUsageError(
+            'Order-preserving encoding requires every input chunk to fit in '
+            'output_ratio output symbols'
+        )
+    if encoder.shortcut_symbols:
+        raise ImproperUsageError(
+            'Order-preserving encoding cannot use shortcut symbols'
+        )
+
+
+def order_preserving(cls=None, key=None):
+    """
+    Class decorator for Encoder subclasses which must preserve order (for
+    example, when encoding keys for a sorted key-value store), which checks
+    the class with check_order_preserving() when it is created and marks it
+    as preserving order. Can be used with or without a key function for the
+    collation of the output symbols:
+
+        @order_preserving
+        class SortableEncoder(Encoder):
+            ...
+
+        @order_preserving(key=str.lower)
+        class CaseInsensitiveEncoder(Encoder):
+            ...
+    """
+    def decorate(cls):
+        check_order_preserving(cls, key)
+        cls.preserves_order = True
+        return cls
+    if cls is None:
+        return decorate
+    return decorate(cls)
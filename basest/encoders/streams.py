@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+# NOTE: this module uses async/await, so it requires Python 3.5 or greater
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import asyncio
+import codecs
+
+from ..core.stream import IncrementalDecoder, IncrementalEncoder, LineWrapper
+from ..core.utils import (
+    delete_symbols, ints_to_symbols, map_symbols_to_ints, symbol_map,
+    validate_ignored_symbols, validate_symbol_tables
+)
+from .encoder import _refuse_shortcuts
+
+
+# the default number of bytes read from the stream reader at a time
+DEFAULT_CHUNK_SIZE = 65536
+
+
+def _check_byte_encoder(encoder):
+    """
+    Raises ValueError if the given Encoder does not encode from base 256, as
+    only Encoders with bytes as their input can be used with byte streams,
+    or ImproperUsageError if it has shortcut symbols.
+    """
+    if encoder.input_base != 256:
+        raise ValueError('Stream adapters require an input base of 256')
+    _refuse_shortcuts(encoder, 'Stream adapters')
+
+
+async def _write(writer, data):
+    """
+    Writes the given bytes to the stream writer (if there are any), waiting
+    for the writer's buffer to drain and giving other tasks a chance to run.
+    """
+    if data:
+        writer.write(data)
+        await writer.drain()
+    await asyncio.sleep(0)
+
+
+async def encode_stream(
+    encoder, reader, writer, chunk_size=DEFAULT_CHUNK_SIZE,
+    line_length=None, line_separator='\n', digest=None
+):
+    """
+    Reads bytes from the given asyncio.StreamReader until the end of the
+    stream, encodes them with the given Encoder (which must have an input base
+    of 256) and writes the encoded symbols to the given asyncio.StreamWriter
+    as UTF-8 text. At most chunk_size bytes are encoded at a time.
+    If line_length is given, the output is split into lines of that many
+    symbols as it is written, separated by the line separator.
+    The writer is not closed afterwards.
+    """
+    _check_byte_encoder(encoder)
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        encoder.output_symbol_table,
+        encoder.padding_symbol,
+        encoder.input_symbol_table
+    )
+    output_symbol_table = (
+        encoder.output_symbol_table + [encoder.padding_symbol]
+    )
+    incremental = IncrementalEncoder(
+        encoder.input_base, encoder.output_base,
+        encoder.input_ratio, encoder.output_ratio, digest
+    )
+    wrapper = LineWrapper(line_length, line_separator) if line_length else None
+    while True:
+        data = await reader.read(chunk_size)
+        output_data = ints_to_symbols(
+            incremental.encode(bytearray(data), final=not data),
+            output_symbol_table
+        )
+        if wrapper is not None:
+            output_data = wrapper.wrap(output_data)
+        await _write(writer, ''.join(output_data).encode('utf-8'))
+        if not data:
+            break
+    if digest is not None:
+        return digest.digest()
+
+
+async def decode_stream(
+    encoder, reader, writer, chunk_size=DEFAULT_CHUNK_SIZE, digest=None,
+    ignore=None
+):
+    """
+    Reads UTF-8 text from the given asyncio.StreamReader until the end of the
+    stream, decodes it with the given Encoder (which must have an input base
+    of 256, and where each symbol is a single character) and writes the
+    decoded bytes to the given asyncio.StreamWriter. At most chunk_size bytes
+    are decoded at a time.
+    If ignore is given, any of the characters in it (such as the line
+    separators of wrapped output from encode_stream()) are removed from the
+    text before decoding.
+    If a digest (see basest.core.digest) is given, the decoded bytes are
+    added to it as they are written, and its digest() is returned at the end.
+    The writer is not closed afterwards.
+    """
+    _check_byte_encoder(encoder)
+    # validate both symbol tables and the padding symbol before continuing
+    validate_symbol_tables(
+        encoder.output_symbol_table,
+        encoder.padding_symbol,
+        encoder.input_symbol_table
+    )
+    if ignore:
+        validate_ignored_symbols(
+            ignore, encoder.output_symbol_table + [encoder.padding_symbol]
+        )
+    input_map = symbol_map(
+        encoder.output_symbol_table + [encoder.padding_symbol]
+    )
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    incremental = IncrementalDecoder(
+        encoder.output_base, encoder.input_base,
+        encoder.output_ratio, encoder.input_ratio, digest
+    )
+    while True:
+        data = await reader.read(chunk_size)
+        text = text_decoder.decode(data, final=not data)
+        if ignore:
+            text = delete_symbols(text, ignore)
+        output_data = incremental.decode(
+            map_symbols_to_ints(text, input_map), final=not data
+        )
+        await _write(writer, bytes(output_data))
+        if not data:
+            break
+    if digest is not None:
+        return digest.digest()
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+from ..core.decode import _check_input_length, _strip_padding, _unpad_input
+from ..core.encode import _convert_chunks, _pad_input, _pad_output
+from ..core.utils import (
+    ints_to_symbols, map_symbols_to_ints, symbol_map, validate_symbol_tables
+)
+from ..exceptions import ImproperUsageError
+from .encoder import _refuse_shortcuts
+
+
+# the default number of groups converted at a time by a Transcoder
+DEFAULT_GROUPS_PER_BLOCK = 1024
+
+
+def _lcm(a, b):
+    """
+    Returns the least common multiple of two positive integers.
+    """
+    x, y = a, b
+    while y:
+        x, y = y, x % y
+    return a * b // x
+
+
+class Transcoder(object):
+    """
+    Converts data encoded by one Encoder (the source) straight to the output
+    of another Encoder (the target) which encodes from the same base, without
+    building the whole decoded data in between. The decoded data is passed
+    from one to the other as raw integers, so their input symbol tables don't
+    have to match.
+
+    The encoded data is converted a block of groups at a time, where each
+    group is the smallest number of decoded symbols that is a whole number of
+    chunks for both the source and the target, so only the last group can
+    contain padding. Transcoders hold no state between calls, so can be
+    shared between threads.
+    """
+    def __init__(
+        self, source, target, groups_per_block=DEFAULT_GROUPS_PER_BLOCK
+    ):
+        if source.input_base != target.input_base:
+            raise ImproperUsageError(
+                'Transcoding requires both Encoders to have the same input '
+                'base'
+            )
+        _refuse_shortcuts(source, 'Transcoding')
+        _refuse_shortcuts(target, 'Transcoding')
+        # validate both Encoders' symbol tables before continuing
+        validate_symbol_tables(
+            source.output_symbol_table,
+            source.padding_symbol,
+            source.input_symbol_table
+        )
+        validate_symbol_tables(
+            target.output_symbol_table,
+            target.padding_symbol,
+            target.input_symbol_table
+        )
+        self.source = source
+        self.target = target
+        self._input_map = symbol_map(
+            source.output_symbol_table + [source.padding_symbol]
+        )
+        group_length = _lcm(source.input_ratio, target.input_ratio)
+        self._block_length = (
+            groups_per_block * group_length // source.input_ratio *
+            source.output_ratio
+        )
+
+    def _transcode_block(self, input_data):
+        """
+        Converts one block of groups of the encoded data, which must be a
+        whole number of the source's chunks, to a list of output symbols.
+        """
+        source = self.source
+        target = self.target
+        # decode the block as decode() would
+        input_workon = map_symbols_to_ints(input_data, self._input_map)
+        padding_length = _unpad_input(source.output_base, input_workon)
+        decoded_data = _convert_chunks(
+            source.output_base, source.input_base,
+            source.output_ratio, source.input_ratio, input_workon
+        )
+        _strip_padding(decoded_data, padding_length)
+        # then encode it as encode() would
+        padding_length = _pad_input(
+            target.input_base, target.output_base, target.input_ratio,
+            decoded_data
+        )
+        output_data = _convert_chunks(
+            target.input_base, target.output_base,
+            target.input_ratio, target.output_ratio, decoded_data
+        )
+        _pad_output(target.output_base, output_data, padding_length)
+        return ints_to_symbols(
+            output_data, target.output_symbol_table + [target.padding_symbol]
+        )
+
+    def transcode(self, input_data):
+        """
+        Given data encoded by the source Encoder (as a sequence of symbols
+        which supports slicing), return a list of the symbols the target
+        Encoder would encode the decoded data as.
+        """
+        _check_input_length(self.source.output_ratio, input_data)
+        output_data = []
+        for start in range(0, len(input_data), self._block_length):
+            output_data.extend(
+                self._transcode_block(
+                    input_data[start:start + self._block_length]
+                )
+            )
+        return output_data
@@ -49,3 +49,21 @@ class InvalidInputLengthError(ValueError):
     the output base is smaller than the input base.
     """
     pass
+
+
+class StaleArtefactError(ValueError):
+    """
+    This exception is raised when a compiled codec file is loaded for an
+    Encoder whose parameters do not match the ones it was compiled from (or
+    when the file is not a compiled codec file at all).
+    """
+    pass
+
+
+class StaleCheckpointError(ValueError):
+    """
+    This exception is raised when a file job is resumed from a checkpoint
+    which was not recorded for the same job (e.g. where the Encoder or the
+    input file is different, or the output file has been cut short).
+    """
+    pass
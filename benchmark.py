@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import multiprocessing
+import random
+import sys
+from timeit import default_timer
+
+from basest.core import decode_parallel, encode_parallel
+
+
+# base85 is used as it needs real arithmetic (unlike power-of-two bases)
+INPUT_SYMBOL_TABLE = [chr(b) for b in range(256)]
+OUTPUT_SYMBOL_TABLE = [chr(c) for c in range(33, 118)]
+PADDING_SYMBOL = '~'
+INPUT_SIZE = 1 << 20
+
+
+def gil_status():
+    """
+    Returns a description of whether this interpreter has a GIL or not.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    if is_gil_enabled is None:
+        return 'GIL'
+    return 'GIL' if is_gil_enabled() else 'free-threaded'
+
+
+def time_it(function, *args, **kwargs):
+    """
+    Returns the result of calling function and the time it took, in seconds.
+    """
+    start = default_timer()
+    result = function(*args, **kwargs)
+    return result, default_timer() - start
+
+
+def benchmark_parallel_scaling():
+    input_data = ''.join(
+        random.choice(INPUT_SYMBOL_TABLE) for _ in range(INPUT_SIZE)
+    )
+    print(
+        'Python {} ({}), {} bytes'.format(
+            sys.version.split()[0], gil_status(), INPUT_SIZE
+        )
+    )
+    print(
+        '{:>8} {:>14} {:>14}'.format(
+            'workers', 'encode (MB/s)', 'decode (MB/s)'
+        )
+    )
+    workers = 1
+    while workers <= multiprocessing.cpu_count():
+        encoded_data, encode_time = time_it(
+            encode_parallel, 256, INPUT_SYMBOL_TABLE, 85, OUTPUT_SYMBOL_TABLE,
+            PADDING_SYMBOL, 4, 5, input_data, workers=workers
+        )
+        decoded_data, decode_time = time_it(
+            decode_parallel, 85, OUTPUT_SYMBOL_TABLE, PADDING_SYMBOL,
+            256, INPUT_SYMBOL_TABLE, 5, 4, encoded_data, workers=workers
+        )
+        assert ''.join(decoded_data) == input_data
+        print(
+            '{:>8} {:>14.2f} {:>14.2f}'.format(
+                workers, INPUT_SIZE / encode_time / 1e6,
+                INPUT_SIZE / decode_time / 1e6
+            )
+        )
+        workers *= 2
+
+
+if __name__ == '__main__':
+    for benchmark_function in [
+        benchmark_parallel_scaling
+    ]:
+        print("Running '{}'".format(benchmark_function.__name__))
+        sys.stdout.flush()
+        benchmark_function()
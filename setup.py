@@ -61,6 +61,11 @@ setup(
     packages=find_packages(exclude=['tests']),
     python_requires='>=2.7, !=3.0.*, !=3.1.*, !=3.2.*',
     install_requires=[],
+    entry_points={
+        'console_scripts': [
+            'basest-profile = basest.core.profiling:main',
+        ],
+    },
     package_data={
         '': ['README.md', 'LICENSE'],
     },
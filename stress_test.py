@@ -15,6 +15,7 @@ import random
 import sys
 
 from basest.core import best_ratio, decode_raw, encode_raw
+from basest.core.differential import fuzz
 
 
 def test_partial_input_with_larger_input_bases():
@@ -56,9 +57,29 @@ def test_partial_input_with_larger_input_bases():
                     assert decoded_data == input_data
 
 
+def test_engines_match_reference():
+    # every conversion engine must give exactly the same outcome as the
+    # reference engine, for random bases, ratios and lengths
+    mismatches = fuzz(iterations=5000, paths=[])
+    # report the simplest failing case for each engine
+    assert mismatches == [], mismatches
+
+
+def test_symbol_paths_match_reference():
+    # encode() and decode() must give exactly the same outcome with their
+    # lookup table shortcuts and with MemoizedEncoder as with none of them,
+    # for random symbol tables (building tables for every case is slow, so
+    # there are fewer of these)
+    mismatches = fuzz(iterations=500, engine_names=['reference'])
+    # report the simplest failing case for each symbol path
+    assert mismatches == [], mismatches
+
+
 if __name__ == '__main__':
     for test_function in [
-        test_partial_input_with_larger_input_bases
+        test_partial_input_with_larger_input_bases,
+        test_engines_match_reference,
+        test_symbol_paths_match_reference,
     ]:
         print("Running '{}'".format(test_function.__name__), end='...')
         sys.stdout.flush()
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+from array import array
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.core import decode_int_column, encode_int_column
+from basest.core.columns import UINT64_TYPECODE
+from basest.exceptions import (
+    InvalidInputError, InvalidInputLengthError, InvalidSymbolTableError
+)
+
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+
+base62_alphabet = [
+    s for s in
+    '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+]
+emoji_alphabet = ['🐶', '🐱', '🐭', '🐹']
+
+
+@ddt
+class TestIntColumns(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (62, base62_alphabet, 11),
+        (4, emoji_alphabet, 32),
+        (62, base62_alphabet, 12),
+    )
+    @unpack
+    def test_encode_decode_int_column(self, base, symbol_table, width):
+        """
+        A column of integers should encode to strings of exactly the given
+        width, which decode back to the same integers.
+        """
+        values = [0, 1, base - 1, base, 2 ** 64 - 1] + [
+            random.randrange(2 ** 64) for _ in range(100)
+        ]
+        output_data = encode_int_column(values, base, symbol_table, width)
+
+        self.assertEqual(output_data[0], symbol_table[0] * width)
+        self.assertEqual(
+            output_data[2], symbol_table[0] * (width - 1) + symbol_table[-1]
+        )
+        self.assertEqual(
+            decode_int_column(output_data, base, symbol_table, width),
+            array(UINT64_TYPECODE, values)
+        )
+
+    def test_decode_int_column_symbol_sequences(self):
+        """
+        Encoded values can be given as sequences of symbols rather than
+        strings.
+        """
+        self.assertEqual(
+            decode_int_column(
+                [['🐱', '🐶', '🐹'], ['🐹', '🐹', '🐹']], 4, emoji_alphabet, 3
+            ),
+            array(UINT64_TYPECODE, [19, 63])
+        )
+
+    @data(
+        ([62 ** 4], 62, base62_alphabet, 4),
+        ([-1], 62, base62_alphabet, 4),
+        ([2 ** 64], 62, base62_alphabet, 12),
+        ([2 ** 64 + 1], 2, ['0', '1'], 65),
+    )
+    @unpack
+    def test_encode_int_column_value_out_of_range(
+        self, values, base, symbol_table, width
+    ):
+        """
+        Values which can't be represented in the given width, or which aren't
+        unsigned 64-bit integers (even if the width has room for them), should
+        raise InvalidInputError.
+        """
+        with self.assertRaises(InvalidInputError):
+            encode_int_column(values, base, symbol_table, width)
+
+    @data(
+        (['00000000001', 'LygHa16AHYF'], 62, base62_alphabet, 11),
+        (['0000000001', 'zzzzzzzzzz'], 62, base62_alphabet, 10),
+        ([['🐱', '🐶', '🐹'], ['🐹', '🐹', '🐹']], 4, emoji_alphabet, 3),
+    )
+    @unpack
+    def test_decode_int_column_without_typecode(
+        self, input_data, base, symbol_table, width
+    ):
+        """
+        Without an array typecode for unsigned 64-bit integers, the decoded
+        values should be returned as a list.
+        """
+        expected = list(
+            decode_int_column(input_data, base, symbol_table, width)
+        )
+
+        with patch('basest.core.columns.UINT64_TYPECODE', None):
+            output_data = decode_int_column(
+                input_data, base, symbol_table, width
+            )
+
+        self.assertEqual(output_data, expected)
+        self.assertIsInstance(output_data, list)
+
+    @data(
+        (['0000', '00?0'], 62, base62_alphabet, 4, InvalidInputError),
+        (['🐶🐱', '🐶?'], 4, emoji_alphabet, 2, InvalidInputError),
+        (['00', '0000'], 62, base62_alphabet, 4, InvalidInputLengthError),
+        (['zzzzzzzzzzzz'], 62, base62_alphabet, 12, InvalidInputError),
+        (['🐶🐱'], 4, ['🐶', '🐶'], 2, InvalidSymbolTableError),
+    )
+    @unpack
+    def test_decode_int_column_invalid_input(
+        self, input_data, base, symbol_table, width, exception
+    ):
+        """
+        Invalid symbols, encoded values of the wrong width, values too large
+        for 64 bits and invalid symbol tables should all be rejected.
+        """
+        with self.assertRaises(exception):
+            decode_int_column(input_data, base, symbol_table, width)
+
+
+@unittest.skipIf(numpy is None, 'NumPy is not installed')
+@ddt
+class TestIntColumnsNumpy(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (62, base62_alphabet, 11),
+        (4, emoji_alphabet, 32),
+        (62, base62_alphabet, 12),
+        (62, base62_alphabet, 10),
+    )
+    @unpack
+    def test_encode_int_column_vectorised(self, base, symbol_table, width):
+        """
+        NumPy arrays and arrays of UINT64_TYPECODE should be encoded to the
+        same strings as lists of integers are, and decode back to the same
+        values.
+        """
+        limit = min(2 ** 64, base ** width)
+        values = [0, limit - 1] + [
+            random.randrange(limit) for _ in range(100)
+        ]
+        expected = encode_int_column(values, base, symbol_table, width)
+
+        self.assertEqual(
+            encode_int_column(
+                numpy.array(values, dtype=numpy.uint64), base, symbol_table,
+                width
+            ),
+            expected
+        )
+        self.assertEqual(
+            encode_int_column(
+                array(UINT64_TYPECODE, values), base, symbol_table, width
+            ),
+            expected
+        )
+        self.assertEqual(
+            decode_int_column(expected, base, symbol_table, width),
+            array(UINT64_TYPECODE, values)
+        )
+
+    def test_encode_int_column_signed_array(self):
+        """
+        Signed NumPy arrays are accepted as long as they have no negative
+        values.
+        """
+        self.assertEqual(
+            encode_int_column(
+                numpy.array([1, 61], dtype=numpy.int32), 62, base62_alphabet, 2
+            ),
+            ['01', '0z']
+        )
+
+    @data(
+        (numpy.array([62 ** 4], dtype=numpy.uint64) if numpy else None),
+        (numpy.array([-1], dtype=numpy.int64) if numpy else None),
+    )
+    def test_encode_int_column_vectorised_out_of_range(self, values):
+        """
+        Values which can't be represented in the given width should raise
+        InvalidInputError.
+        """
+        with self.assertRaises(InvalidInputError):
+            encode_int_column(values, 62, base62_alphabet, 4)
+
+    @data(['00é0'], ['00?0'])
+    def test_decode_int_column_vectorised_invalid_symbol(self, input_data):
+        """
+        Symbols which aren't in the symbol table should raise
+        InvalidInputError.
+        """
+        with self.assertRaises(InvalidInputError):
+            decode_int_column(input_data, 62, base62_alphabet, 4)
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.core import engines, lookup
+from basest.core.differential import (
+    SYMBOL_PATHS, Case, Mismatch, SymbolCase, check_case, check_symbol_case,
+    fuzz, outcome, random_case, random_symbol_case, shrink, symbol_outcome
+)
+from basest.exceptions import (
+    ImproperUsageError, InvalidInputError, InvalidInputLengthError
+)
+
+
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+
+
+def broken_convert(
+    input_base, output_base, input_ratio, output_ratio, input_workon
+):
+    """
+    Converts chunks like the reference engine, except that it gets the
+    output wrong for any data containing the symbol 15.
+    """
+    output_data = engines._convert_by_reference(
+        input_base, output_base, input_ratio, output_ratio, input_workon
+    )
+    if 15 in input_workon:
+        output_data[0] ^= 1
+    return output_data
+
+
+@ddt
+class TestDifferential(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        engines.register_engine(
+            'broken', broken_convert, lambda *arguments: -100
+        )
+        self.addCleanup(engines.unregister_engine, 'broken')
+
+    def test_fuzz_engines_match(self):
+        """
+        Every built-in engine should match the reference engine.
+        """
+        self.assertEqual(
+            fuzz(
+                iterations=300, seed=0,
+                engine_names=['lookup', 'radix', 'reference'], paths=[]
+            ),
+            []
+        )
+
+    def test_fuzz_symbol_paths_match(self):
+        """
+        encode() and decode() should give the same outcome with their lookup
+        table shortcuts and with MemoizedEncoder as without any of them.
+        """
+        self.assertEqual(
+            fuzz(
+                iterations=200, seed=0, engine_names=['reference'],
+                max_base=32
+            ),
+            []
+        )
+
+    def test_fuzz_finds_minimal_mismatch(self):
+        """
+        A broken engine should be found, and reported with the simplest
+        input data that it gets wrong: a single 15, padded out to a whole
+        chunk with zeroes when decoding.
+        """
+        mismatches = fuzz(iterations=300, seed=0, paths=[])
+
+        self.assertEqual([m.engine for m in mismatches], ['broken'])
+        case = mismatches[0].case
+        self.assertEqual([s for s in case.input_data if s], [15])
+        self.assertEqual(
+            len(case.input_data),
+            1 if case.operation == 'encode' else case.input_ratio
+        )
+
+    @data(
+        # the simplest encoding case is a single symbol
+        (
+            Case('encode', 16, 2, 1, 4, [3, 15, 0, 15, 2]),
+            Case('encode', 16, 2, 1, 4, [15])
+        ),
+        # decoding cases need to be a whole chunk
+        (
+            Case('decode', 16, 256, 2, 1, [3, 15, 1, 2]),
+            Case('decode', 16, 256, 2, 1, [0, 15])
+        ),
+    )
+    @unpack
+    def test_shrink(self, case, minimal_case):
+        """
+        Shrinking a mismatch should find the simplest input data the engine
+        still gets wrong.
+        """
+        mismatch = check_case(case, ['broken'])[0]
+
+        self.assertEqual(shrink(mismatch).case, minimal_case)
+
+    @data(
+        (Case('encode', 16, 256, 2, 1, [1, 2, 3]), ImproperUsageError),
+        (Case('decode', 64, 256, 4, 3, [1, 2, 3]), InvalidInputLengthError),
+    )
+    @unpack
+    def test_outcome_exceptions(self, case, exception):
+        """
+        The outcome of cases which raise an exception should be the type of
+        the exception, so that engines raising the same one match.
+        """
+        self.assertIs(outcome(case, 'reference'), exception)
+        self.assertEqual(check_case(case), [])
+
+    def test_check_case(self):
+        """
+        Engines which don't support a case shouldn't be checked.
+        """
+        case = Case('encode', 256, 85, 4, 5, [15, 15, 15, 15])
+
+        self.assertEqual(
+            check_case(case),
+            [
+                Mismatch(
+                    'broken', case, [4, 71, 33, 15, 60], [5, 71, 33, 15, 60]
+                )
+            ]
+        )
+
+    def test_random_case(self):
+        """
+        Random cases should include encoding and decoding, including some
+        which can't be decoded.
+        """
+        generator = random.Random(0)
+
+        cases = [random_case(generator, max_base=16) for _ in range(200)]
+
+        self.assertEqual(
+            set(c.operation for c in cases), set(['encode', 'decode'])
+        )
+        self.assertTrue(all(c.input_base <= 16 for c in cases))
+        self.assertIn(
+            InvalidInputLengthError,
+            [outcome(c, 'reference') for c in cases]
+        )
+
+    @data(
+        (
+            SymbolCase(
+                'encode', 256, [chr(c) for c in range(256)], 64,
+                base64_alphabet, '=', 3, 4, list('cabbages')
+            ),
+            list('Y2FiYmFnZXM=')
+        ),
+        (
+            SymbolCase(
+                'decode', 64, base64_alphabet, 256,
+                [chr(c) for c in range(256)], '=', 4, 3, 'Y2FiYmFnZXM='
+            ),
+            list('cabbages')
+        ),
+        (
+            SymbolCase(
+                'decode', 85, [chr(c) for c in range(33, 118)], 256,
+                [chr(c) for c in range(256)], '~', 5, 4, '@prhU@:s-~'
+            ),
+            list('cabbage')
+        ),
+        (
+            SymbolCase(
+                'decode', 64, base64_alphabet, 256,
+                [chr(c) for c in range(256)], '=', 4, 3, 'Y2Fi!mFnZXM='
+            ),
+            InvalidInputError
+        ),
+    )
+    @unpack
+    def test_symbol_paths_match(self, case, expected):
+        """
+        Every symbol path should give the same outcome as encode() or
+        decode(), and leave the cached tables and forced engine as they were.
+        """
+        tables = dict(lookup._tables)
+
+        for path in SYMBOL_PATHS:
+            self.assertEqual(symbol_outcome(case, path), expected)
+        self.assertEqual(check_symbol_case(case), [])
+        self.assertEqual(lookup._tables, tables)
+        self.assertIsNone(engines._forced)
+
+    @data(
+        ('basest.core.lookup.decode_symbol_groups', ['decode']),
+        ('basest.core.lookup.convert_chunks', ['decode', 'encode']),
+    )
+    @unpack
+    def test_fuzz_finds_minimal_symbol_mismatch(self, target, operations):
+        """
+        A broken lookup table shortcut should be found when its tables are
+        built beforehand, and reported with the one or two chunks of input
+        data needed for reversing the output to change it.
+        """
+        function = getattr(lookup, target.rsplit('.', 1)[1])
+
+        def reversed_output(*arguments):
+            return function(*arguments)[::-1]
+
+        with patch(target, side_effect=reversed_output):
+            mismatches = fuzz(
+                iterations=300, seed=0, engine_names=['reference'],
+                max_base=16, paths=['tables']
+            )
+
+        self.assertEqual([m.engine for m in mismatches], ['tables'])
+        case = mismatches[0].case
+        self.assertIn(case.operation, operations)
+        self.assertIn(
+            len(case.input_data), [case.input_ratio, 2 * case.input_ratio]
+        )
+
+    def test_random_symbol_case(self):
+        """
+        Random symbol-level cases should include encoding lists of symbols
+        and decoding strings, including some with invalid symbols.
+        """
+        generator = random.Random(0)
+
+        cases = [
+            random_symbol_case(generator, max_base=16) for _ in range(200)
+        ]
+
+        self.assertEqual(
+            set(c.operation for c in cases), set(['encode', 'decode'])
+        )
+        for case in cases:
+            self.assertTrue(case.input_base <= 16)
+            self.assertEqual(
+                type(case.input_data),
+                list if case.operation == 'encode' else type('')
+            )
+            self.assertNotIn(
+                case.padding_symbol,
+                case.output_symbol_table if case.operation == 'encode'
+                else case.input_symbol_table
+            )
+        self.assertIn(
+            InvalidInputError,
+            [symbol_outcome(c, 'reference') for c in cases]
+        )
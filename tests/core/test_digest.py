@@ -0,0 +1,319 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import hashlib
+import os
+import unittest
+import zlib
+
+from ddt import data, ddt, unpack
+
+from basest.core import Checksum, decode, decode_digest, encode, encode_digest
+from basest.exceptions import (
+    ImproperUsageError, InvalidInputError, InvalidInputLengthError
+)
+
+
+byte_table = [chr(c) for c in range(256)]
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+base85_alphabet = [chr(c) for c in range(33, 118)]
+
+
+@ddt
+class TestChecksum(unittest.TestCase):
+    maxDiff = None
+
+    @data(zlib.crc32, zlib.adler32)
+    def test_checksum_matches_function(self, function):
+        """
+        A Checksum updated a piece at a time should have the same value as the
+        checksum function gives for all of the data at once.
+        """
+        input_data = os.urandom(1000)
+        checksum = Checksum(function)
+
+        for i in range(0, len(input_data), 333):
+            checksum.update(input_data[i:i + 333])
+
+        self.assertEqual(
+            checksum.value, function(input_data) & 0xffffffff
+        )
+
+    @data(zlib.crc32, zlib.adler32)
+    def test_checksum_of_bytearray(self, function):
+        """
+        A Checksum should accept bytearrays as well as bytes.
+        """
+        checksum = Checksum(function)
+
+        checksum.update(bytearray(b'cabbages'))
+
+        self.assertEqual(
+            checksum.value, function(b'cabbages') & 0xffffffff
+        )
+
+    def test_checksum_digests(self):
+        """
+        The digest of a Checksum should be its value as four big-endian bytes,
+        or eight hexadecimal digits.
+        """
+        checksum = Checksum()
+        checksum.update(b'cabbages')
+
+        self.assertEqual(checksum.value, 0xafcd47bb)
+        self.assertEqual(checksum.digest(), b'\xaf\xcd\x47\xbb')
+        self.assertEqual(checksum.hexdigest(), 'afcd47bb')
+
+    def test_checksum_starting_value(self):
+        """
+        A Checksum of no data should have the starting value of its function.
+        """
+        self.assertEqual(Checksum().value, 0)
+        self.assertEqual(Checksum(zlib.adler32).value, 1)
+
+
+@ddt
+class TestEncodeDecodeDigest(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (64, base64_alphabet, '=', 3, 4, 0),
+        (64, base64_alphabet, '=', 3, 4, 1000),
+        (85, base85_alphabet, '~', 4, 5, 999),
+    )
+    @unpack
+    def test_encode_decode_digest(
+        self, output_base, output_symbol_table, padding, input_ratio,
+        output_ratio, length
+    ):
+        """
+        Encoding and decoding with a digest should give the same output as
+        encode() and decode(), with the digest of the raw data.
+        """
+        raw_data = os.urandom(length)
+        input_data = [chr(b) for b in bytearray(raw_data)]
+        expected = encode(
+            256, byte_table, output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, input_data
+        )
+
+        encoded_data, encoded_digest = encode_digest(
+            256, byte_table, output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, input_data, hashlib.sha256()
+        )
+        decoded_data, decoded_digest = decode_digest(
+            output_base, output_symbol_table, padding, 256, byte_table,
+            output_ratio, input_ratio, encoded_data, Checksum()
+        )
+
+        self.assertEqual(encoded_data, expected)
+        self.assertEqual(encoded_digest, hashlib.sha256(raw_data).digest())
+        self.assertEqual(
+            decoded_data,
+            decode(
+                output_base, output_symbol_table, padding, 256, byte_table,
+                output_ratio, input_ratio, expected
+            )
+        )
+        self.assertEqual(decoded_data, input_data)
+        checksum = Checksum()
+        checksum.update(raw_data)
+        self.assertEqual(decoded_digest, checksum.digest())
+
+    def test_encode_digest_of_bytes(self):
+        """
+        Input which is already bytes should be added to the digest as it is.
+        """
+        output_data, digest = encode_digest(
+            256, list(range(256)), 64, base64_alphabet, '=', 3, 4,
+            b'cabbages', hashlib.md5()
+        )
+
+        self.assertEqual(''.join(output_data), 'Y2FiYmFnZXM=')
+        self.assertEqual(digest, hashlib.md5(b'cabbages').digest())
+
+    def test_digest_requires_byte_data(self):
+        """
+        Digests can't be taken of raw data which isn't in base 256.
+        """
+        hex_table = list('0123456789abcdef')
+
+        with self.assertRaises(ImproperUsageError):
+            encode_digest(
+                16, hex_table, 4, list('ACGT'), '-', 1, 2, 'cab', Checksum()
+            )
+        with self.assertRaises(ImproperUsageError):
+            decode_digest(
+                4, list('ACGT'), '-', 16, hex_table, 2, 1, 'TAGC', Checksum()
+            )
+
+    def test_invalid_input_not_added_to_digest(self):
+        """
+        If the input can't be encoded, the digest should be left alone.
+        """
+        checksum = Checksum()
+
+        with self.assertRaises(InvalidInputError):
+            encode_digest(
+                256, byte_table, 64, base64_alphabet, '=', 3, 4,
+                ['a', 'b', 'cabbage'], checksum
+            )
+        self.assertEqual(checksum.value, 0)
+
+    @data(
+        (64, base64_alphabet, '=', 3, 4),
+        (85, base85_alphabet, '~', 4, 5),
+    )
+    @unpack
+    def test_encode_decode_digest_many_blocks(
+        self, output_base, output_symbol_table, padding, input_ratio,
+        output_ratio
+    ):
+        """
+        Data long enough to be converted a block at a time should give the
+        same output and digest as if it were converted all at once.
+        """
+        raw_data = os.urandom(65536 * input_ratio * 2 + 1)
+        expected = encode(
+            256, list(range(256)), output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, bytearray(raw_data)
+        )
+
+        encoded_data, encoded_digest = encode_digest(
+            256, list(range(256)), output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, raw_data, hashlib.sha256()
+        )
+        decoded_data, decoded_digest = decode_digest(
+            output_base, output_symbol_table, padding, 256, list(range(256)),
+            output_ratio, input_ratio, encoded_data, hashlib.sha256()
+        )
+
+        self.assertEqual(encoded_data, expected)
+        self.assertEqual(decoded_data, list(bytearray(raw_data)))
+        self.assertEqual(encoded_digest, hashlib.sha256(raw_data).digest())
+        self.assertEqual(decoded_digest, hashlib.sha256(raw_data).digest())
+
+    def test_encode_digest_of_iterator(self):
+        """
+        Input which can only be read once should be both encoded and added to
+        the digest.
+        """
+        output_data, digest = encode_digest(
+            256, byte_table, 64, base64_alphabet, '=', 3, 4,
+            iter('cabbages'), hashlib.md5()
+        )
+
+        self.assertEqual(''.join(output_data), 'Y2FiYmFnZXM=')
+        self.assertEqual(digest, hashlib.md5(b'cabbages').digest())
+
+    def test_encode_decode_digest_shortcuts(self):
+        """
+        Shortcut chunks should be added to the digest in their place in the
+        raw data.
+        """
+        shortcuts = {('\x00',) * 4: 'z'}
+        input_data = [chr(b) for b in bytearray(b'cabb\x00\x00\x00\x00ages')]
+
+        encoded_data, encoded_digest = encode_digest(
+            256, byte_table, 85, base85_alphabet, '~', 4, 5, input_data,
+            Checksum(), shortcuts=shortcuts
+        )
+        decoded_data, decoded_digest = decode_digest(
+            85, base85_alphabet, '~', 256, byte_table, 5, 4,
+            ''.join(encoded_data), Checksum(), shortcuts=shortcuts
+        )
+
+        self.assertEqual(
+            encoded_data,
+            encode(
+                256, byte_table, 85, base85_alphabet, '~', 4, 5, input_data,
+                shortcuts=shortcuts
+            )
+        )
+        self.assertIn('z', encoded_data)
+        self.assertEqual(decoded_data, input_data)
+        checksum = Checksum()
+        checksum.update(b'cabb\x00\x00\x00\x00ages')
+        self.assertEqual(encoded_digest, checksum.digest())
+        self.assertEqual(decoded_digest, checksum.digest())
+
+    def test_decode_digest_ignore(self):
+        """
+        Ignored symbols should be removed before decoding, so they aren't
+        part of the digest.
+        """
+        output_data, digest = decode_digest(
+            64, base64_alphabet, '=', 256, byte_table, 4, 3,
+            'Y2Fi\nYmFn\nZXM=\n', hashlib.md5(), ignore='\n'
+        )
+
+        self.assertEqual(''.join(output_data), 'cabbages')
+        self.assertEqual(digest, hashlib.md5(b'cabbages').digest())
+
+    @data(
+        ['a', 'b', 'cabbage'],
+        [0, 1, 256],
+    )
+    def test_invalid_encode_input_not_added_to_digest(self, input_data):
+        """
+        If any of the input isn't in the input symbol table, none of it should
+        be added to the digest.
+        """
+        checksum = Checksum()
+        symbol_table = (
+            list(range(256)) if isinstance(input_data[0], int) else byte_table
+        )
+
+        with self.assertRaises(InvalidInputError):
+            encode_digest(
+                256, symbol_table, 64, base64_alphabet, '=', 3, 4,
+                input_data, checksum
+            )
+        self.assertEqual(checksum.value, 0)
+
+    def test_unpaddable_input_not_added_to_digest(self):
+        """
+        If the input can't be padded to a whole number of chunks, none of it
+        should be added to the digest.
+        """
+        checksum = Checksum()
+
+        with self.assertRaises(ImproperUsageError):
+            encode_digest(
+                256, list(range(256)), 65536, list(range(65536)), -1, 2, 1,
+                os.urandom(65536 * 2 + 1), checksum
+            )
+        self.assertEqual(checksum.value, 0)
+
+    @data(
+        ('Y2FiYmFnZXM', InvalidInputLengthError),
+        ('Y2Fi!mFnZXM=', InvalidInputError),
+    )
+    @unpack
+    def test_invalid_decode_input_not_added_to_digest(
+        self, input_data, error
+    ):
+        """
+        If the input can't be decoded, none of the output should be added to
+        the digest.
+        """
+        checksum = Checksum()
+
+        with self.assertRaises(error):
+            decode_digest(
+                64, base64_alphabet, '=', 256, byte_table, 4, 3, input_data,
+                checksum
+            )
+        self.assertEqual(checksum.value, 0)
@@ -393,6 +393,78 @@ class TestEncodeDecode(unittest.TestCase):
                 input_symbols
             )
 
+    @data(
+        ('Y2Fi\nYmFn\r\nZXM=\n', '\r\n'),
+        (' Y 2 F i Y m F n Z X M = ', ' '),
+        (['Y', '2', 'F', 'i', '\n', 'Y', 'm', 'F', 'n', 'ZX', 'Z', 'X', 'M',
+          '='], ['\n', 'ZX']),
+    )
+    @unpack
+    def test_decode_ignore(self, input_data, ignore):
+        """
+        Symbols to ignore should be removed from the input data before it is
+        decoded, whether it is a string or a list of symbols.
+        """
+        self.assertEqual(
+            decode(
+                64, base64_alphabet, '=', 256, [chr(b) for b in range(256)],
+                4, 3, input_data, ignore=ignore
+            ),
+            [s for s in 'cabbages']
+        )
+
+    def test_decode_rejects_ignoring_symbols_in_symbol_table(self):
+        """
+        Symbols in the input symbol table (or the padding symbol) can't be
+        ignored, so InvalidSymbolTableError should be raised.
+        """
+        for ignore in ('\nA', '='):
+            with self.assertRaises(InvalidSymbolTableError):
+                decode(
+                    64, base64_alphabet, '=',
+                    256, [chr(b) for b in range(256)],
+                    4, 3, 'Y2FiYmFnZXM=', ignore=ignore
+                )
+
+    @data(['\r\n'], [' ', '\t\t'], [10])
+    def test_decode_rejects_ignoring_long_symbols_in_strings(self, ignore):
+        """
+        Only single characters can be ignored when the input data is a
+        string, so InvalidSymbolTableError should be raised for anything else.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            decode(
+                64, base64_alphabet, '=', 256, [chr(b) for b in range(256)],
+                4, 3, 'Y2FiYmFnZXM=', ignore=ignore
+            )
+
+    @data(
+        ('Y2Fi YmFnZXM=', None, 4),
+        ('Y2FiYmFnZXM=\n', None, 12),
+        ('!', None, 0),
+        # offsets are in the input as given, not once symbols are ignored
+        ('Y2Fi\n\n\nYm!nZXM=', '\n', 9),
+        ('\r\nY2Fi\r\nYmFnZXM=!', '\r\n', 16),
+    )
+    @unpack
+    def test_decode_gives_offset_of_invalid_symbol(
+        self, input_data, ignore, offset
+    ):
+        """
+        Strings containing symbols not found in the input symbol table (or
+        ignored) should be rejected before decoding, giving the offset of the
+        first one.
+        """
+        with self.assertRaises(InvalidInputError) as context:
+            decode(
+                64, base64_alphabet, '=', 256, [chr(b) for b in range(256)],
+                4, 3, input_data, ignore=ignore
+            )
+
+        self.assertTrue(
+            str(context.exception).endswith('at offset {0}'.format(offset))
+        )
+
     @data(
         # Base-64, using most common alphabet with no padding needed
         (
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode, decode_many, encode, encode_many
+from basest.exceptions import (
+    ImproperUsageError, InvalidInputError, InvalidInputLengthError,
+    InvalidSymbolTableError
+)
+
+
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+base85_alphabet = [chr(c) for c in range(33, 118)]
+byte_table = [chr(b) for b in range(256)]
+
+
+@ddt
+class TestEncodeDecodeMany(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (256, byte_table, 64, base64_alphabet, '=', 3, 4),
+        (256, byte_table, 85, base85_alphabet, '~', 4, 5),
+        (256, byte_table, 16, list('0123456789abcdef'), '=', 1, 2),
+    )
+    @unpack
+    def test_encode_decode_many(
+        self,
+        input_base, input_symbol_table,
+        output_base, output_symbol_table, padding_symbol,
+        input_ratio, output_ratio
+    ):
+        """
+        encode_many() and decode_many() should give exactly the same results
+        as calling encode() and decode() on each input separately, including
+        for empty inputs and inputs needing padding.
+        """
+        inputs = [[]] + [
+            [random.choice(input_symbol_table) for _ in range(length)]
+            for length in range(1, 70)
+        ]
+        expected = [
+            encode(
+                input_base, input_symbol_table,
+                output_base, output_symbol_table, padding_symbol,
+                input_ratio, output_ratio, input_data
+            )
+            for input_data in inputs
+        ]
+
+        outputs = encode_many(
+            input_base, input_symbol_table,
+            output_base, output_symbol_table, padding_symbol,
+            input_ratio, output_ratio, inputs
+        )
+
+        self.assertEqual(outputs, expected)
+        self.assertEqual(
+            decode_many(
+                output_base, output_symbol_table, padding_symbol,
+                input_base, input_symbol_table,
+                output_ratio, input_ratio, outputs
+            ),
+            [
+                decode(
+                    output_base, output_symbol_table, padding_symbol,
+                    input_base, input_symbol_table,
+                    output_ratio, input_ratio, output_data
+                )
+                for output_data in outputs
+            ]
+        )
+        self.assertEqual(
+            decode_many(
+                output_base, output_symbol_table, padding_symbol,
+                input_base, input_symbol_table,
+                output_ratio, input_ratio, outputs
+            ),
+            inputs
+        )
+
+    def test_encode_many_no_inputs(self):
+        """
+        An empty batch should give an empty list of results.
+        """
+        self.assertEqual(
+            encode_many(256, byte_table, 64, base64_alphabet, '=', 3, 4, []),
+            []
+        )
+
+    @data(
+        (['ab', 'cĀ'], InvalidInputError),
+        (['ab', 'c'], ImproperUsageError),
+    )
+    @unpack
+    def test_encode_many_invalid_inputs(self, inputs, exception):
+        """
+        Any invalid input in the batch should fail the whole batch, in the same
+        way that encode() fails.
+        """
+        with self.assertRaises(exception):
+            encode_many(
+                16, list('abcdefghijklmnop'), 256, byte_table, '==', 2, 1,
+                inputs
+            )
+
+    @data(
+        (['YWJj', 'YW?j'], InvalidInputError),
+        (['YWJj', 'YWJ'], InvalidInputLengthError),
+    )
+    @unpack
+    def test_decode_many_invalid_inputs(self, inputs, exception):
+        """
+        Any invalid input in the batch should fail the whole batch, in the same
+        way that decode() fails.
+        """
+        with self.assertRaises(exception):
+            decode_many(
+                64, base64_alphabet, '=', 256, byte_table, 4, 3, inputs
+            )
+
+    def test_decode_many_invalid_symbol_tables(self):
+        """
+        Invalid symbol tables should raise InvalidSymbolTableError.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            decode_many(64, base64_alphabet, 'A', 256, byte_table, 4, 3, [])
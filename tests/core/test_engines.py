@@ -0,0 +1,187 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode, decode_raw, encode, encode_raw, engines
+from basest.exceptions import ImproperUsageError
+
+
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+
+
+@ddt
+class TestEngines(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        # record every conversion made by a spy engine
+        self.calls = []
+
+        def convert(*arguments):
+            self.calls.append(arguments[:4])
+            return engines._convert_by_reference(*arguments)
+
+        engines.register_engine('spy', convert, lambda *arguments: -100)
+        self.addCleanup(engines.unregister_engine, 'spy')
+        self.addCleanup(engines.force_engine, None)
+
+    @data(
+        (256, 64, 3, 4),
+        (256, 85, 4, 5),
+        (256, 2, 1, 8),
+        (200, 7, 5, 14),
+        (16, 256, 2, 1),
+    )
+    @unpack
+    def test_forced_engines(
+        self, input_base, output_base, input_ratio, output_ratio
+    ):
+        """
+        Every engine should give the same output for any data it supports.
+        """
+        input_data = [
+            random.randrange(input_base)
+            for _ in range(input_ratio * 50 + input_ratio - 1)
+        ]
+        if input_base < output_base:
+            del input_data[-(input_ratio - 1):]
+        encoded_data = encode_raw(
+            input_base, output_base, input_ratio, output_ratio, input_data
+        )
+
+        for name in engines.engine_names():
+            if name == 'lookup' and engines.lookup.chunk_space(
+                input_base, input_ratio
+            ) is None:
+                continue
+            self.assertEqual(
+                encode_raw(
+                    input_base, output_base, input_ratio, output_ratio,
+                    input_data, engine=name
+                ),
+                encoded_data
+            )
+        for name in ('radix', 'reference', 'spy'):
+            self.assertEqual(
+                decode_raw(
+                    output_base, input_base, output_ratio, input_ratio,
+                    encoded_data, engine=name
+                ),
+                input_data
+            )
+
+    def test_automatic_dispatch(self):
+        """
+        Engines should be chosen by priority, skipping disabled engines and
+        engines which don't support the conversion.
+        """
+        encode_raw(256, 64, 3, 4, [1, 2, 3])
+
+        engines.disable_engine('reference')
+        engines.disable_engine('radix')
+        try:
+            # lookup tables aren't worthwhile for so little data, but still
+            # come before the spy
+            encode_raw(16, 2, 1, 4, [1, 2])
+            engines.disable_engine('lookup')
+            try:
+                encode_raw(256, 85, 4, 5, [1, 2, 3, 4])
+            finally:
+                engines.enable_engine('lookup')
+        finally:
+            engines.enable_engine('reference')
+            engines.enable_engine('radix')
+
+        self.assertEqual(self.calls, [(256, 85, 4, 5)])
+
+    def test_force_engine(self):
+        """
+        A forced engine should be used for everything, including the symbol
+        lookups done by encode() and decode().
+        """
+        engines.force_engine('spy')
+
+        encoded_data = encode(
+            256, [chr(c) for c in range(256)], 64, base64_alphabet, '=', 3, 4,
+            'cabbages' * 1000
+        )
+        decoded_data = decode(
+            64, base64_alphabet, '=', 256, [chr(c) for c in range(256)], 4, 3,
+            ''.join(encoded_data)
+        )
+
+        self.assertEqual(''.join(decoded_data), 'cabbages' * 1000)
+        self.assertEqual(self.calls, [(256, 64, 3, 4), (64, 256, 4, 3)])
+
+    def test_register_engine(self):
+        """
+        Engines with a higher priority should be preferred, and may decline to
+        convert data by returning None.
+        """
+        engines.register_engine(
+            'decline', lambda *arguments: None, lambda *arguments: 1000
+        )
+        self.addCleanup(engines.unregister_engine, 'decline')
+
+        self.assertEqual(
+            encode_raw(16, 2, 1, 4, [1, 15]), [0, 0, 0, 1, 1, 1, 1, 1]
+        )
+        self.assertEqual(
+            engines.engine_names(),
+            ('lookup', 'radix', 'reference', 'spy', 'decline')
+        )
+        self.assertEqual(self.calls, [])
+
+    @data(
+        # lookup tables can't be built for such large chunks
+        ((256, 85, 4, 5, [1, 2, 3, 4]), 'lookup'),
+        # lookup tables can't look up values outside the input base
+        ((16, 256, 2, 1, [16, 1]), 'lookup'),
+    )
+    @unpack
+    def test_forced_engine_unsupported(self, arguments, name):
+        """
+        Forcing an engine which can't convert the data should raise
+        ImproperUsageError.
+        """
+        with self.assertRaises(ImproperUsageError):
+            engines.convert_chunks(*arguments, engine=name)
+
+    def test_no_engines(self):
+        """
+        If every engine is disabled, there is nothing to convert the data
+        with.
+        """
+        for name in engines.engine_names():
+            engines.disable_engine(name)
+            self.addCleanup(engines.enable_engine, name)
+
+        with self.assertRaises(ImproperUsageError):
+            encode_raw(256, 64, 3, 4, [1, 2, 3])
+
+    @data(
+        engines.force_engine, engines.disable_engine,
+        engines.unregister_engine,
+    )
+    def test_unknown_engine(self, function):
+        """
+        Unknown engine names should be rejected.
+        """
+        with self.assertRaises(ValueError):
+            function('turbo')
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import (
+    Counters, add_hook, decode, decode_many, decode_raw, encode, encode_raw,
+    remove_hook
+)
+from basest.core.instrumentation import instrumented
+from basest.encoders import Encoder
+
+
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+
+
+class Base64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = base64_alphabet
+    padding_symbol = '='
+
+
+@ddt
+class TestInstrumentation(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.events = []
+        add_hook(self.events.append)
+
+    def tearDown(self):
+        remove_hook(self.events.append)
+
+    @data(
+        (
+            encode_raw, 'encode_raw',
+            (256, 64, 3, 4, [1, 2, 3, 4, 5, 6, 7]), 7, 12, 2
+        ),
+        (
+            decode_raw, 'decode_raw',
+            (64, 256, 4, 3, [0, 16, 8, 3, 1, 0, 20, 6, 1, 48, 64, 64]),
+            12, 7, 2
+        ),
+        (
+            encode, 'encode',
+            (
+                256, [chr(c) for c in range(256)], 64, base64_alphabet, '=',
+                3, 4, 'belfast'
+            ),
+            7, 12, 2
+        ),
+        (
+            decode, 'decode',
+            (
+                64, base64_alphabet, '=', 256, [chr(c) for c in range(256)],
+                4, 3, 'YmVsZmFzdA=='
+            ),
+            12, 7, 2
+        )
+    )
+    @unpack
+    def test_core_functions_report_one_event(
+        self, function, operation, args, symbols_in, symbols_out, padding
+    ):
+        """
+        Each call to a core function should report exactly one event to the
+        registered hooks, describing the operation, even when the function
+        calls other instrumented functions to do its work.
+        """
+        function(*args)
+
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.operation, operation)
+        self.assertIsNone(event.codec)
+        self.assertEqual(event.symbols_in, symbols_in)
+        self.assertEqual(event.symbols_out, symbols_out)
+        self.assertEqual(event.padding, padding)
+        self.assertGreater(event.allocated_bytes, 0)
+        self.assertGreaterEqual(event.elapsed, 0)
+
+    @data(
+        ('encode', 'cabbages', 8, 12, 1),
+        ('decode', 'Y2FiYmFnZXM=', 12, 8, 1),
+        ('encode_raw', [99, 97, 98], 3, 4, 0),
+        ('decode_raw', [24, 54, 5, 34], 4, 3, 0)
+    )
+    @unpack
+    def test_encoder_methods_report_codec(
+        self, method, input_data, symbols_in, symbols_out, padding
+    ):
+        """
+        Calls to Encoder methods should be reported once, tagged with the name
+        of the Encoder subclass used.
+        """
+        getattr(Base64Encoder(), method)(input_data)
+
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.operation, method)
+        self.assertEqual(event.codec, 'Base64Encoder')
+        self.assertEqual(event.symbols_in, symbols_in)
+        self.assertEqual(event.symbols_out, symbols_out)
+        self.assertEqual(event.padding, padding)
+
+    def test_batch_calls_report_totals(self):
+        """
+        Batch calls should be reported as one event, with the totals of all
+        the messages in the batch.
+        """
+        Base64Encoder().encode_many(['belfast', 'cabbages', 'fish'])
+
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.operation, 'encode_many')
+        self.assertEqual(event.codec, 'Base64Encoder')
+        self.assertEqual(event.symbols_in, 19)
+        self.assertEqual(event.symbols_out, 32)
+        self.assertEqual(event.padding, 5)
+
+    @data(
+        (encode_raw, (256, 64, 3, 4, iter([1, 2, 3, 4, 5, 6, 7])), 7, 12, 2),
+        (
+            decode_raw,
+            (64, 256, 4, 3, iter([0, 16, 8, 3, 1, 0, 20, 6, 1, 48, 64, 64])),
+            12, 7, 2
+        ),
+        (
+            decode,
+            (
+                64, base64_alphabet, '=', 256, [chr(c) for c in range(256)],
+                4, 3, 'Y2Fi\n\n\nYmFn\nZXM=\n', '\n'
+            ),
+            12, 8, 1
+        ),
+        (
+            decode,
+            (
+                64, base64_alphabet, '=', 256, [chr(c) for c in range(256)],
+                4, 3, 'Y2FiYmFnZXM=', None, {('\0',) * 3: '!'}
+            ),
+            12, 8, 1
+        ),
+        (
+            encode,
+            (
+                256, [chr(c) for c in range(256)], 64, base64_alphabet, '=',
+                3, 4, 'cabbages', {('\0',) * 3: '!'}
+            ),
+            8, 12, 1
+        ),
+        (
+            decode,
+            (
+                4, ['AA', 'CC', 'GG', 'TT'], '-', 16,
+                list('0123456789abcdef'), 2, 1, 'AACCGGTT'
+            ),
+            4, 2, 0
+        ),
+        (
+            decode_many,
+            (
+                64, base64_alphabet, '=', 256, [chr(c) for c in range(256)],
+                4, 3, ['Y2FiYmFnZXM=', 'ZmlzaA==']
+            ),
+            20, 12, 3
+        ),
+    )
+    @unpack
+    def test_input_measured_as_converted(
+        self, function, args, symbols_in, symbols_out, padding
+    ):
+        """
+        The input should be measured as it is converted, so that iterators
+        can be measured and ignored symbols and multi-character symbols are
+        not counted as input symbols.
+        """
+        function(*args)
+
+        self.assertEqual(len(self.events), 1)
+        event = self.events[0]
+        self.assertEqual(event.symbols_in, symbols_in)
+        self.assertEqual(event.symbols_out, symbols_out)
+        self.assertEqual(event.padding, padding)
+
+    def test_unrecorded_input_measured_by_length(self):
+        """
+        Operations which don't record their input should be measured by the
+        length of the input data they were given.
+        """
+        @instrumented('encode_raw')
+        def copy(input_ratio, output_ratio, input_data):
+            return list(input_data)
+
+        copy(1, 1, [1, 2, 3])
+
+        self.assertEqual(self.events[0].symbols_in, 3)
+
+    def test_failed_calls_are_not_reported(self):
+        """
+        Calls which raise an exception should not be reported, and should not
+        stop later calls from being reported.
+        """
+        with self.assertRaises(ValueError):
+            decode_raw(64, 256, 4, 3, [0, 16, 8])
+        encode_raw(256, 64, 3, 4, [1, 2, 3])
+
+        self.assertEqual(
+            [event.operation for event in self.events], ['encode_raw']
+        )
+
+    def test_removed_hooks_are_not_called(self):
+        """
+        Once a hook has been removed, it should not receive any more events.
+        """
+        remove_hook(self.events.append)
+        encode_raw(256, 64, 3, 4, [1, 2, 3])
+        add_hook(self.events.append)
+
+        self.assertEqual(self.events, [])
+
+    def test_remove_unregistered_hook(self):
+        """
+        Removing a hook which was never added should raise ValueError.
+        """
+        with self.assertRaises(ValueError):
+            remove_hook(len)
+
+    def test_counters(self):
+        """
+        Counters should accumulate the totals of all events it receives, keyed
+        by operation and codec, until it is reset.
+        """
+        counters = Counters()
+        add_hook(counters)
+        try:
+            encode_raw(256, 64, 3, 4, [1, 2, 3, 4])
+            encode_raw(256, 64, 3, 4, [1, 2, 3])
+            Base64Encoder().encode('fish')
+        finally:
+            remove_hook(counters)
+
+        totals = counters.snapshot()
+        self.assertEqual(
+            set(totals), {('encode_raw', None), ('encode', 'Base64Encoder')}
+        )
+        raw_totals = totals[('encode_raw', None)]
+        self.assertEqual(raw_totals['calls'], 2)
+        self.assertEqual(raw_totals['symbols_in'], 7)
+        self.assertEqual(raw_totals['symbols_out'], 12)
+        self.assertEqual(raw_totals['padding'], 2)
+        self.assertGreater(raw_totals['allocated_bytes'], 0)
+        self.assertGreaterEqual(raw_totals['elapsed'], 0)
+        counters.reset()
+        self.assertEqual(counters.snapshot(), {})
@@ -0,0 +1,336 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.core import decode, decode_raw, encode, encode_raw, lookup
+from basest.exceptions import InvalidInputError
+
+
+hex_alphabet = [s for s in '0123456789abcdef']
+dna_alphabet = ['A', 'C', 'G', 'T']
+byte_table = [chr(b) for b in range(256)]
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+base32_alphabet = [s for s in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567']
+
+
+@ddt
+class TestLookup(unittest.TestCase):
+    maxDiff = None
+
+    def test_lookup_table(self):
+        """
+        A lookup table should map every possible chunk to its output.
+        """
+        table = lookup.lookup_table(8, 2, 1, 3, 8)
+
+        self.assertEqual(
+            table,
+            (
+                (0, 0, 0), (0, 0, 1), (0, 1, 0), (0, 1, 1),
+                (1, 0, 0), (1, 0, 1), (1, 1, 0), (1, 1, 1),
+            )
+        )
+        # the same (cached) table should be returned next time
+        self.assertIs(lookup.lookup_table(8, 2, 1, 3, 0), table)
+
+    def test_lookup_table_symbols(self):
+        """
+        A lookup table with an output symbol table should map every possible
+        chunk straight to output symbols.
+        """
+        table = lookup.lookup_table(16, 4, 1, 2, 16, dna_alphabet)
+
+        self.assertEqual(table[0], ('A', 'A'))
+        self.assertEqual(table[6], ('C', 'G'))
+        self.assertEqual(table[15], ('T', 'T'))
+
+    @patch.dict(lookup._tables, clear=True)
+    def test_lookup_table_symbols_from_raw_table(self):
+        """
+        A lookup table with an output symbol table should be made from the
+        cached table of raw integers, if there is one, rather than built from
+        scratch.
+        """
+        # the table is stored a column at a time
+        values = [v // 4 for v in range(16)] + [v % 4 for v in range(16)]
+        lookup.register_table(16, 4, 1, 2, lookup.FlatTable(values, 2))
+
+        with patch('basest.core.lookup._build_table') as m_build_table:
+            table = lookup.lookup_table(16, 4, 1, 2, 16, dna_alphabet)
+
+        self.assertFalse(m_build_table.called)
+        self.assertEqual(
+            table,
+            tuple(
+                (a, b) for a in dna_alphabet for b in dna_alphabet
+            )
+        )
+
+    @data(
+        # not enough chunks to be worth building a table
+        (7, 3, 1, 2, 6),
+        # too many possible chunks
+        (256, 85, 4, 5, 10 ** 10),
+        (2 ** 40, 2, 2, 80, 10 ** 30),
+    )
+    @unpack
+    def test_lookup_table_not_used(
+        self, input_base, output_base, input_ratio, output_ratio, chunks
+    ):
+        """
+        No table should be returned when the chunk space is too big, or when
+        there are too few chunks for building one to be worth it.
+        """
+        self.assertIsNone(
+            lookup.lookup_table(
+                input_base, output_base, input_ratio, output_ratio, chunks
+            )
+        )
+
+    def test_flat_table(self):
+        """
+        A flat table should have the same rows as the tuples of rows it
+        stands in for, and raise IndexError for values outside the table.
+        """
+        table = lookup.lookup_table(8, 2, 1, 3, 8)
+        flat_table = lookup.FlatTable(
+            [s for column in zip(*table) for s in column], 3
+        )
+
+        self.assertEqual(len(flat_table), 8)
+        self.assertEqual(list(flat_table), list(table))
+        with self.assertRaises(IndexError):
+            flat_table[-1]
+
+    @data([], [5, 2], [7, 0, 1, 3, 3, 5, 6, 2, 4])
+    def test_flat_table_convert(self, indices):
+        """
+        Converting with a flat table should join together the rows at each
+        index, in the same way whether or not its rows have been unpacked.
+        """
+        table = lookup.lookup_table(8, 2, 1, 3, 8)
+        flat_table = lookup.FlatTable(
+            [s for column in zip(*table) for s in column], 3
+        )
+
+        self.assertEqual(
+            flat_table.convert(indices),
+            [s for index in indices for s in table[index]]
+        )
+
+    @data([8], [0, -1])
+    def test_flat_table_convert_out_of_range(self, indices):
+        """
+        Converting indices outside a flat table should raise IndexError.
+        """
+        table = lookup.lookup_table(8, 2, 1, 3, 8)
+        flat_table = lookup.FlatTable(
+            [s for column in zip(*table) for s in column], 3
+        )
+
+        with self.assertRaises(IndexError):
+            flat_table.convert(indices)
+
+    @data(
+        (256, 16, 1, 2, 1000),
+        (16, 4, 1, 2, 1000),
+        (8, 2, 1, 3, 999),
+        (4, 256, 4, 1, 1000),
+        (16, 256, 2, 1, 1000),
+        (10, 7, 3, 4, 2000),
+    )
+    @unpack
+    def test_encode_decode_raw_with_lookup(
+        self, input_base, output_base, input_ratio, output_ratio, length
+    ):
+        """
+        encode_raw() and decode_raw() should give the same results with and
+        without lookup tables.
+        """
+        input_data = [random.randrange(input_base) for _ in range(length)]
+
+        output_data = encode_raw(
+            input_base, output_base, input_ratio, output_ratio, input_data
+        )
+        with patch.object(lookup, 'LOOKUP_TABLE_MAX_SIZE', 0):
+            expected = encode_raw(
+                input_base, output_base, input_ratio, output_ratio,
+                input_data
+            )
+
+        self.assertEqual(output_data, expected)
+        self.assertEqual(
+            decode_raw(
+                output_base, input_base, output_ratio, input_ratio,
+                output_data
+            ),
+            input_data
+        )
+
+    def test_encode_raw_out_of_range_values(self):
+        """
+        Values outside the input base can't be looked up, so should be
+        converted in the same way as without lookup tables.
+        """
+        input_data = [random.randrange(16) for _ in range(998)] + [16, 300]
+
+        with patch.object(lookup, 'LOOKUP_TABLE_MAX_SIZE', 0):
+            expected = encode_raw(16, 4, 1, 2, input_data)
+
+        self.assertEqual(encode_raw(16, 4, 1, 2, input_data), expected)
+
+    @data(
+        (256, byte_table, 16, hex_alphabet, '=', 1, 2, 1000),
+        (16, hex_alphabet, 4, dna_alphabet, '=', 1, 2, 1001),
+        (4, dna_alphabet, 16, hex_alphabet, '=', 2, 1, 1000),
+    )
+    @unpack
+    def test_encode_decode_with_symbol_lookup(
+        self,
+        input_base, input_symbol_table,
+        output_base, output_symbol_table, padding_symbol,
+        input_ratio, output_ratio, length
+    ):
+        """
+        encode() and decode() should give the same results when looking up
+        chunks straight to symbols as without lookup tables.
+        """
+        input_data = [
+            random.choice(input_symbol_table) for _ in range(length)
+        ]
+
+        output_data = encode(
+            input_base, input_symbol_table,
+            output_base, output_symbol_table, padding_symbol,
+            input_ratio, output_ratio, input_data
+        )
+        decoded_data = decode(
+            output_base, output_symbol_table, padding_symbol,
+            input_base, input_symbol_table,
+            output_ratio, input_ratio, output_data
+        )
+        with patch.object(lookup, 'LOOKUP_TABLE_MAX_SIZE', 0):
+            expected = encode(
+                input_base, input_symbol_table,
+                output_base, output_symbol_table, padding_symbol,
+                input_ratio, output_ratio, input_data
+            )
+
+        self.assertEqual(output_data, expected)
+        self.assertEqual(decoded_data, input_data)
+
+    def test_symbol_group_tables(self):
+        """
+        Symbol group tables should map each pair of symbols (or the last
+        symbol, for odd input ratios) to its contribution to the chunk.
+        """
+        tables = lookup.symbol_group_tables(16, hex_alphabet, '=', 3, 289)
+
+        self.assertEqual([(s, e) for s, e, _ in tables], [(0, 2), (2, 3)])
+        self.assertEqual(tables[0][2]['1f'], 0x1f0)
+        self.assertEqual(tables[0][2]['=0'], 0xf00)
+        self.assertEqual(tables[1][2]['a'], 0xa)
+        # the same (cached) tables should be returned next time
+        self.assertIs(
+            lookup.symbol_group_tables(16, hex_alphabet, '=', 3, 0), tables
+        )
+
+    @data(
+        # not enough symbols to be worth building tables
+        (64, base64_alphabet, '.', 4, 4224),
+        # too many possible pairs of symbols
+        (256, byte_table, '=', 1, 10 ** 6),
+        # symbols which aren't single characters
+        (4, ['A', 'C', 'G', 'TT'], '=', 2, 1000),
+        (4, ['A', 'C', 'G', 'T'], '==', 2, 1000),
+        # fewer symbols than the input base
+        (5, dna_alphabet, '=', 2, 1000),
+    )
+    @unpack
+    def test_symbol_group_tables_not_used(
+        self, input_base, input_symbol_table, input_padding, input_ratio,
+        symbols
+    ):
+        """
+        No tables should be returned when they can't be used, or when there
+        are too few symbols for building them to be worth it.
+        """
+        self.assertIsNone(
+            lookup.symbol_group_tables(
+                input_base, input_symbol_table, input_padding, input_ratio,
+                symbols
+            )
+        )
+
+    @data(
+        (256, byte_table, 64, base64_alphabet, '=', 3, 4, 6000),
+        (256, byte_table, 64, base64_alphabet, '=', 3, 4, 5999),
+        (256, byte_table, 32, base32_alphabet, '=', 5, 8, 5003),
+        (256, byte_table, 16, hex_alphabet, '=', 1, 2, 1000),
+        (4, dna_alphabet, 64, base64_alphabet, '=', 3, 1, 13500),
+    )
+    @unpack
+    def test_decode_with_symbol_groups(
+        self,
+        input_base, input_symbol_table,
+        output_base, output_symbol_table, padding_symbol,
+        input_ratio, output_ratio, length
+    ):
+        """
+        decode() should give the same results when looking up groups of input
+        symbols as without lookup tables.
+        """
+        input_data = [
+            random.choice(input_symbol_table) for _ in range(length)
+        ]
+        encoded_data = ''.join(
+            encode(
+                input_base, input_symbol_table,
+                output_base, output_symbol_table, padding_symbol,
+                input_ratio, output_ratio, input_data
+            )
+        )
+
+        decoded_data = decode(
+            output_base, output_symbol_table, padding_symbol,
+            input_base, input_symbol_table,
+            output_ratio, input_ratio, encoded_data
+        )
+
+        self.assertEqual(decoded_data, input_data)
+        with patch.object(lookup, 'LOOKUP_TABLE_MAX_SIZE', 0):
+            self.assertEqual(
+                decode(
+                    output_base, output_symbol_table, padding_symbol,
+                    input_base, input_symbol_table,
+                    output_ratio, input_ratio, encoded_data
+                ),
+                decoded_data
+            )
+
+    def test_decode_symbol_groups_invalid_symbol(self):
+        """
+        Symbols not in the symbol table should raise InvalidInputError when
+        looking up groups of symbols, as they do without lookup tables.
+        """
+        input_data = 'QUJD' * 2000 + 'QU!D'
+
+        with self.assertRaises(InvalidInputError):
+            decode(64, base64_alphabet, '=', 256, byte_table, 4, 3, input_data)
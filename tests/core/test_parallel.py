@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode, decode_parallel, encode, encode_parallel
+from basest.encoders import Encoder
+from basest.exceptions import (
+    InvalidInputError, InvalidInputLengthError, InvalidSymbolTableError
+)
+
+
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+base85_alphabet = [chr(c) for c in range(33, 118)]
+# decoded, so these are text characters on Python 2 too
+byte_table = list(bytearray(range(256)).decode('latin-1'))
+
+
+class Base85Encoder(Encoder):
+    input_base = 256
+    output_base = 85
+    input_ratio = 4
+    output_ratio = 5
+    input_symbol_table = byte_table
+    output_symbol_table = base85_alphabet
+    padding_symbol = '~'
+
+
+@ddt
+class TestParallel(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (0, None), (1, 4), (2, 4), (3, 1), (1000, 3), (1001, 7), (4099, None)
+    )
+    @unpack
+    def test_encode_decode_parallel(self, length, workers):
+        """
+        Encoding and decoding in parallel should give exactly the same results
+        as encode() and decode(), whatever the number of workers.
+        """
+        input_data = ''.join(random.choice(byte_table) for _ in range(length))
+        expected = encode(
+            256, byte_table, 64, base64_alphabet, '=', 3, 4, input_data
+        )
+
+        output_data = encode_parallel(
+            256, byte_table, 64, base64_alphabet, '=', 3, 4, input_data,
+            workers=workers
+        )
+
+        self.assertEqual(output_data, expected)
+        self.assertEqual(
+            decode_parallel(
+                64, base64_alphabet, '=', 256, byte_table, 4, 3, output_data,
+                workers=workers
+            ),
+            decode(64, base64_alphabet, '=', 256, byte_table, 4, 3, expected)
+        )
+
+    def test_encode_decode_parallel_executor(self):
+        """
+        A given executor should be used instead of creating a new thread pool.
+        """
+        encoder = Base85Encoder()
+        input_data = ''.join(random.choice(byte_table) for _ in range(999))
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            output_data = encoder.encode_parallel(
+                input_data, workers=3, executor=executor
+            )
+            decoded_data = encoder.decode_parallel(
+                output_data, workers=3, executor=executor
+            )
+
+        self.assertEqual(output_data, encoder.encode(input_data))
+        self.assertEqual(''.join(decoded_data), input_data)
+
+    def test_encode_parallel_invalid_symbol_tables(self):
+        """
+        Invalid symbol tables should raise InvalidSymbolTableError.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            encode_parallel(
+                256, byte_table, 64, base64_alphabet, 'A', 3, 4, 'abc'
+            )
+
+    @data(
+        ('YWJj????', InvalidInputError),
+        ('YWJjZ', InvalidInputLengthError),
+    )
+    @unpack
+    def test_decode_parallel_invalid_input(self, input_data, exception):
+        """
+        Invalid input should be rejected in the same way as decode() does.
+        """
+        with self.assertRaises(exception):
+            decode_parallel(
+                64, base64_alphabet, '=', 256, byte_table, 4, 3, input_data,
+                workers=2
+            )
+
+    def test_shared_encoder_between_threads(self):
+        """
+        A single Encoder instance should give correct results when used by
+        many threads at the same time.
+        """
+        encoder = Base85Encoder()
+        inputs = [
+            ''.join(random.choice(byte_table) for _ in range(length))
+            for length in range(200, 216)
+        ]
+        expected = [encoder.encode(input_data) for input_data in inputs]
+        results = [None] * len(inputs)
+
+        def work(i):
+            for _ in range(20):
+                results[i] = encoder.decode(encoder.encode(inputs[i]))
+
+        threads = [
+            threading.Thread(target=work, args=(i,))
+            for i in range(len(inputs))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([encoder.encode(i) for i in inputs], expected)
+        self.assertEqual([''.join(r) for r in results], inputs)
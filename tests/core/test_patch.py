@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import encode, encode_patch
+from basest.exceptions import ImproperUsageError
+
+
+byte_table = [chr(c) for c in range(256)]
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+base85_alphabet = [chr(c) for c in range(33, 118)]
+
+
+def random_bytes(length):
+    """
+    Returns a list of the given number of random byte symbols.
+    """
+    return [random.choice(byte_table) for _ in range(length)]
+
+
+@ddt
+class TestEncodePatch(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (64, base64_alphabet, '=', 3, 4),
+        (85, base85_alphabet, '~', 4, 5),
+    )
+    @unpack
+    def test_encode_patch(
+        self, output_base, output_symbol_table, padding,
+        input_ratio, output_ratio
+    ):
+        """
+        Applying a patch should give the same output as encoding the changed
+        data from scratch, for changes anywhere in the data (including ones
+        which extend it).
+        """
+        arguments = (
+            256, byte_table, output_base, output_symbol_table, padding,
+            input_ratio, output_ratio
+        )
+        for length, offset, change in [
+            (100, 0, 1), (100, 40, 7), (100, 41, 0), (101, 99, 2),
+            (101, 100, 5), (101, 101, 3), (0, 0, 10), (99, 96, 3),
+            (100, 50, 50), (100, 30, 200),
+        ]:
+            original = random_bytes(length)
+            input_data = random_bytes(change)
+            changed = list(original)
+            changed[offset:offset + change] = input_data
+            encoded_data = encode(*arguments + (original,))
+
+            patch = encode_patch(
+                *arguments + (list(encoded_data), offset, input_data)
+            )
+            encoded_data[patch[0]:patch[1]] = patch[2]
+
+            self.assertEqual(encoded_data, encode(*arguments + (changed,)))
+
+    def test_encode_patch_only_encodes_change(self):
+        """
+        A change in the middle of the data should only re-encode the chunks
+        it overlaps.
+        """
+        original = random_bytes(3000)
+        encoded_data = ''.join(
+            encode(256, byte_table, 64, base64_alphabet, '=', 3, 4, original)
+        )
+
+        start, stop, output_data = encode_patch(
+            256, byte_table, 64, base64_alphabet, '=', 3, 4,
+            encoded_data, 1000, random_bytes(4)
+        )
+
+        # bytes 999-1004 are chunks 333-334
+        self.assertEqual((start, stop, len(output_data)), (1332, 1340, 8))
+
+    def test_encode_patch_apply(self):
+        """
+        Patches should be applied to the encoded data in-place if asked to.
+        """
+        encoded_data = encode(
+            256, byte_table, 64, base64_alphabet, '=', 3, 4, 'cabbages'
+        )
+
+        patch = encode_patch(
+            256, byte_table, 64, base64_alphabet, '=', 3, 4,
+            encoded_data, 3, 'ling', apply=True
+        )
+
+        self.assertEqual(patch, (4, 12, [s for s in 'bGluZ3M=']))
+        self.assertEqual(encoded_data, [s for s in 'Y2FibGluZ3M='])
+
+    @data(-1, 9)
+    def test_encode_patch_offset_out_of_range(self, offset):
+        """
+        Patches can't start before the start or after the end of the data.
+        """
+        with self.assertRaises(ImproperUsageError):
+            encode_patch(
+                256, byte_table, 64, base64_alphabet, '=', 3, 4,
+                'Y2FiYmFnZXM=', offset, 'a'
+            )
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import unittest
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.core import lookup
+from basest.core.encode import _convert_chunks
+from basest.core.profiling import (
+    Stage, format_stages, main, profile_decode, profile_encode
+)
+from basest.exceptions import ImproperUsageError
+
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+stage_names = [
+    'validate_symbol_tables', 'symbols_to_ints', 'input copy',
+    'padding handling', 'chunk conversion', 'ints_to_symbols',
+]
+
+
+@ddt
+class TestProfiling(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        # which stages run depends on the tables already in the shared cache
+        self.tables = patch.dict(lookup._tables, clear=True)
+        self.tables.start()
+
+    def tearDown(self):
+        self.tables.stop()
+
+    def test_profile_encode(self):
+        """
+        profile_encode() should report each stage of encoding once, in the
+        order in which they first run.
+        """
+        stages = profile_encode(
+            256, [chr(c) for c in range(256)], 64, base64_alphabet, '=', 3, 4,
+            'belfast'
+        )
+
+        self.assertEqual([stage.name for stage in stages], stage_names)
+        for stage in stages:
+            self.assertGreaterEqual(stage.elapsed, 0)
+
+    def test_profile_decode(self):
+        """
+        profile_decode() should report each stage of decoding once, in the
+        order in which they first run.
+        """
+        stages = profile_decode(
+            64, base64_alphabet, '=', 256, [chr(c) for c in range(256)], 4, 3,
+            'YmVsZmFzdA=='
+        )
+
+        self.assertEqual(
+            [stage.name for stage in stages],
+            [
+                'validate_symbol_tables', 'invalid symbol scan',
+                'lookup table', 'symbols_to_ints', 'padding handling',
+                'input copy', 'chunk conversion', 'ints_to_symbols',
+            ]
+        )
+
+    @data(
+        (
+            profile_encode,
+            (
+                256, [chr(c) for c in range(256)], 16,
+                list('0123456789abcdef'), '=', 1, 2, 'cabbages' * 1000
+            ),
+            [
+                'validate_symbol_tables', 'symbols_to_ints', 'lookup table',
+                'padding handling', 'symbol lookup',
+            ]
+        ),
+        (
+            profile_decode,
+            (
+                64, base64_alphabet, '=', 256, [chr(c) for c in range(256)],
+                4, 3, 'Y2FiYmFnZXM=' * 1000
+            ),
+            [
+                'validate_symbol_tables', 'invalid symbol scan',
+                'lookup table', 'symbol lookup',
+            ]
+        ),
+        (
+            profile_decode,
+            (
+                16, list('0123456789abcdef'), '=', 256,
+                [chr(c) for c in range(256)], 2, 1, list('63616262' * 1000)
+            ),
+            [
+                'validate_symbol_tables', 'symbols_to_ints', 'lookup table',
+                'padding handling', 'symbol lookup',
+            ]
+        ),
+        (
+            profile_decode,
+            (
+                4, ['AA', 'CC', 'GG', 'TT'], '-', 16,
+                list('0123456789abcdef'), 2, 1, 'AACCGGTT'
+            ),
+            [
+                'validate_symbol_tables', 'lookup table', 'tokenize',
+                'padding handling', 'input copy', 'chunk conversion',
+                'ints_to_symbols',
+            ]
+        ),
+    )
+    @unpack
+    def test_profile_fast_paths(self, function, args, names):
+        """
+        Profiling should take the same path through encoding or decoding as
+        encode() and decode() do, including their lookup table shortcuts.
+        """
+        stages = function(*args)
+
+        self.assertEqual([stage.name for stage in stages], names)
+
+    @unittest.skipIf(tracemalloc is None, 'tracemalloc is not available')
+    def test_stages_timed_without_tracing(self):
+        """
+        Allocations should be measured in a traced run, and stages timed in
+        a separate run without tracing.
+        """
+        tracing = []
+
+        def convert_chunks(*args):
+            tracing.append(tracemalloc.is_tracing())
+            return _convert_chunks(*args)
+
+        with patch(
+            'basest.core.profiling._convert_chunks',
+            side_effect=convert_chunks
+        ):
+            stages = profile_encode(
+                256, [chr(c) for c in range(256)], 64, base64_alphabet, '=',
+                3, 4, 'belfast'
+            )
+
+        self.assertEqual(tracing, [True, False])
+        self.assertFalse(tracemalloc.is_tracing())
+        for stage in stages:
+            self.assertGreaterEqual(stage.elapsed, 0)
+            self.assertIsNotNone(stage.allocated_bytes)
+
+    @patch('basest.core.profiling.tracemalloc', None)
+    def test_profile_without_tracemalloc(self):
+        """
+        Stages should be timed in one run when allocations can't be measured.
+        """
+        stages = profile_encode(
+            256, [chr(c) for c in range(256)], 64, base64_alphabet, '=', 3, 4,
+            'belfast'
+        )
+
+        self.assertEqual([stage.name for stage in stages], stage_names)
+        for stage in stages:
+            self.assertIsNone(stage.allocated_bytes)
+
+    def test_profile_encode_raises_errors(self):
+        """
+        Profiling should fail in the same way as encoding when given invalid
+        input.
+        """
+        with self.assertRaises(ImproperUsageError):
+            profile_encode(
+                94, [chr(c) for c in range(94)],
+                256, [chr(c) for c in range(256)], '==', 10, 9, '!!!'
+            )
+
+    def test_format_stages(self):
+        """
+        format_stages() should produce a header line and one line per stage,
+        even if allocations or times could not be measured.
+        """
+        output = format_stages(
+            [Stage('symbols_to_ints', 0.5, 1024), Stage('input copy', 0, None)]
+        )
+
+        lines = output.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn('symbols_to_ints', lines[1])
+        self.assertIn('100.0%', lines[1])
+        self.assertIn('1024', lines[1])
+        self.assertTrue(lines[2].endswith('-'))
+
+    @data(
+        ['256', '64', '3', '4', '--size', '100'],
+        ['256', '85', '4', '5', '--size', '99', '--decode'],
+        [
+            '16', '4', '1', '2', '--size', '9',
+            '--input-alphabet', '0123456789abcdef',
+            '--output-alphabet', 'ACGT', '--padding', '-'
+        ]
+    )
+    @patch('basest.core.profiling.print')
+    def test_main(self, argv, m_print):
+        """
+        The command-line entry point should print a table of all the stages
+        for the given configuration.
+        """
+        self.assertEqual(main(argv), 0)
+
+        output = m_print.call_args[0][0]
+        for name in stage_names:
+            self.assertIn(name, output)
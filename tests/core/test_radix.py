@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode_raw, encode_raw
+from basest.core.radix import (
+    convert_chunks, digits_to_int, int_to_digits, power_table
+)
+
+
+def slow_digits(value, base, length):
+    """
+    Returns the given value as a list of length digits in the given base,
+    calculated the simplest possible way.
+    """
+    return [
+        (value // (base ** (length - i - 1))) % base for i in range(length)
+    ]
+
+
+@ddt
+class TestRadix(unittest.TestCase):
+    maxDiff = None
+
+    @data(1, 2, 16, 17, 64, 100, 1000)
+    def test_power_table(self, length):
+        """
+        power_table() should return the powers base ** (2 ** k) for at least
+        every k where 2 ** k is less than the length.
+        """
+        table = power_table(7, length)
+
+        self.assertGreaterEqual(1 << (len(table) - 1), length)
+        for k, power in enumerate(table):
+            self.assertEqual(power, 7 ** (2 ** k))
+
+    @data(
+        (2, 1), (10, 16), (10, 17), (256, 100), (255, 1002), (94, 559)
+    )
+    @unpack
+    def test_digits_to_int_int_to_digits(self, base, length):
+        """
+        Converting random digits to an integer and back again should give the
+        same digits, and the same integer as simple arithmetic.
+        """
+        powers = power_table(base, length)
+        digits = [random.randrange(base) for _ in range(length)]
+        value = digits_to_int(digits, base, 0, length, powers)
+        output = [None] * length
+        int_to_digits(value, base, output, 0, length, powers)
+
+        self.assertEqual(output, digits)
+        self.assertEqual(output, slow_digits(value, base, length))
+
+    def test_int_to_digits_overflow(self):
+        """
+        Values too large for the number of digits should overflow into the
+        first digit, as the digit-by-digit method does.
+        """
+        powers = power_table(10, 40)
+        output = [None] * 40
+        int_to_digits(123 * 10 ** 39 + 45, 10, output, 0, 40, powers)
+
+        self.assertEqual(output, [123] + [0] * 37 + [4, 5])
+
+    @data(
+        (256, 85, 4, 5), (256, 94, 68, 83), (256, 255, 1000, 1002),
+        (94, 256, 10, 9)
+    )
+    @unpack
+    def test_convert_chunks(
+        self, input_base, output_base, input_ratio, output_ratio
+    ):
+        """
+        convert_chunks() should convert every chunk of the input separately
+        into output_ratio digits of the output base.
+        """
+        input_data = [
+            random.randrange(input_base) for _ in range(input_ratio * 3)
+        ]
+        expected = []
+        for i in range(0, len(input_data), input_ratio):
+            value = 0
+            for digit in input_data[i:i + input_ratio]:
+                value = value * input_base + digit
+            expected.extend(slow_digits(value, output_base, output_ratio))
+
+        self.assertEqual(
+            convert_chunks(
+                input_base, output_base, input_ratio, output_ratio,
+                input_data
+            ),
+            expected
+        )
+
+    @data(
+        (256, 255, 1000, 1002, 2500),
+        (256, 94, 458, 559, 1),
+    )
+    @unpack
+    def test_encode_decode_raw_large_ratios(
+        self, input_base, output_base, input_ratio, output_ratio, length
+    ):
+        """
+        Data encoded with very large ratios should decode back to the same
+        data, including when padding is needed.
+        """
+        input_data = [random.randrange(input_base) for _ in range(length)]
+        output_data = encode_raw(
+            input_base, output_base, input_ratio, output_ratio, input_data
+        )
+
+        self.assertEqual(
+            decode_raw(
+                output_base, input_base, output_ratio, input_ratio,
+                output_data
+            ),
+            input_data
+        )
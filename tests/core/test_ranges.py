@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import mmap
+import os
+import random
+import tempfile
+import unittest
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.core import DecodedView, decode, decode_range, encode, ranges
+from basest.exceptions import ImproperUsageError, InvalidInputLengthError
+
+
+byte_table = [chr(c) for c in range(256)]
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+base85_alphabet = [chr(c) for c in range(33, 118)]
+emoji_alphabet = [
+    '\U0001f600', '\U0001f601', '\U0001f602', '\U0001f603',
+]
+
+
+def encoded(output_base, output_symbol_table, padding, input_ratio,
+            output_ratio, length):
+    """
+    Returns some random bytes (as a list of symbols) of the given length and
+    their encoding (as a string).
+    """
+    input_data = [random.choice(byte_table) for _ in range(length)]
+    return input_data, ''.join(
+        encode(
+            256, byte_table, output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, input_data
+        )
+    )
+
+
+@ddt
+class TestRanges(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (64, base64_alphabet, '=', 3, 4, 1000),
+        (64, base64_alphabet, '=', 3, 4, 1001),
+        (85, base85_alphabet, '~', 4, 5, 999),
+        (4, emoji_alphabet, '\U0001f4a9', 1, 4, 100),
+    )
+    @unpack
+    def test_decode_range(
+        self, output_base, output_symbol_table, padding,
+        input_ratio, output_ratio, length
+    ):
+        """
+        Decoding a range should give the same symbols as slicing the whole
+        decoded output, for any range.
+        """
+        input_data, output_data = encoded(
+            output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, length
+        )
+        arguments = (
+            output_base, output_symbol_table, padding, 256, byte_table,
+            output_ratio, input_ratio, output_data
+        )
+
+        for start, stop in [
+            (0, 10), (0, length), (length - 1, length), (5, 5), (7, 3),
+            (-20, -3), (length - 5, length + 5), (None, None),
+            (random.randrange(length), random.randrange(length)),
+        ]:
+            self.assertEqual(
+                decode_range(*arguments + (start, stop)),
+                input_data[start:stop]
+            )
+
+    def test_decode_range_only_decodes_range(self):
+        """
+        Only the chunks covering the range (and the last chunk, for the length
+        of the output) should be decoded.
+        """
+        input_data, output_data = encoded(64, base64_alphabet, '=', 3, 4, 3000)
+
+        with patch.object(ranges, 'decode', wraps=decode) as m_decode:
+            self.assertEqual(
+                decode_range(
+                    64, base64_alphabet, '=', 256, byte_table, 4, 3,
+                    output_data, 1000, 1010
+                ),
+                input_data[1000:1010]
+            )
+
+        self.assertEqual(
+            sorted(len(c[0][-1]) for c in m_decode.call_args_list), [4, 16]
+        )
+
+    @data(
+        (64, base64_alphabet, '=', 3, 4, 5000),
+        (4, emoji_alphabet, '\U0001f4a9', 1, 4, 99),
+    )
+    @unpack
+    def test_decoded_view(
+        self, output_base, output_symbol_table, padding,
+        input_ratio, output_ratio, length
+    ):
+        """
+        A decoded view should index and slice like the whole decoded output.
+        """
+        input_data, output_data = encoded(
+            output_base, output_symbol_table, padding,
+            input_ratio, output_ratio, length
+        )
+
+        view = DecodedView(
+            output_base, output_symbol_table, padding, 256, byte_table,
+            output_ratio, input_ratio, list(output_data),
+            chunks_per_block=8, cache_size=2
+        )
+
+        self.assertEqual(len(view), length)
+        self.assertEqual(list(view), input_data)
+        for index in (0, 1, length - 1, -1, -length, length // 2):
+            self.assertEqual(view[index], input_data[index])
+        for indices in (
+            slice(None), slice(3, 50), slice(None, None, -1),
+            slice(length - 1, 2, -7), slice(10, 3), slice(1, None, 5),
+        ):
+            self.assertEqual(view[indices], input_data[indices])
+        for index in (length, -length - 1):
+            with self.assertRaises(IndexError):
+                view[index]
+
+    def test_decoded_view_cache(self):
+        """
+        Recently decoded blocks should be decoded again from the cache,
+        keeping at most cache_size blocks.
+        """
+        input_data, output_data = encoded(64, base64_alphabet, '=', 3, 4, 300)
+
+        with patch.object(ranges, 'decode', wraps=decode) as m_decode:
+            view = DecodedView(
+                64, base64_alphabet, '=', 256, byte_table, 4, 3, output_data,
+                chunks_per_block=10, cache_size=2
+            )
+            for index in (0, 29, 1, 30, 31, 0, 60, 29, 30):
+                self.assertEqual(view[index], input_data[index])
+
+        # the last chunk is decoded for the length, then blocks 0, 1 and 2,
+        # then block 1 again as it was dropped (being least recently used)
+        self.assertEqual(m_decode.call_count, 5)
+
+    def test_decoded_view_mmap(self):
+        """
+        UTF-8 files can be viewed through mmap when every symbol is the same
+        length in UTF-8.
+        """
+        input_data, output_data = encoded(
+            4, emoji_alphabet, '\U0001f4a9', 1, 4, 1000
+        )
+        handle, path = tempfile.mkstemp()
+        try:
+            with os.fdopen(handle, 'wb') as output_file:
+                output_file.write(output_data.encode('utf-8'))
+            with open(path, 'rb') as input_file:
+                data = mmap.mmap(
+                    input_file.fileno(), 0, access=mmap.ACCESS_READ
+                )
+                view = DecodedView(
+                    4, emoji_alphabet, '\U0001f4a9', 256, byte_table, 4, 1,
+                    data
+                )
+
+                self.assertEqual(len(view), 1000)
+                self.assertEqual(view[123:456], input_data[123:456])
+                data.close()
+        finally:
+            os.remove(path)
+
+    def test_decoded_view_empty(self):
+        """
+        A view of empty input should be empty.
+        """
+        view = DecodedView(64, base64_alphabet, '=', 256, byte_table, 4, 3, '')
+
+        self.assertEqual(len(view), 0)
+        self.assertEqual(view[:], [])
+
+    @data(
+        (['a', 'bb'], 'abbab'),
+        (['a', '\xe9'], 'a\xe9a'.encode('utf-8')),
+    )
+    @unpack
+    def test_decoded_view_needs_fixed_width_symbols(
+        self, input_symbol_table, input_data
+    ):
+        """
+        Input data whose symbols can't be located arithmetically can't be
+        viewed.
+        """
+        with self.assertRaises(ImproperUsageError):
+            DecodedView(
+                2, input_symbol_table, '=', 256, byte_table, 8, 1, input_data
+            )
+
+    def test_decoded_view_truncated_input(self):
+        """
+        Input data which isn't a whole number of chunks can't be viewed.
+        """
+        with self.assertRaises(InvalidInputLengthError):
+            DecodedView(
+                64, base64_alphabet, '=', 256, byte_table, 4, 3, 'Y2FiYmF'
+            )
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode, encode
+from basest.exceptions import InvalidInputError, InvalidSymbolTableError
+
+
+# text characters on Python 2 as well, as strings of them are checked for
+# invalid symbols up front
+byte_table = list(bytearray(range(256)).decode('latin-1'))
+base85_alphabet = byte_table[33:118]
+# ascii85-style shortcuts for four zero bytes and four spaces
+shortcuts = {('\x00',) * 4: 'z', (' ',) * 4: 'y'}
+
+
+def ascii85(input_data):
+    """
+    Encodes the given input data as base85, without shortcuts.
+    """
+    return encode(256, byte_table, 85, base85_alphabet, '~', 4, 5, input_data)
+
+
+@ddt
+class TestShortcuts(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        ('\x00\x00\x00\x00', ['z']),
+        ('    \x00\x00\x00\x00', ['y', 'z']),
+        ('\x00\x00\x00', ascii85('\x00\x00\x00')),
+        ('\x00\x00\x00\x00\x00', ['z'] + ascii85('\x00')),
+        (
+            'ab\x00\x00\x00\x00cd',
+            ascii85('ab\x00\x00') + ascii85('\x00\x00cd')
+        ),
+        (
+            'cabb\x00\x00\x00\x00\x00\x00\x00\x00ages',
+            ascii85('cabb') + ['z', 'z'] + ascii85('ages')
+        ),
+        ('', []),
+    )
+    @unpack
+    def test_encode_decode_shortcuts(self, input_data, output_data):
+        """
+        Whole chunks with shortcuts should be encoded as the shortcut symbol
+        and decoded back again, and everything else as normal.
+        """
+        encoded_data = encode(
+            256, byte_table, 85, base85_alphabet, '~', 4, 5, input_data,
+            shortcuts=shortcuts
+        )
+
+        self.assertEqual(encoded_data, output_data)
+        for encoded in (encoded_data, ''.join(encoded_data)):
+            self.assertEqual(
+                decode(
+                    85, base85_alphabet, '~', 256, byte_table, 5, 4, encoded,
+                    shortcuts=shortcuts
+                ),
+                [s for s in input_data]
+            )
+
+    def test_encode_decode_shortcuts_random(self):
+        """
+        Sparse data should survive a round trip through encoding and decoding
+        with shortcuts.
+        """
+        input_data = [
+            random.choice(['\x00'] * 30 + byte_table) for _ in range(10001)
+        ]
+
+        encoded_data = encode(
+            256, byte_table, 85, base85_alphabet, '~', 4, 5, input_data,
+            shortcuts=shortcuts
+        )
+
+        self.assertEqual(
+            decode(
+                85, base85_alphabet, '~', 256, byte_table, 5, 4,
+                encoded_data, shortcuts=shortcuts
+            ),
+            input_data
+        )
+
+    def test_decode_shortcut_in_middle_of_chunk(self):
+        """
+        Shortcut symbols can only be decoded on chunk boundaries.
+        """
+        with self.assertRaises(InvalidInputError) as context:
+            decode(
+                85, base85_alphabet, '~', 256, byte_table, 5, 4, '!!z!!!',
+                shortcuts=shortcuts
+            )
+
+        self.assertTrue(str(context.exception).endswith('at offset 2'))
+
+    def test_decode_shortcuts_invalid_symbol_offset(self):
+        """
+        The offset of an invalid symbol should be in the input as given,
+        before shortcut symbols and ignored symbols are taken out.
+        """
+        with self.assertRaises(InvalidInputError) as context:
+            decode(
+                85, base85_alphabet, '~', 256, byte_table, 5, 4, 'zz\n!!{!!',
+                ignore='\n', shortcuts=shortcuts
+            )
+
+        self.assertTrue(str(context.exception).endswith('at offset 5'))
+
+    @data(
+        {('\x00',) * 3: 'z'},
+        {('\x00', '\x00', '\x00', 'Ā'): 'z'},
+        {('\x00',) * 4: '!'},
+        {('\x00',) * 4: '~'},
+        {('\x00',) * 4: 'z', ('\x01',) * 4: 'z'},
+        {('\x00',) * 4: None},
+    )
+    def test_invalid_shortcuts(self, invalid_shortcuts):
+        """
+        Shortcuts must be for whole chunks of input symbols, and shortcut
+        symbols must be unique and not be output symbols.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            encode(
+                256, byte_table, 85, base85_alphabet, '~', 4, 5, 'cabbages',
+                shortcuts=invalid_shortcuts
+            )
+        with self.assertRaises(InvalidSymbolTableError):
+            decode(
+                85, base85_alphabet, '~', 256, byte_table, 5, 4, 'z',
+                shortcuts=invalid_shortcuts
+            )
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import hashlib
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import Checksum, decode_raw, encode_raw
+from basest.core.stream import (
+    IncrementalDecoder, IncrementalEncoder, LineWrapper
+)
+from basest.exceptions import ImproperUsageError, InvalidInputLengthError
+
+
+def pieces(input_data, size):
+    """
+    Splits the given data into a list of pieces of the given size.
+    """
+    return [input_data[i:i + size] for i in range(0, len(input_data), size)]
+
+
+@ddt
+class TestIncrementalEncodeDecode(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (256, 85, 4, 5, 0, 3),
+        (256, 85, 4, 5, 101, 1),
+        (256, 85, 4, 5, 101, 7),
+        (256, 64, 3, 4, 1000, 64),
+        (256, 255, 1000, 1002, 2500, 333),
+    )
+    @unpack
+    def test_incremental_encode_decode(
+        self, input_base, output_base, input_ratio, output_ratio,
+        length, piece_size
+    ):
+        """
+        Encoding and decoding data a piece at a time should give exactly the
+        same output as encode_raw() and decode_raw() do all at once.
+        """
+        input_data = [random.randrange(input_base) for _ in range(length)]
+        expected = encode_raw(
+            input_base, output_base, input_ratio, output_ratio, input_data
+        )
+        encoder = IncrementalEncoder(
+            input_base, output_base, input_ratio, output_ratio
+        )
+        decoder = IncrementalDecoder(
+            output_base, input_base, output_ratio, input_ratio
+        )
+
+        output_data = []
+        for piece in pieces(input_data, piece_size):
+            output_data.extend(encoder.encode(piece))
+        output_data.extend(encoder.encode([], final=True))
+        decoded_data = []
+        for piece in pieces(output_data, piece_size):
+            decoded_data.extend(decoder.decode(piece))
+        decoded_data.extend(decoder.decode([], final=True))
+
+        self.assertEqual(output_data, expected)
+        self.assertEqual(
+            decoded_data,
+            decode_raw(
+                output_base, input_base, output_ratio, input_ratio, expected
+            )
+        )
+        self.assertEqual(decoded_data, input_data)
+
+    def test_incremental_encode_decode_digest(self):
+        """
+        The raw data should be added to the digest a piece at a time as it is
+        encoded and decoded.
+        """
+        input_data = bytearray(random.randrange(256) for _ in range(1000))
+        encoder = IncrementalEncoder(256, 85, 4, 5, hashlib.sha1())
+        decoder = IncrementalDecoder(85, 256, 5, 4, Checksum())
+
+        output_data = []
+        for piece in pieces(input_data, 77):
+            output_data.extend(encoder.encode(piece))
+        output_data.extend(encoder.encode(iter([]), final=True))
+        for piece in pieces(output_data, 77):
+            decoder.decode(piece)
+        decoder.decode([], final=True)
+
+        self.assertEqual(
+            encoder.digest.digest(), hashlib.sha1(input_data).digest()
+        )
+        checksum = Checksum()
+        checksum.update(input_data)
+        self.assertEqual(decoder.digest.value, checksum.value)
+
+    def test_incremental_digest_requires_byte_data(self):
+        """
+        Digests can't be taken of raw data which isn't in base 256.
+        """
+        with self.assertRaises(ImproperUsageError):
+            IncrementalEncoder(94, 256, 10, 9, Checksum())
+        with self.assertRaises(ImproperUsageError):
+            IncrementalDecoder(256, 94, 9, 10, Checksum())
+
+    def test_incremental_encoder_reset(self):
+        """
+        Resetting an IncrementalEncoder should discard left over input.
+        """
+        encoder = IncrementalEncoder(256, 64, 3, 4)
+
+        self.assertEqual(encoder.encode([1, 2]), [])
+        encoder.reset()
+        self.assertEqual(encoder.encode([], final=True), [])
+
+    def test_incremental_encoder_improper_usage(self):
+        """
+        Finishing with a partial chunk when the output base is larger than the
+        input base should raise ImproperUsageError, as encode_raw() does.
+        """
+        encoder = IncrementalEncoder(94, 256, 10, 9)
+
+        self.assertEqual(encoder.encode([1, 2, 3]), [])
+        with self.assertRaises(ImproperUsageError):
+            encoder.encode([4], final=True)
+
+    def test_incremental_decoder_truncated_input(self):
+        """
+        Finishing with a partial chunk should raise InvalidInputLengthError,
+        and resetting the decoder should discard it.
+        """
+        decoder = IncrementalDecoder(85, 256, 5, 4)
+
+        self.assertEqual(decoder.decode([31, 79, 81]), [])
+        with self.assertRaises(InvalidInputLengthError):
+            decoder.decode([71], final=True)
+        decoder.reset()
+        self.assertEqual(decoder.decode([], final=True), [])
+
+
+@ddt
+class TestLineWrapper(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (0, 76, 1),
+        (76, 76, 10),
+        (77, 76, 10),
+        (1000, 76, 1),
+        (1000, 76, 76),
+        (1000, 76, 500),
+        (1000, 1, 3),
+    )
+    @unpack
+    def test_wrap(self, length, line_length, size):
+        """
+        Output wrapped a piece at a time should be split into lines of
+        line_length symbols, with no separator after the last line.
+        """
+        output_data = [random.choice('ABCD') for _ in range(length)]
+        wrapper = LineWrapper(line_length, '\r\n')
+
+        wrapped_data = []
+        for piece in pieces(output_data, size):
+            wrapped_data.extend(wrapper.wrap(piece))
+
+        expected = []
+        for line in pieces(output_data, line_length):
+            if expected:
+                expected.append('\r\n')
+            expected.extend(line)
+        self.assertEqual(wrapped_data, expected)
+
+    def test_wrap_reset(self):
+        """
+        Resetting a line wrapper should start a new line.
+        """
+        wrapper = LineWrapper(4)
+        wrapper.wrap('ABC')
+        wrapper.reset()
+
+        self.assertEqual(
+            wrapper.wrap('DEFGH'), ['D', 'E', 'F', 'G', '\n', 'H']
+        )
+
+    @data(0, -1, -76)
+    def test_wrap_invalid_line_length(self, line_length):
+        """
+        Lines shorter than one symbol should be refused, rather than wrapping
+        forever.
+        """
+        with self.assertRaises(ImproperUsageError):
+            LineWrapper(line_length)
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode, encode
+from basest.core.tokenize import needs_tokenizing, tokenize
+from basest.core.utils import symbol_map
+from basest.exceptions import InvalidInputError
+
+
+byte_table = [chr(c) for c in range(256)]
+word_alphabet = ['zero', 'one', 'two', 'three', 'four', 'five', 'six', 'ten']
+digraph_alphabet = ['a', 'ae', 'b', 'ch', 'c', 'h', 'th', 'll']
+
+
+@ddt
+class TestTokenize(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (['a', 'b', 'c'], False),
+        ([0, 1, 2], False),
+        (['a', 'bc'], True),
+        (['a', ''], True),
+    )
+    @unpack
+    def test_needs_tokenizing(self, symbol_table, expected):
+        """
+        Only symbol tables with strings which aren't single characters should
+        need tokenizing.
+        """
+        self.assertEqual(needs_tokenizing(symbol_table), expected)
+
+    @data(
+        ('', []),
+        ('aechc', [1, 3, 4]),
+        ('aeth', [1, 6]),
+        ('caell', [4, 1, 7]),
+        ('hcha', [5, 3, 0]),
+    )
+    @unpack
+    def test_tokenize_longest_match(self, input_data, expected):
+        """
+        The longest symbol matching at each point should be used.
+        """
+        self.assertEqual(
+            tokenize(input_data, symbol_map(digraph_alphabet)), expected
+        )
+
+    @data(('aex', 2), ('thx', 2), ('l', 0), ('chal', 3))
+    @unpack
+    def test_tokenize_invalid_symbol(self, input_data, offset):
+        """
+        InvalidInputError should give the offset of the first part of the
+        input which doesn't match a symbol.
+        """
+        with self.assertRaises(InvalidInputError) as context:
+            tokenize(input_data, symbol_map(digraph_alphabet))
+
+        self.assertTrue(
+            str(context.exception).endswith('at offset {0}'.format(offset))
+        )
+
+    @data(
+        (word_alphabet, '.'),
+        (digraph_alphabet, '='),
+        (['\U0001f44d', '\U0001f44d\U0001f3fd', '\U0001f44d\U0001f3ff', 'x',
+          '\U0001f1ec\U0001f1e7', 'z', 'w', 'y'], '=='),
+    )
+    @unpack
+    def test_decode_string(self, symbol_table, padding_symbol):
+        """
+        decode() should split strings of multi-character symbols up into
+        symbols and decode them in the same way as a list of the symbols.
+        """
+        output_data = encode(
+            256, byte_table, 8, symbol_table, padding_symbol, 3, 8, 'Dunoon'
+        )
+
+        self.assertEqual(
+            decode(
+                8, symbol_table, padding_symbol, 256, byte_table, 8, 3,
+                ''.join(output_data)
+            ),
+            decode(
+                8, symbol_table, padding_symbol, 256, byte_table, 8, 3,
+                output_data
+            )
+        )
+
+    def test_decode_string_invalid_symbol(self):
+        """
+        decode() should raise InvalidInputError for strings which don't
+        split up into symbols.
+        """
+        with self.assertRaises(InvalidInputError) as context:
+            decode(
+                8, word_alphabet, '.', 256, byte_table, 8, 3,
+                'zeroonetwelve'
+            )
+
+        self.assertTrue(str(context.exception).endswith('at offset 7'))
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import io
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import decode, decode_utf8, encode, encode_utf8
+from basest.exceptions import InvalidInputError, InvalidSymbolTableError
+
+
+# one or two bytes long in UTF-8, so they must be text on Python 2 too
+byte_table = list(bytearray(range(256)).decode('latin-1'))
+base64_alphabet = [
+    s for s in
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+]
+# all four bytes long in UTF-8
+emoji_alphabet = [
+    '\U0001f600', '\U0001f601', '\U0001f602', '\U0001f603',
+    '\U0001f604', '\U0001f605', '\U0001f606', '\U0001f607',
+    '\U0001f608', '\U0001f609', '\U0001f60a', '\U0001f60b',
+    '\U0001f60c', '\U0001f60d', '\U0001f60e', '\U0001f60f',
+]
+# symbols of different lengths in UTF-8, some of several codepoints
+mixed_alphabet = [
+    'a', '\xe9', '☃', '\U0001f44d', '\U0001f44d\U0001f3fd', 'ab',
+    'c', '\U0001f1ec\U0001f1e7',
+]
+
+
+@ddt
+class TestUtf8(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (256, byte_table, 64, base64_alphabet, '=', 3, 4, 'cabbages'),
+        (256, byte_table, 16, emoji_alphabet, '\U0001f4a9', 1, 2, 'belfast'),
+        (256, byte_table, 8, mixed_alphabet, '!', 3, 8, 'kintyre'),
+        (
+            8, mixed_alphabet, 256, byte_table, '\u2026', 8, 3,
+            mixed_alphabet * 3
+        ),
+    )
+    @unpack
+    def test_encode_decode_utf8(
+        self,
+        input_base, input_symbol_table,
+        output_base, output_symbol_table, padding_symbol,
+        input_ratio, output_ratio, input_data
+    ):
+        """
+        encode_utf8() should give the UTF-8 encoding of what encode() gives,
+        and decode_utf8() should decode it in the same way as decode() would.
+        """
+        output_data = encode(
+            input_base, input_symbol_table,
+            output_base, output_symbol_table, padding_symbol,
+            input_ratio, output_ratio, input_data
+        )
+        expected = ''.join(output_data).encode('utf-8')
+
+        encoded_data = encode_utf8(
+            input_base, input_symbol_table,
+            output_base, output_symbol_table, padding_symbol,
+            input_ratio, output_ratio, input_data
+        )
+
+        self.assertIsInstance(encoded_data, bytearray)
+        self.assertEqual(encoded_data, expected)
+        self.assertEqual(
+            decode_utf8(
+                output_base, output_symbol_table, padding_symbol,
+                input_base, input_symbol_table,
+                output_ratio, input_ratio, encoded_data
+            ),
+            decode(
+                output_base, output_symbol_table, padding_symbol,
+                input_base, input_symbol_table,
+                output_ratio, input_ratio, output_data
+            )
+        )
+
+    def test_encode_utf8_to_file(self):
+        """
+        encode_utf8() should write the UTF-8 output to the given file instead
+        of returning it.
+        """
+        output = io.BytesIO()
+
+        result = encode_utf8(
+            256, byte_table, 16, emoji_alphabet, '\U0001f4a9', 1, 2, 'ok',
+            output=output
+        )
+
+        self.assertIsNone(result)
+        self.assertEqual(
+            output.getvalue(),
+            '\U0001f606\U0001f60f\U0001f606\U0001f60b'.encode('utf-8')
+        )
+
+    def test_encode_utf8_line_wrapping(self):
+        """
+        encode_utf8() should split the output into lines of line_length
+        symbols when asked to.
+        """
+        self.assertEqual(
+            encode_utf8(
+                256, byte_table, 64, base64_alphabet, '=', 3, 4, 'cabbages',
+                line_length=5, line_separator='\r\n'
+            ),
+            b'Y2FiY\r\nmFnZX\r\nM='
+        )
+
+    @data(
+        # not a whole symbol
+        (emoji_alphabet, '\U0001f600'.encode('utf-8')[:3]),
+        (mixed_alphabet, b'ab\xe2\x98'),
+        # not in the symbol table
+        (emoji_alphabet, '\U0001f610'.encode('utf-8')),
+        (mixed_alphabet, b'abd'),
+    )
+    @unpack
+    def test_decode_utf8_invalid_symbol(self, input_symbol_table, input_data):
+        """
+        UTF-8 input which doesn't split into symbols from the symbol table
+        should raise InvalidInputError.
+        """
+        with self.assertRaises(InvalidInputError):
+            decode_utf8(
+                16, input_symbol_table, '\U0001f4a9', 256, byte_table, 2, 1,
+                input_data
+            )
+
+    def test_decode_utf8_invalid_symbol_table(self):
+        """
+        Symbol tables should be validated before decoding.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            decode_utf8(2, ['a', 'a'], '=', 256, byte_table, 8, 1, b'aaaa')
+
+    def test_decode_utf8_ignore(self):
+        """
+        ASCII characters to ignore should be removed from the UTF-8 input
+        before it is decoded.
+        """
+        self.assertEqual(
+            decode_utf8(
+                16, emoji_alphabet, '\U0001f4a9', 256, byte_table, 2, 1,
+                '\U0001f606\U0001f60f\r\n\U0001f606 \U0001f60b\n'.encode(
+                    'utf-8'
+                ),
+                ignore=' \r\n'
+            ),
+            ['o', 'k']
+        )
+
+    @data('\u2028', '\U0001f600')
+    def test_decode_utf8_rejects_ignoring_non_ascii(self, ignore):
+        """
+        Only ASCII characters can be ignored when decoding UTF-8 (or symbols
+        in the symbol table), otherwise InvalidSymbolTableError is raised.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            decode_utf8(
+                16, emoji_alphabet, '\U0001f4a9', 256, byte_table, 2, 1,
+                b'', ignore=ignore
+            )
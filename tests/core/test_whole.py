@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import (
+    decode_whole, decode_whole_raw, encode_whole, encode_whole_raw
+)
+from basest.exceptions import InvalidInputError, InvalidSymbolTableError
+
+
+base58_bitcoin_alphabet = [
+    s for s in
+    '123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz'
+]
+# text characters on Python 2 as well, like the input strings
+byte_table = list(bytearray(range(256)).decode('latin-1'))
+
+
+@ddt
+class TestEncodeDecodeWhole(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        ('', ''),
+        ('\x00', '1'),
+        ('\x00\x00\x00', '111'),
+        ('hello world', 'StV1DL6CwTryKyV'),
+        ('\x00\x00hello world', '11StV1DL6CwTryKyV'),
+        ('\xff', '5Q'),
+    )
+    @unpack
+    def test_encode_decode_whole_base58(self, input_data, expected):
+        """
+        Data should be encoded and decoded in the same way as Bitcoin's
+        base58, with leading zero bytes preserved as leading '1' symbols.
+        """
+        output_data = encode_whole(
+            256, byte_table, 58, base58_bitcoin_alphabet, input_data
+        )
+
+        self.assertEqual(''.join(output_data), expected)
+        self.assertEqual(
+            ''.join(decode_whole(
+                58, base58_bitcoin_alphabet, 256, byte_table, output_data
+            )),
+            input_data
+        )
+
+    @data(
+        (256, 58, 5000), (256, 255, 3000), (58, 256, 5000), (2, 3, 1000),
+        (10, 256, 1), (256, 2, 100)
+    )
+    @unpack
+    def test_encode_decode_whole_raw(self, input_base, output_base, length):
+        """
+        Random data (with some leading zeros) encoded with encode_whole_raw()
+        should decode back to the same data with decode_whole_raw().
+        """
+        input_data = [0, 0] + [
+            random.randrange(input_base) for _ in range(length)
+        ]
+        output_data = encode_whole_raw(input_base, output_base, input_data)
+
+        self.assertLess(max(output_data), output_base)
+        self.assertEqual(
+            decode_whole_raw(output_base, input_base, output_data), input_data
+        )
+
+    def test_encode_whole_raw_does_not_change_input(self):
+        """
+        The input data should not be modified by encoding.
+        """
+        input_data = [0, 0, 0]
+        output_data = encode_whole_raw(256, 58, input_data)
+        output_data.append(1)
+
+        self.assertEqual(input_data, [0, 0, 0])
+
+    @data(
+        (byte_table, ['a', 'b', 'a']),
+        (byte_table, ['a', None]),
+        ([None] + byte_table[:255], ['a', 'b']),
+    )
+    @unpack
+    def test_encode_whole_invalid_symbol_tables(
+        self, input_symbol_table, output_symbol_table
+    ):
+        """
+        Symbol tables which contain None or duplicate symbols should raise
+        InvalidSymbolTableError.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            encode_whole(
+                256, input_symbol_table, len(output_symbol_table),
+                output_symbol_table, 'abc'
+            )
+
+    def test_decode_whole_invalid_input(self):
+        """
+        Symbols which aren't in the input symbol table should raise
+        InvalidInputError.
+        """
+        with self.assertRaises(InvalidInputError):
+            decode_whole(
+                58, base58_bitcoin_alphabet, 256, byte_table, '0OIl'
+            )
@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from array import array
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.core import lookup
+from basest.encoders import Encoder
+from basest.encoders.artefacts import (
+    _typecode, codec_hash, load_codec, load_or_save_codec, save_codec
+)
+from basest.exceptions import StaleArtefactError
+
+
+class HexEncoder(Encoder):
+    input_base = 256
+    output_base = 16
+    input_ratio = 1
+    output_ratio = 2
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [s for s in '0123456789abcdef']
+    padding_symbol = '='
+
+
+class UpperHexEncoder(HexEncoder):
+    output_symbol_table = [s for s in '0123456789ABCDEF']
+
+
+class Base64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [
+        s for s in
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    ]
+    padding_symbol = '='
+
+
+@ddt
+class TestArtefacts(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'codec.bin')
+        # keep tables loaded by each test out of the shared cache
+        self.tables = patch.dict(lookup._tables, clear=True)
+        self.tables.start()
+
+    def tearDown(self):
+        self.tables.stop()
+        shutil.rmtree(self.directory)
+
+    def test_codec_hash(self):
+        """
+        The hash of an Encoder should be the same for equal parameters and
+        change when any of them change.
+        """
+        self.assertEqual(codec_hash(HexEncoder), codec_hash(HexEncoder()))
+        self.assertNotEqual(
+            codec_hash(HexEncoder), codec_hash(UpperHexEncoder)
+        )
+
+    def test_codec_hash_byte_symbols(self):
+        """
+        Symbol tables of byte strings (as chr() gives on Python 2) should be
+        hashed as the characters of their bytes.
+        """
+        class ByteHexEncoder(HexEncoder):
+            input_symbol_table = [bytes(bytearray([c])) for c in range(256)]
+            padding_symbol = b'='
+
+        self.assertEqual(codec_hash(ByteHexEncoder), codec_hash(HexEncoder))
+
+    @data((True, memoryview), (False, array))
+    @unpack
+    def test_save_and_load_codec(self, can_cast, table_type):
+        """
+        Loading a compiled codec should put lookup tables for both directions
+        in the cache, which convert data in the same way as tables built from
+        scratch. They should be memory-mapped, or copied into arrays where
+        memoryviews can't be cast (Python 2).
+        """
+        if can_cast and not hasattr(memoryview, 'cast'):
+            self.skipTest('memoryviews can only be cast on Python 3')
+        input_data = [random.randrange(256) for _ in range(1000)]
+        expected = HexEncoder().encode_raw(input_data)
+        save_codec(HexEncoder, self.path)
+        lookup._tables.clear()
+
+        with patch('basest.encoders.artefacts._CAN_CAST', can_cast):
+            load_codec(HexEncoder, self.path)
+
+        for direction in ((256, 16, 1, 2), (16, 256, 2, 1)):
+            table = lookup.lookup_table(*direction, chunks=0)
+            self.assertIsInstance(table, lookup.FlatTable)
+            self.assertIsInstance(table._columns[0], table_type)
+        self.assertEqual(HexEncoder().encode_raw(input_data), expected)
+        self.assertEqual(HexEncoder().decode_raw(expected), input_data)
+        self.assertEqual(
+            HexEncoder().encode('cabbages'),
+            [s for s in '6361626261676573']
+        )
+
+    def test_symbol_tables_from_loaded_codec(self):
+        """
+        Encoding and decoding with symbols after loading a compiled codec
+        should use its tables, without building any from scratch.
+        """
+        input_data = [chr(random.randrange(256)) for _ in range(1000)]
+        expected = HexEncoder().encode(input_data)
+        save_codec(HexEncoder, self.path)
+        lookup._tables.clear()
+        load_codec(HexEncoder, self.path)
+
+        with patch('basest.core.lookup._build_table') as m_build_table:
+            encoded_data = HexEncoder().encode(input_data)
+            decoded_data = HexEncoder().decode(encoded_data)
+
+        self.assertFalse(m_build_table.called)
+        self.assertEqual(encoded_data, expected)
+        self.assertEqual(decoded_data, input_data)
+
+    def test_save_codec_without_tables(self):
+        """
+        Encoders whose chunk spaces are too big for lookup tables can still
+        be compiled and loaded, with no tables being stored.
+        """
+        save_codec(Base64Encoder, self.path)
+        load_codec(Base64Encoder, self.path)
+
+        self.assertEqual(lookup._tables, {})
+
+    def test_load_stale_codec(self):
+        """
+        Loading a codec compiled from an Encoder with different parameters
+        should raise StaleArtefactError.
+        """
+        save_codec(HexEncoder, self.path)
+
+        with self.assertRaises(StaleArtefactError):
+            load_codec(UpperHexEncoder, self.path)
+
+    @data(b'', b'BASEST', b'NOTBASEST\0\0\0\0', b'BASEST\0\1\4\0\0\0}{}{')
+    def test_load_invalid_codec(self, contents):
+        """
+        Loading a file which is not a compiled codec should raise
+        StaleArtefactError.
+        """
+        with open(self.path, 'wb') as artefact:
+            artefact.write(contents)
+
+        with self.assertRaises(StaleArtefactError):
+            load_codec(HexEncoder, self.path)
+
+    @data(False, True)
+    def test_load_or_save_codec(self, stale):
+        """
+        load_or_save_codec() should compile the Encoder when the file is
+        missing or stale, and then load it.
+        """
+        if stale:
+            save_codec(UpperHexEncoder, self.path)
+
+        load_or_save_codec(HexEncoder, self.path)
+
+        load_codec(HexEncoder, self.path)
+        self.assertEqual(os.listdir(self.directory), ['codec.bin'])
+
+    @data((0, 'B'), (255, 'B'), (256, 'H'), (2 ** 32, 'Q'))
+    @unpack
+    def test_typecode(self, maximum, typecode):
+        """
+        The smallest typecode which can store the maximum value should be
+        used.
+        """
+        self.assertEqual(_typecode(maximum), typecode)
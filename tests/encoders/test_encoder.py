@@ -13,9 +13,10 @@ from __future__ import (
 import unittest
 
 from ddt import data, ddt, unpack
-from mock import patch
+from mock import Mock, patch
 
 from basest.encoders import Encoder
+from basest.exceptions import ImproperUsageError
 
 
 base64_alphabet = [
@@ -30,6 +31,21 @@ base93_alphabet = [
 ]
 
 
+class Ascii85Encoder(Encoder):
+    input_base = 256
+    output_base = 85
+    input_ratio = 4
+    output_ratio = 5
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [chr(c) for c in range(33, 118)]
+    padding_symbol = '~'
+    shortcut_symbols = {('\x00',) * 4: 'z'}
+
+
+class Base85Encoder(Ascii85Encoder):
+    shortcut_symbols = None
+
+
 @ddt
 class TestEncoderSubclass(unittest.TestCase):
     maxDiff = None
@@ -277,7 +293,7 @@ class TestEncoderSubclass(unittest.TestCase):
             output_base=output_base, output_symbol_table=output_symbol_table,
             output_padding=padding_symbol,
             input_ratio=input_ratio, output_ratio=output_ratio,
-            input_data=input_data
+            input_data=input_data, shortcuts=None
         )
         # check that the method returned whatever the function did
         self.assertEqual(result, m_encode.return_value)
@@ -339,7 +355,303 @@ class TestEncoderSubclass(unittest.TestCase):
             input_padding=padding_symbol,
             output_base=input_base, output_symbol_table=input_symbol_table,
             input_ratio=output_ratio, output_ratio=input_ratio,
-            input_data=input_data
+            input_data=input_data, ignore=None, shortcuts=None
         )
         # check that the method returned whatever the function did
         self.assertEqual(result, m_decode.return_value)
+
+    @patch('basest.encoders.encoder.encode_many')
+    def test_encoder_subclass_encode_many(self, m_encode_many):
+        """
+        Test that Encoder().encode_many calls basest.core.encode_many() with
+        the correct arguments, and returns what that function returns.
+        """
+        # mock return value of encode_many
+        m_encode_many.return_value = ['Mull', 'of', 'Kintyre']
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+        inputs = ['cabbages!', 'belfast']
+
+        # call instance method encode_many() with input data
+        result = CustomEncoder().encode_many(inputs)
+
+        # check the library function was called
+        m_encode_many.assert_called_once_with(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            output_padding='=', input_ratio=3, output_ratio=4, inputs=inputs
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_encode_many.return_value)
+
+    @patch('basest.encoders.encoder.decode_many')
+    def test_encoder_subclass_decode_many(self, m_decode_many):
+        """
+        Test that Encoder().decode_many calls basest.core.decode_many() with
+        the correct arguments, and returns what that function returns.
+        """
+        # mock return value of decode_many
+        m_decode_many.return_value = ['Isle', 'of', 'Skye']
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+        inputs = ['Y2FiYmFnZXMh', 'YmVsZmFzdA==']
+
+        # call instance method decode_many() with input data
+        result = CustomEncoder().decode_many(inputs)
+
+        # check the library function was called
+        m_decode_many.assert_called_once_with(
+            input_base=64, input_symbol_table=base64_alphabet,
+            input_padding='=',
+            output_base=256, output_symbol_table=[chr(b) for b in range(256)],
+            input_ratio=4, output_ratio=3, inputs=inputs
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_decode_many.return_value)
+
+    @patch('basest.encoders.encoder.encode_utf8')
+    def test_encoder_subclass_encode_utf8(self, m_encode_utf8):
+        """
+        Test that Encoder().encode_utf8 calls basest.core.encode_utf8() with
+        the correct arguments, and returns what that function returns.
+        """
+        # mock return value of encode_utf8
+        m_encode_utf8.return_value = bytearray(b'WWVzdGVyZGF5')
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method encode_utf8() with input data
+        result = CustomEncoder().encode_utf8('Yesterday')
+
+        # check the library function was called
+        m_encode_utf8.assert_called_once_with(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            output_padding='=', input_ratio=3, output_ratio=4,
+            input_data='Yesterday', output=None,
+            line_length=None, line_separator='\n'
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_encode_utf8.return_value)
+
+    @patch('basest.encoders.encoder.decode_utf8')
+    def test_encoder_subclass_decode_utf8(self, m_decode_utf8):
+        """
+        Test that Encoder().decode_utf8 calls basest.core.decode_utf8() with
+        the correct arguments, and returns what that function returns.
+        """
+        # mock return value of decode_utf8
+        m_decode_utf8.return_value = [s for s in 'Yesterday']
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method decode_utf8() with input data
+        result = CustomEncoder().decode_utf8(b'WWVzdGVyZGF5')
+
+        # check the library function was called
+        m_decode_utf8.assert_called_once_with(
+            input_base=64, input_symbol_table=base64_alphabet,
+            input_padding='=',
+            output_base=256, output_symbol_table=[chr(b) for b in range(256)],
+            input_ratio=4, output_ratio=3, input_data=b'WWVzdGVyZGF5',
+            ignore=None
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_decode_utf8.return_value)
+
+    @patch('basest.encoders.encoder.decode_range')
+    def test_encoder_subclass_decode_range(self, m_decode_range):
+        """
+        Test that Encoder().decode_range calls basest.core.decode_range()
+        with the correct arguments, and returns what that function returns.
+        """
+        # mock return value of decode_range
+        m_decode_range.return_value = [s for s in 'Yes']
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method decode_range() with input data
+        result = CustomEncoder().decode_range('WWVzdGVyZGF5', 0, 3)
+
+        # check the library function was called
+        m_decode_range.assert_called_once_with(
+            input_base=64, input_symbol_table=base64_alphabet,
+            input_padding='=',
+            output_base=256, output_symbol_table=[chr(b) for b in range(256)],
+            input_ratio=4, output_ratio=3, input_data='WWVzdGVyZGF5',
+            start=0, stop=3
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_decode_range.return_value)
+
+    @patch('basest.encoders.encoder.DecodedView')
+    def test_encoder_subclass_decoded_view(self, m_decoded_view):
+        """
+        Test that Encoder().decoded_view creates a basest.core.DecodedView
+        with the correct arguments, and returns it.
+        """
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method decoded_view() with input data
+        result = CustomEncoder().decoded_view('WWVzdGVyZGF5', cache_size=2)
+
+        # check the view was created
+        m_decoded_view.assert_called_once_with(
+            input_base=64, input_symbol_table=base64_alphabet,
+            input_padding='=',
+            output_base=256, output_symbol_table=[chr(b) for b in range(256)],
+            input_ratio=4, output_ratio=3, input_data='WWVzdGVyZGF5',
+            chunks_per_block=64, cache_size=2
+        )
+        # check that the method returned the view
+        self.assertEqual(result, m_decoded_view.return_value)
+
+    @patch('basest.encoders.encoder.encode_patch')
+    def test_encoder_subclass_encode_patch(self, m_encode_patch):
+        """
+        Test that Encoder().encode_patch calls basest.core.encode_patch()
+        with the correct arguments, and returns what that function returns.
+        """
+        # mock return value of encode_patch
+        m_encode_patch.return_value = (4, 8, [s for s in 'YmFn'])
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method encode_patch() with input data
+        result = CustomEncoder().encode_patch('WWVzdGVyZGF5', 3, 'bag')
+
+        # check the library function was called
+        m_encode_patch.assert_called_once_with(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            output_padding='=', input_ratio=3, output_ratio=4,
+            encoded_data='WWVzdGVyZGF5', offset=3, input_data='bag',
+            apply=False
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_encode_patch.return_value)
+
+    @patch('basest.encoders.encoder.encode_digest')
+    def test_encoder_subclass_encode_digest(self, m_encode_digest):
+        """
+        Test that Encoder().encode_digest calls basest.core.encode_digest()
+        with the correct arguments, and returns what that function returns.
+        """
+        digest = Mock()
+        # mock return value of encode_digest
+        m_encode_digest.return_value = ([s for s in 'YmFn'], b'digest')
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method encode_digest() with input data
+        result = CustomEncoder().encode_digest('bag', digest)
+
+        # check the library function was called
+        m_encode_digest.assert_called_once_with(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            output_padding='=', input_ratio=3, output_ratio=4,
+            input_data='bag', digest=digest, shortcuts=None
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_encode_digest.return_value)
+
+    @patch('basest.encoders.encoder.decode_digest')
+    def test_encoder_subclass_decode_digest(self, m_decode_digest):
+        """
+        Test that Encoder().decode_digest calls basest.core.decode_digest()
+        with the correct arguments, and returns what that function returns.
+        """
+        digest = Mock()
+        # mock return value of decode_digest
+        m_decode_digest.return_value = ([s for s in 'bag'], b'digest')
+        # create subclass
+        CustomEncoder = self.make_custom_encoder_subclass(
+            input_base=256, input_symbol_table=[chr(b) for b in range(256)],
+            output_base=64, output_symbol_table=base64_alphabet,
+            padding_symbol='=', input_ratio=3, output_ratio=4
+        )
+
+        # call instance method decode_digest() with input data
+        result = CustomEncoder().decode_digest('YmFn', digest, ignore='\n')
+
+        # check the library function was called
+        m_decode_digest.assert_called_once_with(
+            input_base=64, input_symbol_table=base64_alphabet,
+            input_padding='=', output_base=256,
+            output_symbol_table=[chr(b) for b in range(256)],
+            input_ratio=4, output_ratio=3, input_data='YmFn', digest=digest,
+            ignore='\n', shortcuts=None
+        )
+        # check that the method returned whatever the function did
+        self.assertEqual(result, m_decode_digest.return_value)
+
+    def test_encoder_subclass_shortcut_symbols(self):
+        """
+        Test that shortcut symbols declared on an Encoder subclass are used
+        for encoding and decoding.
+        """
+        encoded_data = Ascii85Encoder().encode('\x00' * 8 + 'cabbages')
+
+        self.assertEqual(
+            encoded_data, ['z', 'z'] + Base85Encoder().encode('cabbages')
+        )
+        self.assertEqual(
+            ''.join(Ascii85Encoder().decode(encoded_data)),
+            '\x00' * 8 + 'cabbages'
+        )
+
+    @data(
+        ('encode_many', (['cabbages'],)),
+        ('decode_many', (['@psnB'],)),
+        ('encode_parallel', ('cabbages',)),
+        ('decode_parallel', ('@psnB',)),
+        ('encode_utf8', ('cabbages',)),
+        ('decode_utf8', (b'@psnB',)),
+        ('decode_range', ('@psnB', 0, 1)),
+        ('decoded_view', ('@psnB',)),
+        ('encode_patch', ('@psnB', 0, 'c')),
+    )
+    @unpack
+    def test_encoder_subclass_shortcut_symbols_unsupported(self, name, args):
+        """
+        Test that methods which don't understand shortcut symbols refuse to
+        run for an Encoder subclass which has them, rather than ignoring them.
+        """
+        with self.assertRaises(ImproperUsageError):
+            getattr(Ascii85Encoder(), name)(*args)
+        # but work as usual without them
+        getattr(Base85Encoder(), name)(*args)
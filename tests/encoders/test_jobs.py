@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.encoders import Encoder
+from basest.encoders.jobs import (
+    _DecodeJob, _EncodeJob, _write_checkpoint, checkpoint_path, decode_file,
+    encode_file, read_checkpoint
+)
+from basest.exceptions import ImproperUsageError, StaleCheckpointError
+
+
+class Base64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [
+        s for s in
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    ]
+    padding_symbol = '='
+
+
+class EmojiEncoder(Encoder):
+    input_base = 256
+    output_base = 4
+    input_ratio = 1
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = ['🐭', '🐱', '🐶', '🐹']
+    padding_symbol = '🐰'
+
+
+class Killed(Exception):
+    """
+    Stands in for a job being killed.
+    """
+    pass
+
+
+def crc32(data):
+    """
+    Returns the CRC32 of the given bytes as an unsigned integer.
+    """
+    return zlib.crc32(data) & 0xffffffff
+
+
+@ddt
+class TestJobs(unittest.TestCase):
+    maxDiff = None
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.input_path = os.path.join(self.directory, 'input')
+        self.output_path = os.path.join(self.directory, 'output')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, path, data):
+        """
+        Writes the given bytes to the file at the given path.
+        """
+        with open(path, 'wb') as target:
+            target.write(data)
+
+    def read(self, path):
+        """
+        Returns the bytes of the file at the given path.
+        """
+        with open(path, 'rb') as source:
+            return source.read()
+
+    def run_killed(self, function, checkpoints, *args, **kwargs):
+        """
+        Runs the given file job with the given arguments, killing it just
+        after it records the given number of checkpoints.
+        """
+        recorded = []
+
+        def write_then_kill(*arguments):
+            _write_checkpoint(*arguments)
+            recorded.append(arguments)
+            if len(recorded) == checkpoints:
+                raise Killed()
+
+        with patch(
+            'basest.encoders.jobs._write_checkpoint',
+            side_effect=write_then_kill
+        ):
+            with self.assertRaises(Killed):
+                function(*args, **kwargs)
+
+    @data(
+        (Base64Encoder, 0, 7),
+        (Base64Encoder, 1000, 7),
+        (Base64Encoder, 1000, 4096),
+        (EmojiEncoder, 333, 5),
+    )
+    @unpack
+    def test_encode_decode_file(self, encoder_class, length, chunk_size):
+        """
+        Encoding a file should give the encoder's output as UTF-8 text, and
+        decoding it should give the original bytes, with the CRC32s of both
+        files and no checkpoint file left behind.
+        """
+        encoder = encoder_class()
+        raw_data = os.urandom(length)
+        encoded_path = self.output_path + '.encoded'
+        self.write(self.input_path, raw_data)
+
+        encoded = encode_file(
+            encoder, self.input_path, encoded_path, chunk_size=chunk_size,
+            checkpoint_interval=100
+        )
+        decoded = decode_file(
+            encoder, encoded_path, self.output_path, chunk_size=chunk_size,
+            checkpoint_interval=100
+        )
+
+        encoded_data = ''.join(
+            encoder.encode([chr(b) for b in bytearray(raw_data)])
+        ).encode('utf-8')
+        self.assertEqual(self.read(encoded_path), encoded_data)
+        self.assertEqual(self.read(self.output_path), raw_data)
+        self.assertEqual(
+            encoded,
+            (length, len(encoded_data), crc32(raw_data), crc32(encoded_data))
+        )
+        self.assertEqual(
+            decoded,
+            (len(encoded_data), length, crc32(encoded_data), crc32(raw_data))
+        )
+        self.assertFalse(os.path.exists(checkpoint_path(encoded_path)))
+        self.assertFalse(os.path.exists(checkpoint_path(self.output_path)))
+
+    @data(
+        (encode_file, _EncodeJob, Base64Encoder, 7, 3),
+        (encode_file, _EncodeJob, EmojiEncoder, 5, 1),
+        (decode_file, _DecodeJob, Base64Encoder, 7, 1),
+        (decode_file, _DecodeJob, EmojiEncoder, 5, 1),
+    )
+    @unpack
+    def test_resume_file_job(
+        self, function, job_class, encoder_class, chunk_size, alignment
+    ):
+        """
+        A job killed part of the way through should carry on from its last
+        checkpoint, converting only the input after it, cutting off any
+        output written after it and giving the same files and CRC32s as if
+        it had never been stopped.
+        """
+        encoder = encoder_class()
+        raw_data = os.urandom(1000)
+        if function is encode_file:
+            input_data = raw_data
+        else:
+            input_data = ''.join(
+                encoder.encode([chr(b) for b in bytearray(raw_data)])
+            ).encode('utf-8')
+        self.write(self.input_path, input_data)
+        expected_path = self.output_path + '.expected'
+        expected = function(encoder, self.input_path, expected_path)
+
+        self.run_killed(
+            function, 3, encoder, self.input_path, self.output_path,
+            chunk_size=chunk_size, checkpoint_interval=200
+        )
+        checkpoint = read_checkpoint(
+            job_class.operation, encoder, self.input_path, self.output_path,
+            verify=True
+        )
+        # a partially written chunk of output
+        with open(self.output_path, 'ab') as target:
+            target.write(b'\x00\x01')
+        converted = []
+        convert = job_class.convert
+
+        def count_input(job, data, final):
+            converted.append(len(data))
+            return convert(job, data, final)
+
+        with patch.object(
+            job_class, 'convert', autospec=True, side_effect=count_input
+        ):
+            result = function(
+                encoder, self.input_path, self.output_path,
+                chunk_size=chunk_size, checkpoint_interval=200, verify=True
+            )
+
+        self.assertGreaterEqual(checkpoint.input_offset, 600)
+        self.assertEqual(checkpoint.input_offset % alignment, 0)
+        self.assertEqual(
+            checkpoint.input_crc32,
+            crc32(input_data[:checkpoint.input_offset])
+        )
+        self.assertEqual(
+            sum(converted), len(input_data) - checkpoint.input_offset
+        )
+        self.assertEqual(
+            self.read(self.output_path), self.read(expected_path)
+        )
+        self.assertEqual(result, expected)
+        self.assertFalse(os.path.exists(checkpoint_path(self.output_path)))
+
+    def test_start_again_without_resuming(self):
+        """
+        A job run with resume=False should ignore the checkpoint and start
+        from the beginning.
+        """
+        self.write(self.input_path, os.urandom(1000))
+        self.run_killed(
+            encode_file, 1, Base64Encoder(), self.input_path,
+            self.output_path, chunk_size=30, checkpoint_interval=300
+        )
+
+        convert = _EncodeJob.convert
+        with patch.object(
+            _EncodeJob, 'convert', autospec=True, side_effect=convert
+        ) as m_convert:
+            encode_file(
+                Base64Encoder(), self.input_path, self.output_path,
+                chunk_size=30, checkpoint_interval=300, resume=False
+            )
+
+        self.assertEqual(
+            sum(len(c[0][1]) for c in m_convert.call_args_list), 1000
+        )
+
+    def test_read_missing_checkpoint(self):
+        """
+        Jobs which have no checkpoint have nothing to resume from.
+        """
+        self.write(self.input_path, b'cabbages')
+
+        self.assertIsNone(
+            read_checkpoint(
+                'encode', Base64Encoder(), self.input_path, self.output_path
+            )
+        )
+
+    @data(
+        ('decode', Base64Encoder(), b'', 1),
+        ('encode', EmojiEncoder(), b'', 1),
+        ('encode', Base64Encoder(), b'extra', 1),
+        ('encode', Base64Encoder(), b'', 7),
+    )
+    @unpack
+    def test_read_stale_checkpoint(
+        self, operation, encoder, extra_input, alignment
+    ):
+        """
+        Checkpoints recorded for a different operation, Encoder or input
+        file, or which aren't on a chunk boundary, should be stale.
+        """
+        self.write(self.input_path, os.urandom(1000))
+        self.run_killed(
+            encode_file, 1, Base64Encoder(), self.input_path,
+            self.output_path, chunk_size=30, checkpoint_interval=300
+        )
+        with open(self.input_path, 'ab') as target:
+            target.write(extra_input)
+
+        with self.assertRaises(StaleCheckpointError):
+            read_checkpoint(
+                operation, encoder, self.input_path, self.output_path,
+                alignment
+            )
+
+    @data(
+        (lambda data: data[:-1], False),
+        (lambda data: b'?' + data[1:], True),
+    )
+    @unpack
+    def test_read_checkpoint_changed_output(self, change, verify):
+        """
+        Checkpoints should be stale if the output file is shorter than the
+        checkpoint, or if verifying shows it has changed.
+        """
+        self.write(self.input_path, os.urandom(1000))
+        self.run_killed(
+            encode_file, 1, Base64Encoder(), self.input_path,
+            self.output_path, chunk_size=300, checkpoint_interval=300
+        )
+        self.write(self.output_path, change(self.read(self.output_path)))
+
+        with self.assertRaises(StaleCheckpointError):
+            read_checkpoint(
+                'encode', Base64Encoder(), self.input_path, self.output_path,
+                verify=verify
+            )
+
+    @data(b'', b'{', b'[]', b'{"version": 1}')
+    def test_read_corrupted_checkpoint(self, contents):
+        """
+        Checkpoint files which can't be read should be stale.
+        """
+        self.write(self.input_path, b'cabbages')
+        self.write(checkpoint_path(self.output_path), contents)
+
+        with self.assertRaises(StaleCheckpointError) as context:
+            read_checkpoint(
+                'encode', Base64Encoder(), self.input_path, self.output_path
+            )
+        self.assertTrue(str(context.exception).endswith('is corrupted'))
+
+    def test_unreadable_checkpoint(self):
+        """
+        Errors reading a checkpoint file which exists should not be hidden.
+        """
+        self.write(self.input_path, b'cabbages')
+        os.mkdir(checkpoint_path(self.output_path))
+
+        with self.assertRaises((IOError, OSError)):
+            read_checkpoint(
+                'encode', Base64Encoder(), self.input_path, self.output_path
+            )
+
+    def test_verify_checkpoint_short_input(self):
+        """
+        Verifying a checkpoint past the end of the input file should find it
+        stale.
+        """
+        self.write(self.input_path, os.urandom(900))
+        self.run_killed(
+            encode_file, 2, Base64Encoder(), self.input_path,
+            self.output_path, chunk_size=300, checkpoint_interval=300
+        )
+        # the same size, but with the checkpoint past its end
+        with open(checkpoint_path(self.output_path)) as checkpoint_file:
+            contents = checkpoint_file.read().replace(
+                '"input_offset": 600', '"input_offset": 903'
+            )
+        self.write(checkpoint_path(self.output_path), contents.encode())
+
+        with self.assertRaises(StaleCheckpointError):
+            read_checkpoint(
+                'encode', Base64Encoder(), self.input_path, self.output_path,
+                3, verify=True
+            )
+
+    @data(encode_file, decode_file)
+    def test_file_jobs_require_byte_input(self, function):
+        """
+        Encoders which don't have an input base of 256 can't be used with
+        file jobs.
+        """
+        class Base16ToBase4Encoder(Encoder):
+            input_base = 16
+            output_base = 4
+            input_ratio = 1
+            output_ratio = 2
+
+        self.write(self.input_path, b'')
+
+        with self.assertRaises(ImproperUsageError):
+            function(Base16ToBase4Encoder(), self.input_path, self.output_path)
+
+    @data(encode_file, decode_file)
+    def test_file_jobs_reject_shortcut_symbols(self, function):
+        """
+        Encoders with shortcut symbols can't be used with file jobs.
+        """
+        class ShortcutEncoder(Base64Encoder):
+            shortcut_symbols = {('\x00',) * 3: '!'}
+
+        self.write(self.input_path, b'')
+
+        with self.assertRaises(ImproperUsageError):
+            function(ShortcutEncoder(), self.input_path, self.output_path)
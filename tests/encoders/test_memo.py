@@ -0,0 +1,289 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+from mock import patch
+
+from basest.encoders import Encoder
+from basest.encoders.memo import LRUCache, MemoizedEncoder
+from basest.exceptions import InvalidInputLengthError, InvalidSymbolTableError
+
+
+class Base64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [
+        s for s in
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    ]
+    padding_symbol = '='
+
+
+class Base85Encoder(Encoder):
+    input_base = 256
+    output_base = 85
+    input_ratio = 4
+    output_ratio = 5
+    input_symbol_table = list(range(256))
+    output_symbol_table = [chr(c) for c in range(33, 118)]
+    padding_symbol = '~'
+
+
+class DoubledBase85Encoder(Base85Encoder):
+    output_symbol_table = [chr(c) * 2 for c in range(33, 118)]
+    padding_symbol = '~~'
+
+
+class Ascii85Encoder(Base85Encoder):
+    shortcut_symbols = {(0,) * 4: 'z'}
+
+
+@ddt
+class TestLRUCache(unittest.TestCase):
+    maxDiff = None
+
+    def test_lru_cache(self):
+        """
+        The least recently used items should be evicted first, and hits,
+        misses and evictions should be counted.
+        """
+        cache = LRUCache(2)
+
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        cache.put('a', 4)
+
+        self.assertEqual(
+            [cache.get(k) for k in 'abc'], [4, None, 3]
+        )
+        self.assertEqual(
+            cache.stats(),
+            {
+                'hits': 3, 'misses': 1, 'evictions': 1, 'size': 2,
+                'maxsize': 2,
+            }
+        )
+
+    def test_lru_cache_disabled(self):
+        """
+        A cache with a maxsize of 0 should never store anything.
+        """
+        cache = LRUCache(0)
+
+        cache.put('a', 1)
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['size'], 0)
+
+    def test_lru_cache_clear(self):
+        """
+        Clearing a cache should discard its items and statistics.
+        """
+        cache = LRUCache(2)
+        cache.put('a', 1)
+        cache.get('a')
+
+        cache.clear()
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(
+            cache.stats(),
+            {
+                'hits': 0, 'misses': 1, 'evictions': 0, 'size': 0,
+                'maxsize': 2,
+            }
+        )
+
+
+@ddt
+class TestMemoizedEncoder(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (Base64Encoder, 0, 0),
+        (Base64Encoder, 4, 16),
+        (Base85Encoder, 0, 16),
+        (Base85Encoder, 4, 0),
+        (Base85Encoder, 4, 4),
+    )
+    @unpack
+    def test_memoized_encoder(
+        self, encoder, message_cache_size, chunk_cache_size
+    ):
+        """
+        MemoizedEncoder should encode and decode the same as the Encoder it
+        wraps, however often the same data is seen.
+        """
+        memoized = MemoizedEncoder(
+            encoder(), message_cache_size, chunk_cache_size
+        )
+        messages = [
+            [encoder.input_symbol_table[0]] * length +
+            [random.choice(encoder.input_symbol_table) for _ in range(5)]
+            for length in (0, 1, 2, 3, 4, 100)
+        ]
+
+        for _ in range(3):
+            for message in messages:
+                encoded_data = encoder().encode(message)
+                self.assertEqual(memoized.encode(message), encoded_data)
+                self.assertEqual(
+                    memoized.decode(''.join(encoded_data)), message
+                )
+
+    def test_memoized_encoder_messages(self):
+        """
+        Messages that were seen before should be returned from the cache, as
+        new lists.
+        """
+        memoized = MemoizedEncoder(Base64Encoder(), chunk_cache_size=0)
+
+        with patch.object(
+            Base64Encoder, 'encode', wraps=memoized.encoder.encode
+        ) as m_encode:
+            first = memoized.encode('cabbages')
+            first.append('!')
+            second = memoized.encode('cabbages')
+            memoized.encode(b'cabbages'.decode('ascii'))
+
+        self.assertEqual(m_encode.call_count, 1)
+        self.assertEqual(second, [s for s in 'Y2FiYmFnZXM='])
+        self.assertEqual(
+            memoized.stats()['messages'],
+            {
+                'hits': 2, 'misses': 1, 'evictions': 0, 'size': 1,
+                'maxsize': 1024,
+            }
+        )
+
+    def test_memoized_encoder_chunks(self):
+        """
+        Chunks too large for lookup tables which were seen before should be
+        converted from the cache.
+        """
+        memoized = MemoizedEncoder(Base85Encoder(), message_cache_size=0)
+
+        memoized.encode([0] * 8 + [1, 2, 3, 4])
+        memoized.encode([1, 2, 3, 4] + [5] * 4)
+        memoized.decode('!!!!!')
+
+        self.assertEqual(
+            memoized.stats(),
+            {
+                'messages': {
+                    'hits': 0, 'misses': 3, 'evictions': 0, 'size': 0,
+                    'maxsize': 0,
+                },
+                'chunks': {
+                    'hits': 1, 'misses': 4, 'evictions': 0, 'size': 4,
+                    'maxsize': 65536,
+                },
+            }
+        )
+
+        memoized.clear()
+
+        self.assertEqual(memoized.stats()['chunks']['size'], 0)
+
+    @data(0, 16)
+    def test_memoized_encoder_iterators(self, chunk_cache_size):
+        """
+        Input which can only be read once should be converted in full, and
+        cached under the same key as the same message given as a list.
+        """
+        memoized = MemoizedEncoder(
+            Base85Encoder(), chunk_cache_size=chunk_cache_size
+        )
+        input_data = [0] * 8 + [1, 2, 3, 4]
+        encoded_data = Base85Encoder().encode(input_data)
+
+        self.assertEqual(memoized.encode(iter(input_data)), encoded_data)
+        self.assertEqual(memoized.encode(input_data), encoded_data)
+        self.assertEqual(memoized.decode(iter(encoded_data)), input_data)
+        self.assertEqual(memoized.decode(encoded_data), input_data)
+        self.assertEqual(memoized.stats()['messages']['hits'], 2)
+
+    def test_memoized_encoder_attributes(self):
+        """
+        Other attributes should be looked up on the wrapped Encoder.
+        """
+        memoized = MemoizedEncoder(Base85Encoder())
+
+        self.assertEqual(memoized.output_ratio, 5)
+        self.assertEqual(memoized.encode_raw([0, 0, 0, 0]), [0] * 5)
+
+    def test_memoized_encoder_decode_truncated_input(self):
+        """
+        Truncated input should raise the same error as the wrapped Encoder.
+        """
+        with self.assertRaises(InvalidInputLengthError):
+            MemoizedEncoder(Base85Encoder()).decode('!!!!')
+
+    def test_memoized_encoder_shortcut_symbols(self):
+        """
+        Encoders with shortcut symbols should give the same results as the
+        wrapped Encoder, which converts the data itself.
+        """
+        memoized = MemoizedEncoder(Ascii85Encoder())
+        input_data = [0] * 8 + [1, 2, 3, 4]
+
+        encoded_data = memoized.encode(input_data)
+
+        self.assertEqual(encoded_data, Ascii85Encoder().encode(input_data))
+        self.assertEqual(encoded_data[:2], ['z', 'z'])
+        self.assertEqual(memoized.decode(encoded_data), input_data)
+        self.assertEqual(memoized.stats()['chunks']['misses'], 0)
+
+    @data(
+        (Base64Encoder, 'Y2Fi\nYmFn\r\nZXM=', '\r\n'),
+        (Base85Encoder, '@prhU\n@:s \t-~', ' \t\n'),
+        (DoubledBase85Encoder, '@@pprrhhUU\n@@::ss--~~', '\n'),
+    )
+    @unpack
+    def test_memoized_encoder_decode_like_encoder(
+        self, encoder, input_data, ignore
+    ):
+        """
+        Decoding should ignore symbols and split strings of multi-character
+        symbols up in the same way as the wrapped Encoder, whether converting
+        with the chunk cache or not.
+        """
+        expected = encoder().decode(input_data, ignore=ignore)
+
+        for chunk_cache_size in (0, 16):
+            memoized = MemoizedEncoder(
+                encoder(), chunk_cache_size=chunk_cache_size
+            )
+            self.assertEqual(
+                memoized.decode(input_data, ignore=ignore), expected
+            )
+            self.assertEqual(
+                memoized.decode(input_data.replace(ignore[0], ''), ignore),
+                expected
+            )
+            # the ignored symbols shouldn't keep the message out of the cache
+            self.assertEqual(memoized.stats()['messages']['hits'], 1)
+
+    def test_memoized_encoder_decode_ignore_symbols(self):
+        """
+        Symbols of the Encoder's output symbol table can't be ignored.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            MemoizedEncoder(Base64Encoder()).decode('YWJj', ignore='A')
@@ -0,0 +1,162 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.encoders import Encoder
+from basest.encoders.ordering import order_preserving
+from basest.exceptions import ImproperUsageError, InvalidSymbolTableError
+
+
+# text characters (even on Python 2), which sort in the same order as bytes
+byte_table = list(bytearray(range(256)).decode('latin-1'))
+
+
+class SortableBase64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = byte_table
+    # the base64 alphabet, in ASCII order
+    output_symbol_table = sorted(
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    )
+    padding_symbol = '='
+
+
+class SortableBase85Encoder(Encoder):
+    input_base = 256
+    output_base = 85
+    input_ratio = 4
+    output_ratio = 5
+    input_symbol_table = byte_table
+    output_symbol_table = [chr(c) for c in range(33, 118)]
+    padding_symbol = '~'
+
+
+class SortableBase32Encoder(Encoder):
+    input_base = 256
+    output_base = 32
+    input_ratio = 5
+    output_ratio = 8
+    input_symbol_table = byte_table
+    # the base32hex alphabet
+    output_symbol_table = [s for s in '0123456789ABCDEFGHIJKLMNOPQRSTUV']
+    padding_symbol = '='
+
+
+class SortableEmojiEncoder(Encoder):
+    input_base = 256
+    output_base = 4
+    input_ratio = 1
+    output_ratio = 4
+    input_symbol_table = byte_table
+    output_symbol_table = ['🐭', '🐱', '🐶', '🐹']
+    padding_symbol = '🐰'
+
+
+@ddt
+class TestOrderPreserving(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        SortableBase64Encoder, SortableBase85Encoder, SortableBase32Encoder,
+        SortableEmojiEncoder,
+    )
+    def test_order_preserving(self, encoder):
+        """
+        Property test: for random inputs of the same length, the encoded
+        output of one should sort before the other exactly when the input
+        does, and they should only be equal when the inputs are.
+        """
+        encoder = order_preserving(encoder)()
+        generator = random.Random(encoder.output_base)
+        # inputs mostly differ near the end, to exercise padded chunks
+        alphabet = [byte_table[c] for c in (0, 1, 127, 128, 254, 255)]
+
+        for _ in range(500):
+            length = generator.randrange(12)
+            a = ''.join(generator.choice(alphabet) for _ in range(length))
+            b = a[:generator.randrange(length + 1)]
+            b += ''.join(
+                generator.choice(alphabet) for _ in range(length - len(b))
+            )
+            encoded_a = ''.join(encoder.encode(a))
+            encoded_b = ''.join(encoder.encode(b))
+
+            self.assertEqual(encoded_a < encoded_b, a < b)
+            self.assertEqual(encoded_a == encoded_b, a == b)
+
+    def test_order_preserving_marks_class(self):
+        """
+        Classes which pass the checks should be marked as preserving order,
+        with or without a key function.
+        """
+        @order_preserving(key=lambda s: s.lower())
+        class CaseInsensitiveEncoder(SortableBase32Encoder):
+            output_symbol_table = [
+                s for s in '0123456789abcdefghijKLMNOPQRSTUV'
+            ]
+
+        self.assertTrue(CaseInsensitiveEncoder.preserves_order)
+        self.assertTrue(
+            order_preserving(SortableBase64Encoder).preserves_order
+        )
+        self.assertFalse(Encoder.preserves_order)
+
+    @data(
+        (
+            {
+                'output_symbol_table': [
+                    s for s in
+                    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+                    '0123456789+/'
+                ]
+            },
+            InvalidSymbolTableError
+        ),
+        (
+            {'input_symbol_table': byte_table[::-1]},
+            InvalidSymbolTableError
+        ),
+        (
+            {
+                # sorted, but with the digits doubled up
+                'output_symbol_table': ['+', '/'] + [
+                    c * 2 for c in '0123456789'
+                ] + sorted(
+                    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz'
+                )
+            },
+            InvalidSymbolTableError
+        ),
+        ({'padding_symbol': '=='}, InvalidSymbolTableError),
+        ({'output_ratio': 3}, ImproperUsageError),
+        ({'shortcut_symbols': {('\x00',) * 3: '~'}}, ImproperUsageError),
+    )
+    @unpack
+    def test_order_preserving_checks(self, attributes, exception):
+        """
+        Classes which don't preserve order should be rejected when they are
+        created.
+        """
+        with self.assertRaises(exception):
+            order_preserving(
+                type(
+                    str('UnsortableEncoder'), (SortableBase64Encoder,),
+                    attributes
+                )
+            )
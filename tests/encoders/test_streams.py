@@ -0,0 +1,264 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import hashlib
+import os
+import sys
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.core import Checksum
+from basest.encoders import Encoder
+from basest.exceptions import (
+    ImproperUsageError, InvalidInputError, InvalidInputLengthError,
+    InvalidSymbolTableError
+)
+
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from basest.encoders.streams import decode_stream, encode_stream
+else:
+    # the stream adapters can't be imported, but their tests are skipped
+    decode_stream = encode_stream = None
+
+
+class Base64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [
+        s for s in
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    ]
+    padding_symbol = '='
+
+
+class EmojiEncoder(Encoder):
+    input_base = 256
+    output_base = 4
+    input_ratio = 1
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = ['🐶', '🐱', '🐭', '🐹']
+    padding_symbol = '🐰'
+
+
+class FakeStreamWriter(object):
+    """
+    Collects whatever is written to it, in the same way as an
+    asyncio.StreamWriter, recording how many times it was drained.
+    """
+    def __init__(self):
+        self.data = b''
+        self.drains = 0
+
+    def write(self, data):
+        self.data += data
+
+    def drain(self):
+        self.drains += 1
+        future = asyncio.get_event_loop().create_future()
+        future.set_result(None)
+        return future
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio requires Python 3.5+')
+@ddt
+class TestStreams(unittest.TestCase):
+    maxDiff = None
+
+    def run_stream(self, function, encoder, data, chunk_size, **kwargs):
+        """
+        Runs the given stream adapter to completion with the given data fed
+        into a stream reader, returning the fake writer it wrote to (with
+        what the adapter returned as its result attribute). Any other keyword
+        arguments are passed on to the stream adapter.
+        """
+        loop = asyncio.new_event_loop()
+        try:
+            asyncio.set_event_loop(loop)
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            writer = FakeStreamWriter()
+            writer.result = loop.run_until_complete(
+                function(
+                    encoder, reader, writer, chunk_size=chunk_size, **kwargs
+                )
+            )
+        finally:
+            asyncio.set_event_loop(None)
+            loop.close()
+        return writer
+
+    @data(
+        (Base64Encoder, 0, 7),
+        (Base64Encoder, 1000, 7),
+        (Base64Encoder, 1000, 4096),
+        (EmojiEncoder, 333, 5),
+    )
+    @unpack
+    def test_encode_decode_stream(self, encoder_class, length, chunk_size):
+        """
+        Data encoded from one stream to another should be the same as the
+        encoder's output, and decode back to the original data.
+        """
+        encoder = encoder_class()
+        data = os.urandom(length)
+
+        encoded = self.run_stream(encode_stream, encoder, data, chunk_size)
+        decoded = self.run_stream(
+            decode_stream, encoder, encoded.data, chunk_size
+        )
+
+        self.assertEqual(
+            encoded.data.decode('utf-8'),
+            ''.join(encoder.encode([chr(b) for b in bytearray(data)]))
+        )
+        self.assertEqual(decoded.data, data)
+        if length:
+            self.assertGreater(encoded.drains, 1)
+
+    @data(
+        (Base64Encoder, 1000, 7, 76, '\r\n'),
+        (Base64Encoder, 57, 4096, 76, '\r\n'),
+        (Base64Encoder, 1000, 4096, 64, '\n'),
+        (EmojiEncoder, 333, 5, 10, '\n'),
+    )
+    @unpack
+    def test_encode_stream_line_wrapping(
+        self, encoder_class, length, chunk_size, line_length, line_separator
+    ):
+        """
+        Encoded output should be split into lines of line_length symbols
+        separated by the line separator, however the input is chunked.
+        """
+        encoder = encoder_class()
+        data = os.urandom(length)
+        output_data = ''.join(
+            encoder.encode([chr(b) for b in bytearray(data)])
+        )
+
+        encoded = self.run_stream(
+            encode_stream, encoder, data, chunk_size,
+            line_length=line_length, line_separator=line_separator
+        )
+
+        self.assertEqual(
+            encoded.data.decode('utf-8').split(line_separator),
+            [
+                output_data[i:i + line_length]
+                for i in range(0, len(output_data), line_length)
+            ]
+        )
+
+    @data(
+        (Base64Encoder, 1000, 7, 76, '\r\n'),
+        (EmojiEncoder, 333, 5, 10, '\n'),
+    )
+    @unpack
+    def test_decode_stream_ignore(
+        self, encoder_class, length, chunk_size, line_length, line_separator
+    ):
+        """
+        Wrapped output from encode_stream() should decode to the original
+        data when the line separators are ignored.
+        """
+        encoder = encoder_class()
+        data = os.urandom(length)
+        encoded = self.run_stream(
+            encode_stream, encoder, data, chunk_size,
+            line_length=line_length, line_separator=line_separator
+        )
+
+        decoded = self.run_stream(
+            decode_stream, encoder, encoded.data, chunk_size,
+            ignore=line_separator
+        )
+
+        self.assertEqual(decoded.data, data)
+
+    def test_decode_stream_ignore_symbols(self):
+        """
+        Symbols of the Encoder's output symbol table can't be ignored.
+        """
+        with self.assertRaises(InvalidSymbolTableError):
+            self.run_stream(
+                decode_stream, Base64Encoder(), b'YWJj', 3, ignore='A'
+            )
+
+    def test_encode_decode_stream_digest(self):
+        """
+        The stream adapters should return the digest of the raw bytes, which
+        are added to the given digest as they are encoded and decoded.
+        """
+        data = os.urandom(1000)
+
+        encoded = self.run_stream(
+            encode_stream, Base64Encoder(), data, 7, line_length=76,
+            digest=hashlib.sha256()
+        )
+        decoded = self.run_stream(
+            decode_stream, Base64Encoder(), encoded.data.replace(b'\n', b''),
+            7, digest=Checksum()
+        )
+
+        self.assertEqual(encoded.result, hashlib.sha256(data).digest())
+        self.assertEqual(decoded.data, data)
+        checksum = Checksum()
+        checksum.update(data)
+        self.assertEqual(decoded.result, checksum.digest())
+        self.assertIsNone(
+            self.run_stream(encode_stream, Base64Encoder(), data, 7).result
+        )
+
+    @data(
+        (b'YWJj????', InvalidInputError),
+        (b'YWJjZ', InvalidInputLengthError),
+    )
+    @unpack
+    def test_decode_stream_invalid_input(self, data, exception):
+        """
+        Invalid encoded data should raise the same errors as decode() does.
+        """
+        with self.assertRaises(exception):
+            self.run_stream(decode_stream, Base64Encoder(), data, 3)
+
+    @data(encode_stream, decode_stream)
+    def test_streams_require_byte_input(self, function):
+        """
+        Encoders which don't have an input base of 256 can't be used with the
+        stream adapters.
+        """
+        class Base16ToBase4Encoder(Encoder):
+            input_base = 16
+            output_base = 4
+            input_ratio = 1
+            output_ratio = 2
+
+        with self.assertRaises(ValueError):
+            self.run_stream(function, Base16ToBase4Encoder(), b'', 3)
+
+    @data(encode_stream, decode_stream)
+    def test_streams_reject_shortcut_symbols(self, function):
+        """
+        Encoders with shortcut symbols can't be used with the stream adapters.
+        """
+        class ShortcutEncoder(Base64Encoder):
+            shortcut_symbols = {('\x00',) * 3: '!'}
+
+        with self.assertRaises(ImproperUsageError):
+            self.run_stream(function, ShortcutEncoder(), b'', 3)
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2016, 2018, Joshua Saxby <joshua.a.saxby@gmail.com>
+#
+# This Source Code Form is subject to the terms of the Mozilla Public
+# License, v. 2.0. If a copy of the MPL was not distributed with this
+# file, You can obtain one at http://mozilla.org/MPL/2.0/.
+#
+from __future__ import (
+    absolute_import, division, print_function, unicode_literals
+)
+
+import random
+import unittest
+
+from ddt import data, ddt, unpack
+
+from basest.encoders import Encoder
+from basest.encoders.transcoder import Transcoder
+from basest.exceptions import ImproperUsageError, InvalidInputLengthError
+
+
+class Base64Encoder(Encoder):
+    input_base = 256
+    output_base = 64
+    input_ratio = 3
+    output_ratio = 4
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [
+        s for s in
+        'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789+/'
+    ]
+    padding_symbol = '='
+
+
+class Base32Encoder(Encoder):
+    input_base = 256
+    output_base = 32
+    input_ratio = 5
+    output_ratio = 8
+    input_symbol_table = [chr(c) for c in range(256)]
+    output_symbol_table = [s for s in 'ABCDEFGHIJKLMNOPQRSTUVWXYZ234567']
+    padding_symbol = '='
+
+
+class Base85Encoder(Encoder):
+    input_base = 256
+    output_base = 85
+    input_ratio = 4
+    output_ratio = 5
+    # bytes are represented as integers rather than characters here
+    input_symbol_table = list(range(256))
+    output_symbol_table = [chr(c) for c in range(33, 118)]
+    padding_symbol = '~'
+
+
+class Base16Encoder(Encoder):
+    input_base = 16
+    output_base = 256
+    input_ratio = 2
+    output_ratio = 1
+    input_symbol_table = [s for s in '0123456789ABCDEF']
+    output_symbol_table = [chr(c) for c in range(256)]
+    padding_symbol = '='
+
+
+@ddt
+class TestTranscoder(unittest.TestCase):
+    maxDiff = None
+
+    @data(
+        (Base85Encoder, Base64Encoder, 1024),
+        (Base64Encoder, Base85Encoder, 1024),
+        (Base64Encoder, Base32Encoder, 1024),
+        (Base32Encoder, Base64Encoder, 2),
+        (Base85Encoder, Base32Encoder, 1),
+    )
+    @unpack
+    def test_transcode(self, source, target, groups_per_block):
+        """
+        Transcoding should give the same output as decoding with the source
+        Encoder and encoding with the target Encoder.
+        """
+        transcoder = Transcoder(source, target, groups_per_block)
+        for length in (0, 1, 2, 3, 4, 5, 59, 60, 61, 1000, 10007):
+            input_data = [random.randrange(256) for _ in range(length)]
+            encoded_data = source().encode(
+                [source.input_symbol_table[b] for b in input_data]
+            )
+
+            self.assertEqual(
+                transcoder.transcode(''.join(encoded_data)),
+                target().encode(
+                    [target.input_symbol_table[b] for b in input_data]
+                )
+            )
+
+    def test_transcode_truncated_input(self):
+        """
+        Input data which isn't a whole number of the source's chunks can't be
+        transcoded.
+        """
+        with self.assertRaises(InvalidInputLengthError):
+            Transcoder(Base64Encoder, Base32Encoder).transcode('Y2FiYmF')
+
+    def test_transcoder_different_input_bases(self):
+        """
+        Both Encoders need to encode from the same base.
+        """
+        with self.assertRaises(ImproperUsageError):
+            Transcoder(Base16Encoder, Base64Encoder)
+
+    def test_transcoder_shortcut_symbols(self):
+        """
+        Encoders with shortcut symbols can't be transcoded from or to.
+        """
+        class Ascii85Encoder(Base85Encoder):
+            shortcut_symbols = {('\x00',) * 4: 'z'}
+
+        with self.assertRaises(ImproperUsageError):
+            Transcoder(Ascii85Encoder, Base64Encoder)
+        with self.assertRaises(ImproperUsageError):
+            Transcoder(Base64Encoder, Ascii85Encoder)